@@ -0,0 +1,133 @@
+#================
+# 유니브 당근 백엔드 API 서버
+# 앱 팩토리 - create_app(config)로 설정별 앱 생성 (테스트는 별도 DB로 격리 가능)
+# 예) create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'TESTING': True})
+#================
+
+import os
+
+from dotenv import load_dotenv  #.env파일에서 환경변수 가져옴
+from flask import Flask
+from flask_cors import CORS  #Cross-Origin Resource Sharing 허용 (프론트엔드 통신용)
+from werkzeug.middleware.proxy_fix import ProxyFix  #프록시 뒤에서 실제 클라이언트 IP 사용
+
+from cache import create_cache  #캐시 저장소 생성 (memory / redis) - 복제본 사용 시 최근 쓰기 사용자 기록용
+from compression import Compressor  #응답 압축 (gzip / brotli)
+from jsonprovider import create_json_provider  #orjson 사용 가능하면 빠른 JSON 직렬화
+from metrics import RequestMetrics  #요청 성능 계측
+from ratelimit import RateLimiter, create_bucket_store  #요청 빈도/본문 크기 제한
+from replicas import ReplicaRouter, replica_binds, sync_replicas_command  #읽기 복제본 라우팅
+
+from . import archive, auth, chat, jobs, popularity, products, system, uploads, wishlist
+from .config import BACKEND_DIR, engine_options, load_config
+from .extensions import chat_broker, db, draining, jwt
+from .models import password_hash_method
+
+
+# 종료 시 실행 중인 작업을 기다리는 시간 (초) - gunicorn graceful_timeout 안에서 끝나도록
+SHUTDOWN_JOB_TIMEOUT = 10
+
+
+def create_app(config=None):
+    # 환경변수 로드 (.env 파일이 있으면 읽어옴) 후 기본 설정 위에 전달된 설정 적용
+    load_dotenv()
+    app = Flask(__name__, root_path=BACKEND_DIR, instance_path=os.path.join(BACKEND_DIR, 'instance'))
+    app.config.update(load_config())
+    app.config.update(config or {})
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config))
+    app.config.setdefault('SQLALCHEMY_BINDS', replica_binds(
+        app.config['DATABASE_REPLICA_URLS'], lambda url: engine_options(app.config, url)
+    ))
+    app.config['USE_X_SENDFILE'] = app.config['MEDIA_OFFLOAD'] == 'x-sendfile'
+    #'scrypt'처럼 파라미터를 생략한 값도 저장된 해시와 비교할 수 있도록 (매 로그인 재해싱 방지)
+    app.config['PASSWORD_HASH_METHOD'] = password_hash_method(app.config['PASSWORD_HASH_METHOD'])
+    app.json = create_json_provider(app)
+
+    if app.config['TRUSTED_PROXY_COUNT']:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXY_COUNT'])
+    CORS(app)
+    db.init_app(app)
+    jwt.init_app(app)
+    if app.config['MIGRATIONS_ENABLED']:
+        from flask_migrate import Migrate  #데이터베이스 마이그레이션 관리
+        Migrate(app, db)
+
+    #요청별 지연시간/쿼리 수 계측
+    RequestMetrics(
+        sample_rate=app.config['METRICS_SAMPLE_RATE'],
+        slow_query_ms=app.config['SLOW_QUERY_MS'],
+        server_timing=app.config['METRICS_SERVER_TIMING'],
+    ).init_app(app)
+
+    #본문을 읽기 전에 요청 빈도 / 크기 확인 (계측 이후에 등록해 거절된 요청도 지표에 포함)
+    RateLimiter(
+        create_bucket_store(app.config),
+        limits=app.config['RATE_LIMITS'],
+        default=app.config['RATE_LIMIT_DEFAULT'],
+        body_limits=app.config['BODY_SIZE_LIMITS'],
+        max_body_size=app.config['MAX_BODY_SIZE'],
+        enabled=app.config['RATE_LIMIT_ENABLED'],
+        identity_fields=app.config['RATE_LIMIT_IDENTITY_FIELDS'],
+    ).init_app(app)
+
+    #응답 압축 - after_request는 등록 역순으로 실행되므로 계측(지연시간 / 응답 크기)에는 압축 시간과 압축 후 크기가 반영됨
+    Compressor(
+        min_size=app.config['COMPRESS_MIN_SIZE'],
+        gzip_level=app.config['COMPRESS_LEVEL'],
+        brotli_quality=app.config['COMPRESS_BROTLI_QUALITY'],
+        cache_size=app.config['COMPRESS_CACHE_SIZE'],
+        enabled=app.config['COMPRESS_ENABLED'],
+    ).init_app(app)
+
+    #읽기 복제본이 설정된 경우에만 - 조회 핸들러(@replica_reads)를 복제본으로, 쓰기한 사용자는 잠시 주 DB로
+    if app.config['SQLALCHEMY_BINDS']:
+        ReplicaRouter(
+            app.config['SQLALCHEMY_BINDS'],
+            create_cache({
+                'CACHE_BACKEND': app.config['REPLICA_STICKY_BACKEND'],
+                'CACHE_REDIS_URL': app.config['CACHE_REDIS_URL'],
+                'CACHE_MAX_ENTRIES': app.config['REPLICA_STICKY_MAX_KEYS'],
+                'CACHE_DEFAULT_TTL': app.config['REPLICA_STICKY_SECONDS'],
+            }),
+            sticky_seconds=app.config['REPLICA_STICKY_SECONDS'],
+        ).init_app(app)
+
+    for module in (system, uploads, auth, products, wishlist, chat):
+        app.register_blueprint(module.bp)
+    app.cli.add_command(jobs.run_jobs_command)
+    app.cli.add_command(archive.archive_command)
+    app.cli.add_command(sync_replicas_command)
+
+    return app
+
+
+def begin_drain(app):
+    #워커 종료 시작 (gunicorn SIGTERM) - 열린 SSE 스트림을 끝내 진행 중 요청만 마무리되도록 함
+    with app.app_context():
+        draining.set()
+        chat_broker.close()
+
+
+def start_workers(app):
+    #워커 시작 시 백그라운드 스레드 시작
+    #작업 큐 - 재시작 전에 쌓인 작업도 새 쓰기 요청을 기다리지 않고 처리 (주기 작업이 없으면 예약)
+    #조회수 / 인기 순위 - 첫 인기 상품 요청 전에 순위를 미리 계산
+    with app.app_context():
+        archive.schedule_archive()
+        db.session.commit()
+        jobs.job_queue.wake()
+        popularity.popularity.ranking()
+
+
+def shutdown(app):
+    #워커 종료 직전 - 실행 중인 백그라운드 작업 완료 / 남은 조회수 반영 후 DB 연결 반환 (복제본 포함)
+    #(끝나지 못한 작업은 선점 기간 후 다른 워커가 다시 실행)
+    job_queue = app.extensions.get('job_queue')
+    if job_queue is not None:
+        job_queue.shutdown(timeout=SHUTDOWN_JOB_TIMEOUT)
+    views = app.extensions.get('popularity')
+    if views is not None:
+        views.shutdown(timeout=SHUTDOWN_JOB_TIMEOUT)
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
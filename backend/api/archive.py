@@ -0,0 +1,166 @@
+#================
+# 오래된 데이터 보관 (hot/cold 분리)
+# 판매 완료 후 ARCHIVE_SOLD_AFTER_DAYS가 지난 상품(채팅방/메시지 포함)과 ARCHIVE_IDLE_CHAT_DAYS 동안 대화가 없는 채팅방을
+# 같은 DB의 보관 테이블로 옮겨 피드/채팅 목록이 조회하는 테이블과 인덱스를 작게 유지
+# 보관된 데이터는 기존 상세/메시지 API가 같은 ID로 보관 테이블에서 조회 (읽기 전용)
+# 주기 작업(archive_cold_data)으로 실행 - 한 배치씩 커밋하므로 쓰기 잠금을 오래 잡지 않음
+#================
+
+import logging
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy.exc import IntegrityError
+
+from search import is_supported as search_supported, unindex_products  #상품 검색 색인
+
+from .extensions import cache, db
+from .jobs import enqueue_unique, task
+from .models import (
+    STATUS_SOLD, ArchivedChatRoom, ArchivedMessage, ArchivedProduct, ChatRoom, Message, Product, Wishlist,
+)
+
+logger = logging.getLogger('univ_carrot.archive')
+
+
+def _move(source, target, condition, now):
+    #조건에 맞는 행을 같은 컬럼 이름의 보관 테이블로 복사 후 원본에서 삭제 (INSERT ... SELECT 한 번 + DELETE 한 번)
+    columns = [column.name for column in source.__table__.columns]
+    db.session.execute(
+        db.insert(target.__table__).from_select(
+            columns + ['archived_at'],
+            db.select(*source.__table__.columns, db.literal(now, db.DateTime)).where(condition)
+        )
+    )
+    db.session.execute(db.delete(source.__table__).where(condition))
+
+
+def _restore(target, source, condition):
+    #보관 테이블의 행을 원본 테이블로 되돌림
+    columns = [column.name for column in source.__table__.columns]
+    db.session.execute(
+        db.insert(source.__table__).from_select(
+            columns, db.select(*[target.__table__.c[name] for name in columns]).where(condition)
+        )
+    )
+    db.session.execute(db.delete(target.__table__).where(condition))
+
+
+def archive_chat_rooms(room_ids, now):
+    #채팅방과 메시지 보관 (메시지가 채팅방을 참조하므로 메시지 먼저)
+    if room_ids:
+        _move(Message, ArchivedMessage, Message.chat_room_id.in_(room_ids), now)
+        _move(ChatRoom, ArchivedChatRoom, ChatRoom.id.in_(room_ids), now)
+
+
+def archive_product_chat_rooms(product_ids, now):
+    #상품의 채팅방/메시지 보관 - 상품을 보관하거나 삭제하기 전에 (대화 기록은 보관 테이블에서 계속 조회)
+    room_ids = db.session.execute(
+        db.select(ChatRoom.id).where(ChatRoom.product_id.in_(product_ids))
+    ).scalars().all()
+    archive_chat_rooms(room_ids, now)
+
+
+def archive_sold_products(cutoff, batch_size, now):
+    #cutoff 이전에 판매 완료된 상품 한 배치 보관 - 보관한 상품 수
+    product_ids = db.session.execute(
+        db.select(Product.id).where(Product.status == STATUS_SOLD, Product.updated_at < cutoff)
+        .order_by(Product.id).limit(batch_size)
+    ).scalars().all()
+    if not product_ids:
+        return 0
+
+    archive_product_chat_rooms(product_ids, now)
+
+    #찜 목록에서는 빠지고 찜 수만 보관 - 찜 목록 캐시 무효화 대상
+    user_ids = db.session.execute(
+        db.select(Wishlist.user_id).where(Wishlist.product_id.in_(product_ids)).distinct()
+    ).scalars().all()
+    db.session.execute(db.delete(Wishlist).where(Wishlist.product_id.in_(product_ids)))
+
+    _move(Product, ArchivedProduct, Product.id.in_(product_ids), now)
+    connection = db.session.connection()
+    if search_supported(connection):
+        unindex_products(connection, product_ids)
+    db.session.commit()
+
+    cache.bump('products')
+    for product_id in product_ids:
+        cache.bump(f'product:{product_id}')
+    for user_id in user_ids:
+        cache.bump(f'wishlist:{user_id}')
+    return len(product_ids)
+
+
+def archive_idle_chat_rooms(cutoff, batch_size, now):
+    #cutoff 이후 대화가 없는 채팅방 한 배치 보관 - 보관한 채팅방 수
+    room_ids = db.session.execute(
+        db.select(ChatRoom.id).where(db.func.coalesce(ChatRoom.last_message_at, ChatRoom.created_at) < cutoff)
+        .order_by(ChatRoom.id).limit(batch_size)
+    ).scalars().all()
+    archive_chat_rooms(room_ids, now)
+    db.session.commit()
+    return len(room_ids)
+
+
+def archive_cold_data():
+    #보관 대상이 없을 때까지 배치 단위로 보관 - {'products': 개수, 'chat_rooms': 개수}
+    config = current_app.config
+    now = datetime.utcnow()
+    batch_size = config['ARCHIVE_BATCH_SIZE']
+    counts = {'products': 0, 'chat_rooms': 0}
+    if config['ARCHIVE_SOLD_AFTER_DAYS']:
+        cutoff = now - timedelta(days=config['ARCHIVE_SOLD_AFTER_DAYS'])
+        archived = batch_size
+        while archived == batch_size:
+            archived = archive_sold_products(cutoff, batch_size, now)
+            counts['products'] += archived
+    if config['ARCHIVE_IDLE_CHAT_DAYS']:
+        cutoff = now - timedelta(days=config['ARCHIVE_IDLE_CHAT_DAYS'])
+        archived = batch_size
+        while archived == batch_size:
+            archived = archive_idle_chat_rooms(cutoff, batch_size, now)
+            counts['chat_rooms'] += archived
+    if any(counts.values()):
+        logger.info("Archived %(products)d products, %(chat_rooms)d chat rooms", counts)
+    return counts
+
+
+def restore_chat_room(room_id):
+    #보관된 채팅방을 원본 테이블로 복원 (대화 재개) - 상품이 보관됐으면 복원하지 않고 None
+    #호출한 쪽이 커밋
+    room = db.session.get(ArchivedChatRoom, room_id)
+    if room is None or db.session.get(Product, room.product_id) is None:
+        return None
+    product_id, buyer_id = room.product_id, room.buyer_id
+    db.session.expunge(room)
+    try:
+        with db.session.begin_nested():
+            _restore(ArchivedMessage, Message, ArchivedMessage.chat_room_id == room_id)
+            _restore(ArchivedChatRoom, ChatRoom, ArchivedChatRoom.id == room_id)
+    except IntegrityError:
+        #동시에 다른 요청이 먼저 복원했거나 같은 상품/구매자의 채팅방을 만든 경우 그 채팅방 사용
+        pass
+    return ChatRoom.query.filter_by(product_id=product_id, buyer_id=buyer_id).first()
+
+
+def schedule_archive():
+    #주기 작업 예약 (ARCHIVE_INTERVAL=0이면 사용 안 함) - 이미 예약되어 있으면 그대로 둠, 호출한 쪽이 커밋
+    interval = current_app.config['ARCHIVE_INTERVAL']
+    if interval:
+        enqueue_unique('archive_cold_data', delay=interval)
+
+
+@task('archive_cold_data')
+def archive_task():
+    archive_cold_data()
+    schedule_archive()
+
+
+@click.command('archive')
+@with_appcontext
+def archive_command():
+    #보관 작업을 바로 실행 (배포 직후 / cron 등)
+    click.echo(f"Archived: {archive_cold_data()}")
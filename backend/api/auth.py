@@ -0,0 +1,143 @@
+#================
+# 인증 API
+# 가입 / 로그인 / 토큰 갱신 / 내 정보
+#================
+
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import create_access_token, create_refresh_token, get_jwt, get_jwt_identity, jwt_required
+
+from .extensions import db, identity_cache, password_hash_slots
+from .models import User
+
+bp = Blueprint('auth', __name__, url_prefix='/api/auth')
+
+# 해싱 슬롯 대기 시간 (초) - 초과 시 503
+PASSWORD_HASH_WAIT = 5
+
+
+def load_identity(user_id):
+    #사용자 정보 조회 - 캐시에 없을 때만 DB 조회
+    identity = identity_cache.get(user_id)
+    if identity is None:
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+        identity = user.identity()
+        identity_cache.set(user_id, identity)
+    return identity
+
+
+def current_identity():
+    #현재 요청 사용자 정보 - 토큰에 클레임이 있으면 DB/캐시 조회 없이 사용
+    claims = get_jwt()
+    user_id = int(get_jwt_identity())
+    if 'username' in claims:
+        return {"id": user_id, "username": claims['username'], "email": claims.get('email')}
+    return load_identity(user_id)
+
+
+def issue_tokens(identity):
+    #사용자명/이메일을 클레임으로 포함한 액세스/리프레시 토큰 발급
+    claims = {"username": identity['username'], "email": identity['email']}
+    return {
+        "access_token": create_access_token(identity=str(identity['id']), additional_claims=claims),
+        "refresh_token": create_refresh_token(identity=str(identity['id']), additional_claims=claims)
+    }
+
+
+def busy_response():
+    response = jsonify({"error": "Server is busy, please retry"})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+
+@bp.route('/register', methods=['POST'])
+def register():
+    data = request.get_json()
+
+    username = data.get('username')
+    email = data.get('email')
+    password = data.get('password')
+
+    #필수 필드 검증
+    if not username or not email or not password:
+        return jsonify({"error": "Missing required fields"}), 400
+
+    #중복 검사
+    if User.query.filter_by(username=username).first():
+        return jsonify({"error": "Username already exists"}), 400
+
+    if User.query.filter_by(email=email).first():
+        return jsonify({"error": "Email already exists"}), 400
+
+    #새 사용자 생성
+    user = User(username=username, email=email)
+    if not password_hash_slots.acquire(timeout=PASSWORD_HASH_WAIT):
+        return busy_response()
+    try:
+        user.set_password(password)
+    finally:
+        password_hash_slots.release()
+
+    # DB세이브
+    db.session.add(user)
+    db.session.commit()
+
+    return jsonify({"message": "User registered successfully"}), 201
+
+#로그인
+@bp.route('/login', methods=['POST'])
+def login():
+    data = request.get_json()
+
+    username = data.get('username')
+    password = data.get('password')
+
+    if not username or not password:
+        return jsonify({"error": "Missing username or password"}), 400
+
+    user = User.query.filter_by(username=username).first()
+
+    #해싱은 CPU를 많이 쓰므로 동시 실행 수를 제한 (대기 시간 초과 시 503)
+    if not password_hash_slots.acquire(timeout=PASSWORD_HASH_WAIT):
+        return busy_response()
+    try:
+        if not user or not user.check_password(password):
+            return jsonify({"error": "Invalid username or password"}), 401
+
+        #해싱 파라미터가 바뀌었으면 새 설정으로 재해싱
+        if user.needs_rehash():
+            user.set_password(password)
+            db.session.commit()
+    finally:
+        password_hash_slots.release()
+
+    identity = user.identity()
+    return jsonify({
+        "message": "Login successful",
+        **issue_tokens(identity),
+        "user": identity
+    })
+
+@bp.route('/refresh', methods=['POST'])
+@jwt_required(refresh=True)
+def refresh():
+    #리프레시 토큰으로 새 액세스 토큰 발급 (재로그인 없이 세션 연장)
+    identity = current_identity()
+    if not identity:
+        return jsonify({"error": "User not found"}), 404
+
+    claims = {"username": identity['username'], "email": identity['email']}
+    return jsonify({
+        "access_token": create_access_token(identity=str(identity['id']), additional_claims=claims)
+    })
+
+@bp.route('/me', methods=['GET'])
+@jwt_required()
+def get_current_user():
+    identity = current_identity()
+
+    if not identity:
+        return jsonify({"error": "User not found"}), 404
+
+    return jsonify(identity)
@@ -0,0 +1,220 @@
+#================
+# 채팅 API
+# 채팅방 / 메시지 기록 / 실시간 수신(SSE)
+#================
+
+from flask import Blueprint, Response, current_app, jsonify, request
+from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
+
+from realtime import stream_events  #채팅 실시간 전달 (SSE)
+from replicas import read_primary, replica_reads  #읽기 복제본 라우팅
+
+from .archive import restore_chat_room
+from .common import MAX_PAGE_SIZE, MESSAGE_PAGE_SIZE, idempotent, insert_or_ignore, parse_limit, versioned_json
+from .extensions import chat_broker, db, draining
+from .models import ArchivedChatRoom, ArchivedMessage, ChatRoom, Message, Product
+
+bp = Blueprint('chat', __name__, url_prefix='/api/chat')
+
+
+@bp.route('/room/<int:product_id>', methods=['POST'])
+@jwt_required()
+def create_or_get_chat_room(product_id):
+    user_id = int(get_jwt_identity())
+    product = Product.query.get_or_404(product_id)
+    
+    if product.user_id == user_id:
+        return jsonify({"error": "자신의 상품에는 채팅할 수 없습니다"}), 400
+    
+    room_key = {'product_id': product_id, 'buyer_id': user_id}
+    chat_room = ChatRoom.query.filter_by(**room_key).first()
+    
+    #활동이 없어 보관된 채팅방이 있으면 복원해서 이어서 대화
+    if not chat_room:
+        archived = ArchivedChatRoom.query.filter_by(**room_key).first()
+        if archived:
+            chat_room = restore_chat_room(archived.id)
+            db.session.commit()
+    
+    #(상품, 구매자) 고유 키 기준 INSERT ... ON CONFLICT DO NOTHING - 동시 요청/재시도에도 채팅방은 하나
+    if not chat_room:
+        insert_or_ignore(ChatRoom, seller_id=product.user_id, **room_key)
+        db.session.commit()
+        chat_room = ChatRoom.query.filter_by(**room_key).one()
+    
+    return jsonify({
+        "id": chat_room.id,
+        "product": product.to_dict(),
+        "buyer": chat_room.buyer.username,
+        "seller": chat_room.seller.username
+    })
+
+@bp.route('/rooms', methods=['GET'])
+@jwt_required()
+@replica_reads
+def get_my_chat_rooms():
+    user_id = int(get_jwt_identity())
+    
+    #목록 버전 - 채팅방 수 / 마지막 메시지 / 안 읽은 수 / 상품 수정 시각이 같으면 목록을 만들지 않고 304
+    participant = (ChatRoom.buyer_id == user_id) | (ChatRoom.seller_id == user_id)
+    version = db.session.query(
+        db.func.count(ChatRoom.id), db.func.max(ChatRoom.id), db.func.max(ChatRoom.last_message_id),
+        db.func.sum(db.case(
+            (ChatRoom.buyer_id == user_id, ChatRoom.buyer_unread_count), else_=ChatRoom.seller_unread_count
+        )),
+        db.func.max(Product.updated_at)
+    ).join(Product, Product.id == ChatRoom.product_id).filter(participant).one()
+    
+    def build():
+        #상품/구매자/판매자를 한 번의 조인 쿼리로 로드, 최근 활동순 정렬
+        chat_rooms = ChatRoom.query.options(
+            db.joinedload(ChatRoom.product),
+            db.joinedload(ChatRoom.buyer),
+            db.joinedload(ChatRoom.seller)
+        ).filter(participant).order_by(
+            db.func.coalesce(ChatRoom.last_message_at, ChatRoom.created_at).desc(), ChatRoom.id.desc()
+        ).all()
+        
+        return [{
+            "id": room.id,
+            "product": {"id": room.product.id, "name": room.product.name, "image_url": room.product.image_url},
+            "other_user": room.seller.username if room.buyer_id == user_id else room.buyer.username,
+            "last_message": room.last_message_preview,
+            "last_message_time": room.last_message_at.isoformat() if room.last_message_at else None,
+            "unread_count": room.unread_count_for(user_id)
+        } for room in chat_rooms]
+    
+    return versioned_json((user_id, *version), build)
+
+@bp.route('/room/<int:room_id>/messages', methods=['POST'])
+@jwt_required()
+@idempotent
+def send_message(room_id):
+    user_id = int(get_jwt_identity())
+    chat_room = ChatRoom.query.get(room_id) or ArchivedChatRoom.query.get_or_404(room_id)
+    
+    if chat_room.buyer_id != user_id and chat_room.seller_id != user_id:
+        return jsonify({"error": "권한이 없습니다"}), 403
+    
+    #보관된 채팅방에 다시 보내면 복원 (상품까지 보관된 채팅방은 읽기 전용)
+    if isinstance(chat_room, ArchivedChatRoom):
+        chat_room = restore_chat_room(room_id)
+        if chat_room is None:
+            return jsonify({"error": "거래가 끝나 보관된 채팅방입니다"}), 409
+    
+    data = request.get_json()
+    content = data.get('content')
+    
+    if not content:
+        return jsonify({"error": "메시지 내용이 필요합니다"}), 400
+    
+    message = Message(
+        chat_room_id=chat_room.id,
+        sender_id=user_id,
+        content=content
+    )
+    db.session.add(message)
+    db.session.flush()
+    chat_room.record_message(message)
+    db.session.commit()
+    
+    #스트림에 연결된 참여자에게 새 메시지 전달
+    payload = message.to_dict(sender_name=get_jwt().get('username'))
+    chat_broker.publish(chat_room.id, payload)
+    
+    return jsonify(payload), 201
+
+@bp.route('/room/<int:room_id>/messages', methods=['GET'])
+@jwt_required()
+@replica_reads
+def get_messages(room_id):
+    user_id = int(get_jwt_identity())
+    chat_room = ChatRoom.query.get(room_id)
+    if chat_room is None and read_primary():
+        #방금 만들어져 아직 복제본에 없는 채팅방
+        chat_room = ChatRoom.query.get(room_id)
+    #보관된 채팅방은 보관 테이블에서 조회 (읽음 처리 없음)
+    chat_room = chat_room or ArchivedChatRoom.query.get_or_404(room_id)
+    archived = isinstance(chat_room, ArchivedChatRoom)
+    message_model = ArchivedMessage if archived else Message
+    
+    if chat_room.buyer_id != user_id and chat_room.seller_id != user_id:
+        return jsonify({"error": "권한이 없습니다"}), 403
+    
+    #메시지 ID 커서 페이지네이션 - 항상 오래된 순으로 최대 limit개 반환
+    #커서 없음: 최신 limit개 / before=<id>: 그 이전 limit개 / after=<id>: 그 이후 limit개
+    #반환 개수가 limit과 같으면 해당 방향으로 더 있을 수 있음
+    try:
+        limit = parse_limit(request.args.get('limit'), default=MESSAGE_PAGE_SIZE)
+        before = int(request.args['before']) if request.args.get('before') else None
+        after = int(request.args['after']) if request.args.get('after') else None
+    except ValueError:
+        return jsonify({"error": "Invalid query parameters"}), 400
+    
+    if before is not None and after is not None:
+        return jsonify({"error": "Use either before or after, not both"}), 400
+    
+    #최신 메시지를 보는 경우 읽음 처리
+    if not archived and before is None and chat_room.mark_read(user_id):
+        db.session.commit()
+    
+    def build():
+        query = message_model.query.options(db.joinedload(message_model.sender)).filter(
+            message_model.chat_room_id == room_id
+        )
+        if after is not None:
+            messages = query.filter(message_model.id > after).order_by(message_model.id.asc()).limit(limit).all()
+        else:
+            if before is not None:
+                query = query.filter(message_model.id < before)
+            messages = query.order_by(message_model.id.desc()).limit(limit).all()
+            messages.reverse()
+        return [m.to_dict() for m in messages]
+    
+    #마지막 메시지 ID가 그대로면 새 메시지가 없으므로 조회 없이 304 (3초 폴링 대부분)
+    return versioned_json((chat_room.last_message_id,), build)
+
+@bp.route('/room/<int:room_id>/stream', methods=['GET'])
+@jwt_required(locations=['headers', 'query_string'])
+def stream_messages(room_id):
+    #새 메시지 실시간 수신 (Server-Sent Events)
+    #EventSource는 헤더를 보낼 수 없으므로 ?jwt=<token>도 허용
+    user_id = int(get_jwt_identity())
+    chat_room = ChatRoom.query.get_or_404(room_id)
+    
+    if chat_room.buyer_id != user_id and chat_room.seller_id != user_id:
+        return jsonify({"error": "권한이 없습니다"}), 403
+    
+    #재연결 시 Last-Event-ID 이후 놓친 메시지를 먼저 전송 (최대 MAX_PAGE_SIZE개, 나머지는 기록 API로 조회)
+    try:
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('after')
+        after = int(last_event_id) if last_event_id else None
+    except ValueError:
+        return jsonify({"error": "Invalid query parameters"}), 400
+    
+    stream_limit = current_app.config['CHAT_STREAM_LIMIT']
+    if draining.is_set() or (stream_limit and chat_broker.subscriber_count() >= stream_limit):
+        return jsonify({"error": "Too many open streams"}), 503, {"Retry-After": "30"}
+    
+    #스트림 본문/종료 콜백은 앱 컨텍스트 밖에서 실행되므로 프록시가 아닌 브로커 객체를 전달
+    broker = chat_broker._get_current_object()
+    
+    #구독을 먼저 등록해 backlog 조회와 구독 사이의 메시지 유실 방지
+    subscriber = broker.subscribe(room_id)
+    backlog = []
+    if after is not None:
+        messages = Message.query.options(db.joinedload(Message.sender)).filter(
+            Message.chat_room_id == room_id, Message.id > after
+        ).order_by(Message.id.asc()).limit(MAX_PAGE_SIZE).all()
+        backlog = [m.to_dict() for m in messages]
+    #스트림이 열려 있는 동안 DB 연결을 점유하지 않도록 세션 반환
+    db.session.close()
+    
+    response = Response(
+        stream_events(broker, room_id, subscriber, backlog),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+    #스트림이 시작되기 전에 연결이 끊겨도 구독 해제
+    response.call_on_close(lambda: broker.unsubscribe(room_id, subscriber))
+    return response
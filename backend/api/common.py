@@ -0,0 +1,217 @@
+#================
+# 여러 API에서 공통으로 쓰는 도우미
+# 페이지네이션 / 응답 캐시 / 조건부 응답 / 재시도 중복 방지 / 충돌 무시 INSERT / 상품 직렬화 / NDJSON 스트리밍
+#================
+
+import base64  #커서 인코딩용
+import functools
+import hashlib  #ETag 생성용
+import json  #커서 인코딩용
+from datetime import datetime
+
+from flask import current_app, jsonify, request, stream_with_context
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy.dialects import postgresql, sqlite  #방언별 INSERT ... ON CONFLICT
+from sqlalchemy.exc import IntegrityError
+
+from jsonprovider import dump_bytes
+
+from .extensions import cache, db, idempotency_keys
+from .models import Product, Wishlist
+
+# 페이지네이션 설정
+DEFAULT_PAGE_SIZE = 20
+MESSAGE_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+# 일괄 처리 API 한 요청당 최대 항목 수
+MAX_BATCH_SIZE = 1000
+
+# Idempotency-Key - 처리 중 표시 유지 시간 (초, 처리 중 워커가 죽어도 이 시간 후 다시 실행 가능) / 최대 키 길이
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+IDEMPOTENCY_PENDING_TTL = 60
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+# NDJSON 스트리밍 (Accept: application/x-ndjson) - 한 번에 DB에서 읽어올 행 수
+NDJSON_MIMETYPE = 'application/x-ndjson'
+NDJSON_BATCH_SIZE = 500
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE):
+    #페이지 크기 파싱 - 잘못된 값이면 ValueError
+    if value is None:
+        return default
+    limit = int(value)
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def encode_cursor(created_at, last_id):
+    #(created_at, id) 키셋 커서를 URL-safe 문자열로 인코딩
+    raw = json.dumps([created_at.isoformat(), last_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    #커서 디코딩 - 잘못된 커서면 ValueError
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, last_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(last_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError("invalid cursor") from e
+
+
+def viewer_cache_key(user_id):
+    #비로그인/사용자별 응답을 분리 - 사용자 키에는 찜 목록 세대를 포함
+    if not user_id:
+        return 'anon'
+    return f"u{user_id}.{cache.generation(f'wishlist:{user_id}')}"
+
+
+def cached_json(key, build):
+    #JSON 응답 캐시 + ETag / If-None-Match(304) 처리
+    entry = cache.get(key)
+    if entry is None:
+        body = dump_bytes(current_app.json, build())
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        #복제본에서 읽었으면 복제 지연 시간만큼만 보관
+        router = current_app.extensions.get('replica_router')
+        cache.set(key, etag.encode() + b'\n' + body, ttl=router.cache_ttl() if router is not None else None)
+    else:
+        etag, body = entry.split(b'\n', 1)
+        etag = etag.decode()
+
+    response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
+
+
+def version_etag(*version):
+    #응답 내용을 결정하는 버전 값(최대 ID / 수정 시각 등) + 요청 경로/인자로 만든 ETag 값
+    raw = repr((request.path, sorted(request.args.items(multi=True)), version)).encode()
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def versioned_response(version, build_response):
+    #버전 값이 클라이언트가 가진 것과 같으면 본문을 만들지 않고 304 (폴링 / 새로고침용)
+    #같은 버전이면 내용은 같지만 직렬화 바이트까지 같다고 보장하지는 않으므로 약한 ETag
+    etag = version_etag(*version)
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = build_response()
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def versioned_json(version, build):
+    return versioned_response(version, lambda: current_app.json.response(build()))
+
+
+def idempotent(view):
+    #Idempotency-Key 헤더가 있으면 같은 사용자/엔드포인트/키로 다시 온 요청에 처음 응답을 그대로 반환 (쓰기 중복 방지)
+    #처리 중인 키는 409, 같은 키로 다른 본문을 보내면 422, 5xx 응답은 저장하지 않음 (재시도하면 다시 실행)
+    #jwt_required 안쪽에 적용
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return view(*args, **kwargs)
+        if not key or len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+            return jsonify({"error": "Invalid Idempotency-Key"}), 400
+
+        store_key = f"idem:{request.endpoint}:{get_jwt_identity()}:{key}"
+        fingerprint = hashlib.blake2b(request.get_data(), digest_size=16).hexdigest()
+        pending = json.dumps({"fingerprint": fingerprint}).encode()
+        if not idempotency_keys.add(store_key, pending, ttl=IDEMPOTENCY_PENDING_TTL):
+            saved = idempotency_keys.get(store_key)
+            saved = json.loads(saved) if saved else {}
+            if saved.get('fingerprint', fingerprint) != fingerprint:
+                return jsonify({"error": "Idempotency-Key was used for a different request"}), 422
+            if 'status' not in saved:
+                return jsonify({"error": "A request with this Idempotency-Key is in progress"}), 409, {"Retry-After": "1"}
+            response = current_app.response_class(saved['body'], status=saved['status'], mimetype=saved['mimetype'])
+            response.headers['Idempotent-Replayed'] = 'true'
+            return response
+
+        try:
+            response = current_app.make_response(view(*args, **kwargs))
+        except Exception:
+            idempotency_keys.delete(store_key)
+            raise
+        if response.status_code >= 500 or response.is_streamed:
+            idempotency_keys.delete(store_key)
+        else:
+            idempotency_keys.set(store_key, json.dumps({
+                "fingerprint": fingerprint,
+                "status": response.status_code,
+                "mimetype": response.mimetype,
+                "body": response.get_data(as_text=True),
+            }).encode())
+        return response
+    return wrapper
+
+
+def batch_ids(items):
+    #일괄 처리 요청의 상품 ID 목록 검증
+    return all(isinstance(i, int) and not isinstance(i, bool) for i in items)
+
+
+def insert_or_ignore(model, **values):
+    #고유 제약 충돌 시 무시하는 INSERT - 삽입되면 True
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+        #rowcount는 드라이버에 따라 -1일 수 있으므로 (psycopg) 삽입된 행의 기본 키로 판단
+        statement = insert(model).values(**values).on_conflict_do_nothing().returning(*model.__table__.primary_key)
+        return db.session.execute(statement).first() is not None
+    try:
+        with db.session.begin_nested():
+            db.session.execute(db.insert(model).values(**values))
+        return True
+    except IntegrityError:
+        return False
+
+
+def insert_many_or_ignore(model, rows, returning):
+    #여러 행을 한 문장으로 INSERT ... ON CONFLICT DO NOTHING - 실제로 삽입된 행의 returning 컬럼 값 목록
+    if not rows:
+        return []
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+        statement = insert(model).values(rows).on_conflict_do_nothing().returning(returning)
+        return db.session.execute(statement).scalars().all()
+    return [values[returning.key] for values in rows if insert_or_ignore(model, **values)]
+
+
+def with_owner(query):
+    #상품 조회 시 판매자(owner)를 함께 로드 (상품별 User 지연 로딩 방지)
+    return query.options(db.joinedload(Product.owner))
+
+
+def serialize_products(products, user_id=None):
+    #상품 목록 직렬화 - 상품 수와 관계없이 찜 여부 조회는 한 번
+    wishlisted_ids = Wishlist.product_ids_for(user_id) if user_id else set()
+    return [p.to_dict(wishlisted_ids=wishlisted_ids) for p in products]
+
+
+def wants_ndjson():
+    #클라이언트가 JSON보다 NDJSON을 우선해서 요청했는지 (Accept 헤더)
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def ndjson_response(items):
+    #한 줄에 항목 하나씩 스트리밍 - 목록 전체를 메모리에 만들지 않음
+    #items는 응답을 보내면서 순회하므로 쿼리도 그때 실행됨 (요청 컨텍스트 유지)
+    provider = current_app.json
+
+    def generate():
+        for item in items:
+            yield dump_bytes(provider, item) + b'\n'
+
+    return current_app.response_class(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
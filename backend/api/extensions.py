@@ -0,0 +1,91 @@
+#================
+# 확장 기능 / 앱 단위 서비스
+# 확장 객체는 모듈 전역으로 두고 create_app에서 init_app으로 연결
+# 캐시 / 채팅 브로커 / 업로드 / 작업 큐 등은 앱별로 처음 사용할 때 생성 (기동 시간 단축, 테스트 격리)
+#================
+
+import os
+import sqlite3
+import threading
+
+from flask import current_app
+from flask_jwt_extended import JWTManager
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from werkzeug.local import LocalProxy
+
+from cache import MemoryCache, create_cache  #응답 캐시 / 사용자 정보 캐시
+from media import ChunkedUploads  #미디어 업로드
+from realtime import Broker  #채팅 실시간 전달 (SSE)
+from replicas import RoutingSession  #읽기 복제본 라우팅
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+jwt = JWTManager()
+
+
+@event.listens_for(Engine, 'connect')
+def configure_sqlite(dbapi_connection, connection_record):
+    #SQLite 연결마다 WAL 모드 적용 - 쓰기 중에도 읽기가 막히지 않음
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute(f"PRAGMA busy_timeout={int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))}")
+    cursor.close()
+
+
+_init_lock = threading.Lock()
+
+
+def app_service(name, factory):
+    #현재 앱의 서비스 객체 프록시 - 처음 접근할 때 factory(app)로 생성해 app.extensions에 보관
+    def get():
+        app = current_app._get_current_object()
+        service = app.extensions.get(name)
+        if service is None:
+            with _init_lock:
+                service = app.extensions.get(name)
+                if service is None:
+                    service = app.extensions[name] = factory(app)
+        return service
+    return LocalProxy(get)
+
+
+#상품 조회 응답 캐시
+cache = app_service('response_cache', lambda app: create_cache(app.config))
+
+#Idempotency-Key -> 처리 중 표시 / 처리 결과 (크기 제한 + TTL 만료)
+idempotency_keys = app_service('idempotency_keys', lambda app: create_cache({
+    'CACHE_BACKEND': app.config['IDEMPOTENCY_BACKEND'],
+    'CACHE_REDIS_URL': app.config['CACHE_REDIS_URL'],
+    'CACHE_MAX_ENTRIES': app.config['IDEMPOTENCY_MAX_KEYS'],
+    'CACHE_DEFAULT_TTL': app.config['IDEMPOTENCY_TTL'],
+}))
+
+#(상품 ID, 수정 시각) -> 상품 직렬화 결과 중 요청자와 무관한 부분 (수정되면 키가 바뀌어 자동 무효화)
+product_representations = app_service('product_representations', lambda app: MemoryCache(
+    max_entries=app.config['PRODUCT_CACHE_SIZE'], default_ttl=24 * 3600
+))
+
+#사용자 ID -> {id, username, email} (워커별, 크기 제한)
+identity_cache = app_service('identity_cache', lambda app: MemoryCache(
+    max_entries=app.config['IDENTITY_CACHE_SIZE'], default_ttl=app.config['IDENTITY_CACHE_TTL']
+))
+
+#로그인/가입 해싱 동시 실행 슬롯
+password_hash_slots = app_service(
+    'password_hash_slots', lambda app: threading.BoundedSemaphore(app.config['PASSWORD_HASH_CONCURRENCY'])
+)
+
+#채팅방별 새 메시지 발행/구독 (워커 프로세스 단위)
+chat_broker = app_service('chat_broker', lambda app: Broker())
+
+#청크 업로드 세션
+chunked_uploads = app_service('chunked_uploads', lambda app: ChunkedUploads(
+    app.config['UPLOAD_FOLDER'], app.config['MAX_CONTENT_LENGTH']
+))
+
+#종료 진행 중 여부 - 설정되면 준비 상태 확인이 503을 반환해 새 트래픽을 받지 않음
+draining = app_service('draining', lambda app: threading.Event())
@@ -0,0 +1,254 @@
+#================
+# 백그라운드 작업 큐
+# 쓰기 요청의 부수 작업(썸네일 생성, 미디어 정리 등)을 응답 후 별도 스레드에서 실행
+# 작업은 요청과 같은 트랜잭션으로 job 테이블(아웃박스)에 기록 - 커밋된 작업만 실행되고 재시작해도 유실되지 않음
+# 워커 프로세스마다 스레드 풀이 테이블을 폴링해 작업을 하나씩 선점 (최소 한 번 실행 - 작업은 멱등이어야 함)
+#================
+
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app, has_app_context
+from flask.cli import with_appcontext
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from media import Thumbnailer, remove_media, stored_filename  #썸네일 생성 / 미사용 파일 정리
+
+from .extensions import app_service, chunked_uploads, db
+from .models import ArchivedProduct, Job, Product
+
+logger = logging.getLogger('univ_carrot.jobs')
+
+# 한 번에 선점 후보로 조회할 작업 수
+CLAIM_BATCH_SIZE = 10
+
+# 재시도 대기 시간 상한 (초) - 재시도마다 retry_delay * 2^(시도 횟수-1)
+MAX_RETRY_DELAY = 3600
+
+TASKS = {}
+
+
+def task(name):
+    #작업 함수 등록 - 함수는 enqueue에 넘긴 키워드 인자를 받고 앱 컨텍스트 안에서 실행됨
+    #작업 함수의 DB 변경은 작업 삭제와 같은 트랜잭션으로 커밋됨
+    def register(func):
+        TASKS[name] = func
+        return func
+    return register
+
+
+def enqueue(name, delay=0, **payload):
+    #현재 세션에 작업 추가 - 호출한 쪽이 커밋해야 실행됨 (롤백되면 작업도 취소)
+    if name not in TASKS:
+        raise KeyError(f"Unknown task: {name}")
+    job = Job(name=name, payload=json.dumps(payload), run_at=datetime.utcnow() + timedelta(seconds=delay))
+    db.session.add(job)
+    db.session.info['jobs_enqueued'] = True
+    return job
+
+
+def enqueue_unique(name, delay=0, **payload):
+    #같은 이름의 대기 중인 작업이 없을 때만 추가 (주기 작업 예약용) - 이미 있으면 None
+    pending = db.session.query(Job.query.filter(Job.name == name, Job.status == 'pending').exists()).scalar()
+    if pending:
+        return None
+    return enqueue(name, delay, **payload)
+
+
+@event.listens_for(Session, 'after_commit')
+def _wake_after_commit(session):
+    #작업이 커밋되면 폴링 주기를 기다리지 않고 바로 실행
+    if session.info.pop('jobs_enqueued', False) and has_app_context():
+        job_queue.wake()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_after_rollback(session):
+    session.info.pop('jobs_enqueued', None)
+
+
+class JobQueue:
+    #job 테이블을 폴링하는 작업 실행 스레드 풀 (워커 프로세스 단위)
+    #여러 프로세스가 같은 테이블을 공유 - 조건부 UPDATE로 선점하므로 같은 작업을 동시에 실행하지 않음
+    #실행 중 프로세스가 죽으면 선점 기간(lease) 이후 다른 워커가 다시 실행
+
+    def __init__(self, app, workers=2, poll_interval=1.0, max_attempts=5, retry_delay=10, lease=300):
+        self.app = app
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease = lease
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.retried = 0
+        self.failed = 0
+        self._threads = [
+            threading.Thread(target=self._run, name=f'job-worker-{i}', daemon=True) for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def wake(self):
+        self._wakeup.set()
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                ran = self.run_once()
+            except Exception:
+                #DB 연결 오류 등 - 잠시 후 다시 시도
+                logger.exception("Job worker error")
+                ran = False
+            if not ran:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def run_once(self):
+        #실행할 작업이 있으면 하나 실행하고 True
+        with self.app.app_context():
+            job = self._claim()
+            if job is None:
+                return False
+            self._execute(job)
+            return True
+
+    def _claim(self):
+        now = datetime.utcnow()
+        ids = db.session.execute(
+            db.select(Job.id)
+            .where(Job.status.in_(('pending', 'running')), Job.run_at <= now)
+            .order_by(Job.run_at)
+            .limit(CLAIM_BATCH_SIZE)
+        ).scalars().all()
+        for job_id in ids:
+            #다른 스레드/프로세스가 먼저 선점했으면 조건이 맞지 않아 0행 갱신
+            result = db.session.execute(
+                db.update(Job)
+                .where(Job.id == job_id, Job.status.in_(('pending', 'running')), Job.run_at <= now)
+                .values(status='running', attempts=Job.attempts + 1, run_at=now + timedelta(seconds=self.lease))
+            )
+            if result.rowcount:
+                db.session.commit()
+                return db.session.get(Job, job_id)
+        db.session.rollback()
+        return None
+
+    def _execute(self, job):
+        job_id, name, attempts = job.id, job.name, job.attempts
+        start = time.perf_counter()
+        try:
+            func = TASKS[name]
+            func(**json.loads(job.payload))
+            db.session.execute(db.delete(Job).where(Job.id == job_id))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            retry = attempts < self.max_attempts and name in TASKS
+            logger.warning("Job %s (%s) failed on attempt %d%s", job_id, name, attempts,
+                           ", will retry" if retry else "", exc_info=True)
+            delay = min(MAX_RETRY_DELAY, self.retry_delay * 2 ** (attempts - 1))
+            db.session.execute(
+                db.update(Job).where(Job.id == job_id).values(
+                    status='pending' if retry else 'failed',
+                    run_at=datetime.utcnow() + timedelta(seconds=delay),
+                    last_error=f"{type(e).__name__}: {e}"[:1000],
+                )
+            )
+            db.session.commit()
+            self._count('retried' if retry else 'failed')
+            return
+        self._count('processed')
+        logger.debug("Job %s (%s) done in %.1fms", job_id, name, (time.perf_counter() - start) * 1000)
+
+    def shutdown(self, timeout=None):
+        #새 작업 선점을 멈추고 실행 중인 작업이 끝날 때까지 대기
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            return {"workers": len(self._threads), "processed": self.processed,
+                    "retried": self.retried, "failed": self.failed}
+
+
+#워커 프로세스별 작업 큐 - 처음 접근할 때(작업 커밋, gunicorn 워커 시작) 스레드 시작
+job_queue = app_service('job_queue', lambda app: JobQueue(
+    app,
+    workers=app.config['JOB_WORKERS'],
+    poll_interval=app.config['JOB_POLL_INTERVAL'],
+    max_attempts=app.config['JOB_MAX_ATTEMPTS'],
+))
+
+thumbnailer = app_service('thumbnailer', lambda app: Thumbnailer(app.config['UPLOAD_FOLDER']))
+
+
+#================
+# 작업
+#================
+
+@task('generate_thumbnails')
+def generate_thumbnails(filename):
+    #업로드된 이미지의 WebP 썸네일 생성 (이미 있는 크기는 건너뜀)
+    thumbnailer.generate(filename)
+
+
+@task('cleanup_media')
+def cleanup_media(urls=()):
+    #상품 삭제/미디어 교체 후 더 이상 어떤 상품도 쓰지 않는 업로드 파일과 썸네일 삭제
+    #같은 내용의 파일은 하나로 저장되므로 다른 상품(보관된 상품 포함)이 같은 파일을 쓰고 있으면 남겨 둠
+    for url in urls:
+        filename = stored_filename(url)
+        if filename is None:
+            continue
+        in_use = any(
+            db.session.query(model.query.filter(db.or_(model.image_url == url, model.video_url == url)).exists()).scalar()
+            for model in (Product, ArchivedProduct)
+        )
+        if not in_use:
+            remove_media(current_app.config['UPLOAD_FOLDER'], filename,
+                         grace_seconds=current_app.config['MEDIA_CLEANUP_DELAY'])
+
+    #중단된 청크 업로드 정리 - 아직 만료되지 않은 업로드가 남아 있으면 다음 정리 예약
+    chunked_uploads.expire(current_app.config['UPLOAD_EXPIRE_SECONDS'])
+    if chunked_uploads.pending():
+        schedule_upload_expiry()
+
+
+def schedule_media_cleanup(urls):
+    #상품에서 빠진 업로드 파일 정리 예약 - 그 사이 같은 파일로 새 상품을 등록할 수 있도록 지연 실행
+    urls = sorted({url for url in urls if stored_filename(url)})
+    if urls:
+        enqueue('cleanup_media', delay=current_app.config['MEDIA_CLEANUP_DELAY'], urls=urls)
+
+
+def schedule_upload_expiry():
+    #청크 업로드 만료 정리 예약 - 대기 중인 정리 작업이 있으면 그 작업이 이어서 예약함, 호출한 쪽이 커밋
+    enqueue_unique('cleanup_media', delay=current_app.config['UPLOAD_EXPIRE_SECONDS'])
+
+
+@click.command('run-jobs')
+@click.option('--once', is_flag=True, help='대기 중인 작업만 실행하고 종료')
+@with_appcontext
+def run_jobs_command(once):
+    #웹 워커와 별도 프로세스로 작업 실행 (JOB_WORKERS=0으로 웹 워커의 실행 스레드를 끈 경우)
+    queue = JobQueue(current_app._get_current_object(), workers=0, max_attempts=current_app.config['JOB_MAX_ATTEMPTS'])
+    while True:
+        while queue.run_once():
+            pass
+        if once:
+            break
+        time.sleep(current_app.config['JOB_POLL_INTERVAL'])
+    click.echo(f"Jobs: {queue.stats()}")
@@ -0,0 +1,322 @@
+#================
+# 데이터베이스 모델
+#================
+
+from datetime import datetime
+
+from flask import current_app
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash  #비밀번호 해싱
+
+from media import thumbnail_urls
+from search import init_search_index  #상품 검색 색인
+
+from .extensions import db, product_representations
+
+# 채팅방 목록에 표시할 마지막 메시지 미리보기 길이
+MESSAGE_PREVIEW_LENGTH = 100
+
+# 판매 중 상품 상태 (기본값, 인기 상품 대상) / 판매 완료 상태 (일정 기간 후 보관 대상)
+STATUS_ON_SALE = '판매중'
+STATUS_SOLD = '판매완료'
+
+
+def password_hash_method(method):
+    #werkzeug 해시 방식을 저장된 해시 접두어와 같은 전체 파라미터 형식으로 (앱 생성 시 한 번)
+    #'scrypt' -> 'scrypt:32768:8:1', 'pbkdf2:sha256' -> 'pbkdf2:sha256:<기본 반복 횟수>' - 생략된 값은 werkzeug 기본값
+    name, *args = method.split(':')
+    try:
+        if name == 'scrypt':
+            n, r, p = map(int, args) if args else (2 ** 15, 8, 1)
+            return f"scrypt:{n}:{r}:{p}"
+        if name == 'pbkdf2' and len(args) <= 2:
+            hash_name = args[0] if args else 'sha256'
+            iterations = int(args[1]) if len(args) == 2 else DEFAULT_PBKDF2_ITERATIONS
+            return f"pbkdf2:{hash_name}:{iterations}"
+    except ValueError:
+        pass
+    raise ValueError(f"Invalid PASSWORD_HASH_METHOD: {method!r}")
+
+
+class User(db.Model):
+    #사용자모델 - 회원 정보 저장
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(80), unique=True, nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password_hash = db.Column(db.String(256), nullable=False)
+    products = db.relationship('Product', backref='owner', lazy=True)
+    wishlist = db.relationship('Wishlist', backref='user', lazy=True)
+
+    def set_password(self, password):
+        self.password_hash = generate_password_hash(password, method=current_app.config['PASSWORD_HASH_METHOD'])
+
+    def check_password(self, password):
+        return check_password_hash(self.password_hash, password)
+
+    def needs_rehash(self):
+        #저장된 해시의 파라미터가 현재 설정과 다르면 True (설정값은 create_app에서 전체 파라미터로 정규화됨)
+        return self.password_hash.split('$', 1)[0] != current_app.config['PASSWORD_HASH_METHOD']
+
+    def identity(self):
+        return {"id": self.id, "username": self.username, "email": self.email}
+
+
+class Product(db.Model):
+    #상품 모델 - 판매 상품 정보 저장
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.Text)
+    price = db.Column(db.Float, nullable=False)
+    status = db.Column(db.String(20), default=STATUS_ON_SALE)
+    image_url = db.Column(db.String(500))
+    video_url = db.Column(db.String(500))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    #찜 수 - 찜 추가/삭제 시 함께 갱신 (표시용)
+    wishlist_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    #조회수 - 워커 메모리에 모았다가 주기적으로 반영 (api/popularity.py)
+    view_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    #피드 키셋 페이지네이션 및 필터용 복합 인덱스
+    #보관(api/archive.py)으로 지워진 ID를 새 상품이 다시 쓰지 않도록 SQLite도 AUTOINCREMENT (Postgres 시퀀스와 같게)
+    __table_args__ = (
+        db.Index('ix_product_created_at_id', 'created_at', 'id'),
+        db.Index('ix_product_status_created_at_id', 'status', 'created_at', 'id'),
+        db.Index('ix_product_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+        db.Index('ix_product_price', 'price'),
+        {'sqlite_autoincrement': True},
+    )
+
+    def representation(self):
+        #요청자와 무관한 직렬화 결과 - 수정 시각이 키에 포함되므로 수정되면 새로 만들어짐
+        key = (self.id, self.updated_at)
+        data = product_representations.get(key)
+        if data is None:
+            data = {
+                'id': self.id,
+                'name': self.name,
+                'description': self.description,
+                'price': self.price,
+                'status': self.status,
+                'image_url': self.image_url,
+                'thumbnails': thumbnail_urls(self.image_url),
+                'video_url': self.video_url,
+                'created_at': self.created_at.isoformat(),
+                'updated_at': self.updated_at.isoformat(),
+                'owner': self.owner.username,
+                'owner_id': self.user_id,
+            }
+            product_representations.set(key, data)
+        return data
+
+    def to_dict(self, user_id=None, wishlisted_ids=None):
+        #wishlisted_ids가 주어지면 찜 여부를 추가 쿼리 없이 판단 (목록 직렬화용)
+        is_wishlisted = False
+        if wishlisted_ids is not None:
+            is_wishlisted = self.id in wishlisted_ids
+        elif user_id:
+            wishlist_item = Wishlist.query.filter_by(user_id=user_id, product_id=self.id).first()
+            is_wishlisted = wishlist_item is not None
+
+        #찜 수 / 조회수 / 찜 여부는 자주 바뀌므로 캐시된 부분에 매번 덧붙임
+        return {
+            **self.representation(),
+            'is_wishlisted': is_wishlisted,
+            'wishlist_count': self.wishlist_count,
+            'view_count': self.view_count
+        }
+
+#상품 생성/수정/삭제 시 검색 색인 동기화
+init_search_index(db.session, Product)
+
+
+class Wishlist(db.Model):
+    #찜 목록 모델 - 사용자가 찜한 상품 저장
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    product_id = db.Column(db.Integer, db.ForeignKey('product.id', ondelete='CASCADE'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    #같은 상품을 중복으로 찜할 수 없도록 보장 + 상품 삭제 시 정리용 인덱스
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'product_id', name='uq_wishlist_user_id_product_id'),
+        db.Index('ix_wishlist_product_id', 'product_id'),
+    )
+
+    @staticmethod
+    def product_ids_for(user_id):
+        #사용자가 찜한 상품 ID 집합 - 한 번의 쿼리로 조회
+        rows = db.session.query(Wishlist.product_id).filter(Wishlist.user_id == user_id).all()
+        return {product_id for (product_id,) in rows}
+
+
+class ChatRoom(db.Model):
+    #채팅방 모델 - 구매자와 판매자 간의 채팅방
+    id = db.Column(db.Integer, primary_key=True)
+    product_id = db.Column(db.Integer, db.ForeignKey('product.id'), nullable=False)
+    buyer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    seller_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    #채팅방 목록용 비정규화 필드 - send_message가 같은 트랜잭션에서 갱신
+    last_message_id = db.Column(db.Integer)
+    last_message_preview = db.Column(db.String(MESSAGE_PREVIEW_LENGTH))
+    last_message_at = db.Column(db.DateTime)
+    buyer_unread_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    seller_unread_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    product = db.relationship('Product', backref='chat_rooms')
+    buyer = db.relationship('User', foreign_keys=[buyer_id], backref='buying_chats')
+    seller = db.relationship('User', foreign_keys=[seller_id], backref='selling_chats')
+    messages = db.relationship('Message', backref='chat_room', lazy=True, order_by='Message.created_at')
+
+    #상품/구매자당 채팅방 하나 (동시 요청에도 중복 생성 방지) + 참여자별 최근 활동순 채팅방 목록 조회용 인덱스
+    #보관된 채팅방 ID를 재사용하지 않음 (Product 참고)
+    __table_args__ = (
+        db.UniqueConstraint('product_id', 'buyer_id', name='uq_chat_room_product_id_buyer_id'),
+        db.Index('ix_chat_room_buyer_id_last_message_at', 'buyer_id', 'last_message_at'),
+        db.Index('ix_chat_room_seller_id_last_message_at', 'seller_id', 'last_message_at'),
+        {'sqlite_autoincrement': True},
+    )
+
+    def record_message(self, message):
+        #마지막 메시지 요약 갱신 + 상대방 안 읽은 수 증가 (동시 전송에도 안전하도록 SQL 식으로 증가)
+        self.last_message_id = message.id
+        self.last_message_preview = message.content[:MESSAGE_PREVIEW_LENGTH]
+        self.last_message_at = message.created_at
+        if message.sender_id == self.buyer_id:
+            self.seller_unread_count = ChatRoom.seller_unread_count + 1
+        else:
+            self.buyer_unread_count = ChatRoom.buyer_unread_count + 1
+
+    def unread_count_for(self, user_id):
+        return self.buyer_unread_count if user_id == self.buyer_id else self.seller_unread_count
+
+    def mark_read(self, user_id):
+        #읽음 처리 - 변경이 있을 때만 True (불필요한 쓰기 방지)
+        if self.unread_count_for(user_id) == 0:
+            return False
+        if user_id == self.buyer_id:
+            self.buyer_unread_count = 0
+        else:
+            self.seller_unread_count = 0
+        return True
+
+
+class Message(db.Model):
+    #메시지 모델 - 채팅 메시지 저장
+    id = db.Column(db.Integer, primary_key=True)
+    chat_room_id = db.Column(db.Integer, db.ForeignKey('chat_room.id'), nullable=False)
+    sender_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    sender = db.relationship('User', backref='sent_messages')
+
+    #채팅방별 메시지 ID 커서 조회용 복합 인덱스, 보관된 메시지 ID 재사용 방지 (Product 참고)
+    __table_args__ = (
+        db.Index('ix_message_chat_room_id_id', 'chat_room_id', 'id'),
+        {'sqlite_autoincrement': True},
+    )
+
+    def to_dict(self, sender_name=None):
+        #sender_name이 주어지면 발신자 조회 생략 (방금 보낸 메시지 등)
+        return {
+            "id": self.id,
+            "sender": sender_name or self.sender.username,
+            "sender_id": self.sender_id,
+            "content": self.content,
+            "created_at": self.created_at.isoformat()
+        }
+
+
+class Job(db.Model):
+    #백그라운드 작업 아웃박스 - 요청과 같은 트랜잭션으로 기록되고 워커 스레드가 실행 후 삭제 (api/jobs.py)
+    #status: pending(대기) | running(실행 중, run_at까지 선점) | failed(재시도 횟수 초과)
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending', server_default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    #실행할 작업(대기 중이거나 선점이 만료된 작업)을 시각순으로 찾는 인덱스
+    __table_args__ = (
+        db.Index('ix_job_status_run_at', 'status', 'run_at'),
+    )
+
+
+#================
+# 보관 테이블 (api/archive.py)
+# 오래된 판매 완료 상품 / 활동 없는 채팅방을 옮겨 두는 테이블 - 피드/채팅 목록 쿼리는 원본 테이블만 조회
+# 컬럼은 원본과 같은 이름으로 두고 보관 시각만 추가 (ID 유지 - 상세/메시지 조회는 같은 ID로 보관 테이블 조회)
+#================
+
+class ArchivedProduct(db.Model):
+    #보관된 상품 - 찜 목록은 보관 시 삭제되고 찜 수만 남음
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    name = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.Text)
+    price = db.Column(db.Float, nullable=False)
+    status = db.Column(db.String(20))
+    image_url = db.Column(db.String(500))
+    video_url = db.Column(db.String(500))
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    wishlist_count = db.Column(db.Integer, nullable=False, default=0)
+    view_count = db.Column(db.Integer, nullable=False, default=0)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    owner = db.relationship('User')
+
+    #상품과 같은 형식으로 직렬화 (직렬화 결과 캐시도 같은 키 사용)
+    representation = Product.representation
+
+    def to_dict(self, user_id=None, wishlisted_ids=None):
+        return {
+            **self.representation(),
+            'is_wishlisted': False,
+            'wishlist_count': self.wishlist_count,
+            'view_count': self.view_count,
+            'archived': True
+        }
+
+
+class ArchivedChatRoom(db.Model):
+    #보관된 채팅방 - 상품이 판매 중이면 다시 대화할 때 원본 테이블로 복원
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    product_id = db.Column(db.Integer, nullable=False)
+    buyer_id = db.Column(db.Integer, nullable=False)
+    seller_id = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime)
+    last_message_id = db.Column(db.Integer)
+    last_message_preview = db.Column(db.String(MESSAGE_PREVIEW_LENGTH))
+    last_message_at = db.Column(db.DateTime)
+    buyer_unread_count = db.Column(db.Integer, nullable=False, default=0)
+    seller_unread_count = db.Column(db.Integer, nullable=False, default=0)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    #같은 상품/구매자의 채팅방을 다시 열 때 조회용 인덱스
+    __table_args__ = (
+        db.Index('ix_archived_chat_room_product_id_buyer_id', 'product_id', 'buyer_id'),
+    )
+
+
+class ArchivedMessage(db.Model):
+    #보관된 채팅방의 메시지
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    chat_room_id = db.Column(db.Integer, nullable=False)
+    sender_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    sender = db.relationship('User')
+
+    __table_args__ = (
+        db.Index('ix_archived_message_chat_room_id_id', 'chat_room_id', 'id'),
+    )
+
+    to_dict = Message.to_dict
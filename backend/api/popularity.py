@@ -0,0 +1,141 @@
+#================
+# 상품 조회수 / 인기 상품
+# 조회수는 워커 메모리에 모았다가 주기적으로 한 번에 반영 (가장 많이 호출되는 상세 조회가 매번 쓰기 잠금을 잡지 않도록)
+# 인기 순위(조회수 / 찜 수 / 채팅방 수, 등록 후 시간이 지날수록 감소)는 주기적으로 미리 계산하고 요청은 결과만 사용
+#================
+
+import heapq
+import logging
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from sqlalchemy import bindparam
+
+from counters import WriteBehindCounter  #쓰기 지연 카운터
+
+from .extensions import app_service, db
+from .models import STATUS_ON_SALE, ChatRoom, Product
+
+logger = logging.getLogger('univ_carrot.popularity')
+
+# 인기 점수 가중치 - 찜/채팅 문의는 단순 조회보다 관심이 큰 신호
+VIEW_WEIGHT = 1
+WISHLIST_WEIGHT = 5
+CHAT_WEIGHT = 10
+# 등록 후 경과 시간에 따른 감소 정도 (클수록 새 상품 위주)
+GRAVITY = 1.5
+
+Ranking = namedtuple('Ranking', 'version generated_at product_ids')
+
+
+def trending_score(views, wishlists, chats, age_hours):
+    engagement = VIEW_WEIGHT * views + WISHLIST_WEIGHT * wishlists + CHAT_WEIGHT * chats
+    return engagement / (max(age_hours, 0) + 2) ** GRAVITY
+
+
+class Popularity:
+    #워커 프로세스별 조회수 누적 + 인기 순위
+    #스레드 하나가 flush_interval마다 조회수를 반영하고 refresh_interval마다 순위를 다시 계산
+
+    def __init__(self, app, flush_interval=5, refresh_interval=60, size=100, window_days=30):
+        self.app = app
+        self.flush_interval = flush_interval
+        self.refresh_interval = refresh_interval
+        self.size = size
+        self.window = timedelta(days=window_days)
+        self.views = WriteBehindCounter()
+        self._ranking = None
+        self._refresh_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='popularity', daemon=True)
+        self._thread.start()
+
+    def record_view(self, product_id):
+        self.views.incr(product_id)
+
+    def flush(self):
+        #누적된 조회수를 한 트랜잭션의 executemany UPDATE로 반영 - 반영한 상품 수
+        pending = self.views.drain()
+        if not pending:
+            return 0
+        table = Product.__table__
+        #조회수 반영은 상품 수정이 아니므로 updated_at(onupdate)은 그대로 둠
+        statement = table.update().where(table.c.id == bindparam('product_id')).values(
+            view_count=table.c.view_count + bindparam('views'), updated_at=table.c.updated_at
+        )
+        with self.app.app_context():
+            try:
+                db.session.connection().execute(
+                    statement, [{'product_id': k, 'views': v} for k, v in sorted(pending.items())]
+                )
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                self.views.restore(pending)
+                raise
+        return len(pending)
+
+    def refresh(self):
+        #판매 중이고 window 안에 등록된 상품의 점수를 계산해 상위 size개 보관
+        now = datetime.utcnow()
+        with self.app.app_context():
+            chats = db.select(ChatRoom.product_id, db.func.count().label('chats')).group_by(
+                ChatRoom.product_id
+            ).subquery()
+            rows = db.session.execute(
+                db.select(
+                    Product.id, Product.view_count, Product.wishlist_count,
+                    db.func.coalesce(chats.c.chats, 0), Product.created_at
+                )
+                .outerjoin(chats, chats.c.product_id == Product.id)
+                .where(Product.status == STATUS_ON_SALE, Product.created_at >= now - self.window)
+            ).all()
+        top = heapq.nlargest(self.size, (
+            (trending_score(views, wishlists, chats, (now - created_at).total_seconds() / 3600), product_id)
+            for product_id, views, wishlists, chats, created_at in rows
+        ))
+        version = self._ranking.version + 1 if self._ranking else 1
+        self._ranking = Ranking(version, now, [product_id for _, product_id in top])
+        return self._ranking
+
+    def ranking(self):
+        #미리 계산된 순위 - 워커 시작 직후 아직 없으면 한 번만 바로 계산
+        if self._ranking is None:
+            with self._refresh_lock:
+                if self._ranking is None:
+                    self.refresh()
+        return self._ranking
+
+    def _run(self):
+        next_refresh = 0
+        while not self._stopping.wait(self.flush_interval):
+            try:
+                self.flush()
+                if time.monotonic() >= next_refresh:
+                    with self._refresh_lock:
+                        self.refresh()
+                    next_refresh = time.monotonic() + self.refresh_interval
+            except Exception:
+                logger.exception("Popularity update failed")
+
+    def shutdown(self, timeout=None):
+        #스레드 종료 후 남은 조회수 반영
+        self._stopping.set()
+        self._thread.join(timeout)
+        self.flush()
+
+    def stats(self):
+        ranking = self._ranking
+        return {**self.views.stats(), "ranking_size": len(ranking.product_ids) if ranking else 0}
+
+
+#워커 프로세스별 조회수 / 인기 순위 - 처음 접근할 때 스레드 시작
+popularity = app_service('popularity', lambda app: Popularity(
+    app,
+    flush_interval=app.config['VIEW_FLUSH_INTERVAL'],
+    refresh_interval=app.config['TRENDING_REFRESH_INTERVAL'],
+    size=app.config['TRENDING_SIZE'],
+    window_days=app.config['TRENDING_WINDOW_DAYS'],
+))
@@ -0,0 +1,405 @@
+#================
+# 상품 API
+# 피드 / 검색 / 상세 / 등록·수정·삭제 / 일괄 처리 / 내 상품
+#================
+
+from datetime import datetime
+
+import click
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import get_jwt_identity, jwt_required
+
+from replicas import read_primary, replica_reads  #읽기 복제본 라우팅
+from search import is_supported as search_supported, rebuild_index, search_ids  #상품 검색 색인
+
+from .archive import archive_product_chat_rooms
+from .common import (
+    MAX_BATCH_SIZE, NDJSON_BATCH_SIZE, batch_ids, cached_json, decode_cursor, encode_cursor, idempotent,
+    ndjson_response, parse_limit, serialize_products, versioned_response, viewer_cache_key, wants_ndjson, with_owner,
+)
+from .extensions import cache, db
+from .jobs import schedule_media_cleanup
+from .models import ArchivedProduct, Product, Wishlist
+from .popularity import popularity
+
+#flask reindex-search 처럼 그룹 없이 명령 등록
+bp = Blueprint('products', __name__, url_prefix='/api', cli_group=None)
+
+# 요청으로 설정 가능한 상품 필드 (일괄 처리)
+PRODUCT_FIELDS = ('name', 'description', 'price', 'status', 'image_url', 'video_url')
+
+
+@bp.route('/products', methods=['GET'])
+@jwt_required(optional=True)
+@replica_reads
+def get_products():
+    #상품 피드 - (created_at, id) 키셋 페이지네이션 + 상태/가격/판매자 필터
+    user_id = get_jwt_identity()
+    args = request.args
+
+    try:
+        limit = parse_limit(args.get('limit'))
+        cursor = decode_cursor(args['cursor']) if args.get('cursor') else None
+        min_price = float(args['min_price']) if args.get('min_price') else None
+        max_price = float(args['max_price']) if args.get('max_price') else None
+        owner_id = int(args['owner_id']) if args.get('owner_id') else None
+    except ValueError:
+        return jsonify({"error": "Invalid query parameters"}), 400
+
+    def build():
+        query = with_owner(Product.query)
+        if args.get('status'):
+            query = query.filter(Product.status == args['status'])
+        if min_price is not None:
+            query = query.filter(Product.price >= min_price)
+        if max_price is not None:
+            query = query.filter(Product.price <= max_price)
+        if owner_id is not None:
+            query = query.filter(Product.user_id == owner_id)
+        if cursor:
+            #행 값 비교 - OR로 풀어 쓰면 SQLite가 (created_at, id) 인덱스를 탐색하지 못하고 전체를 훑음
+            created_at, last_id = cursor
+            query = query.filter(db.tuple_(Product.created_at, Product.id) < (created_at, last_id))
+
+        #다음 페이지 존재 여부 확인을 위해 한 개 더 조회
+        products = query.order_by(Product.created_at.desc(), Product.id.desc()).limit(limit + 1).all()
+        has_more = len(products) > limit
+        products = products[:limit]
+        next_cursor = encode_cursor(products[-1].created_at, products[-1].id) if has_more else None
+
+        return {
+            "items": serialize_products(products, user_id=int(user_id) if user_id else None),
+            "next_cursor": next_cursor
+        }
+
+    #상품 생성/수정/삭제 시 'products' 세대가 올라가 모든 피드 캐시가 무효화됨
+    params = '&'.join(f"{k}={v}" for k, v in sorted(args.items(multi=True)))
+    key = f"products:{cache.generation('products')}:{viewer_cache_key(user_id)}:{params}"
+    return cached_json(key, build)
+
+@bp.route('/products/search', methods=['GET'])
+@jwt_required(optional=True)
+def search_products():
+    #상품 검색 - FTS5 색인 기반 (상품명 일치 > 설명 일치, 같은 순위는 최신순) + offset 페이지네이션
+    user_id = get_jwt_identity()
+    q = request.args.get('q', '').strip()
+    if not q:
+        return jsonify({"error": "Search query is required"}), 400
+
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        offset = int(request.args.get('offset', 0))
+        if offset < 0:
+            raise ValueError("offset must not be negative")
+    except ValueError:
+        return jsonify({"error": "Invalid query parameters"}), 400
+
+    #다음 페이지 존재 여부 확인을 위해 한 개 더 조회
+    connection = db.session.connection()
+    if search_supported(connection):
+        ids = search_ids(connection, q, limit + 1, offset)
+        rows = with_owner(Product.query).filter(Product.id.in_(ids)).all() if ids else []
+        by_id = {p.id: p for p in rows}
+        products = [by_id[i] for i in ids if i in by_id]
+    else:
+        pattern = f"%{q}%"
+        products = with_owner(Product.query).filter(
+            db.or_(Product.name.ilike(pattern), Product.description.ilike(pattern))
+        ).order_by(Product.created_at.desc(), Product.id.desc()).offset(offset).limit(limit + 1).all()
+
+    has_more = len(products) > limit
+    products = products[:limit]
+
+    return jsonify({
+        "items": serialize_products(products, user_id=int(user_id) if user_id else None),
+        "next_offset": offset + limit if has_more else None
+    })
+
+@bp.route('/products/trending', methods=['GET'])
+@jwt_required(optional=True)
+@replica_reads
+def get_trending_products():
+    #인기 상품 - 주기적으로 미리 계산한 순위(api/popularity.py)에서 상위 limit개
+    user_id = get_jwt_identity()
+    try:
+        limit = parse_limit(request.args.get('limit'))
+    except ValueError:
+        return jsonify({"error": "Invalid query parameters"}), 400
+
+    ranking = popularity.ranking()
+
+    def build():
+        ids = ranking.product_ids[:limit]
+        rows = with_owner(Product.query).filter(Product.id.in_(ids)).all() if ids else []
+        by_id = {p.id: p for p in rows}
+        products = [by_id[i] for i in ids if i in by_id]
+        return {
+            "items": serialize_products(products, user_id=int(user_id) if user_id else None),
+            "generated_at": ranking.generated_at
+        }
+
+    #순위가 다시 계산되거나 상품이 바뀌면 새 키
+    key = f"trending:{ranking.version}:{cache.generation('products')}:{viewer_cache_key(user_id)}:{limit}"
+    return cached_json(key, build)
+
+@bp.route('/products/<int:id>', methods=['GET'])
+@jwt_required(optional=True)
+@replica_reads
+def get_product(id):
+    user_id = get_jwt_identity()
+
+    def build():
+        product = with_owner(Product.query).filter_by(id=id).first()
+        if product is None and read_primary():
+            #방금 등록되어 아직 복제본에 없는 상품 (공유된 링크 등)
+            product = with_owner(Product.query).filter_by(id=id).first()
+        if product is None:
+            #판매 완료 후 보관된 상품은 보관 테이블에서 조회
+            product = ArchivedProduct.query.get_or_404(id)
+        return product.to_dict(user_id=int(user_id) if user_id else None)
+
+    key = f"product:{id}:{cache.generation(f'product:{id}')}:{viewer_cache_key(user_id)}"
+    response = cached_json(key, build)
+    #조회수는 메모리에만 더하고 주기적으로 한 번에 반영 (304도 조회로 셈)
+    popularity.record_view(id)
+    return response
+
+@bp.route('/products', methods=['POST'])
+@jwt_required()
+@idempotent
+def create_product():
+    user_id = get_jwt_identity()
+    data = request.get_json()
+    
+    name = data.get('name')
+    description = data.get('description', '')
+    price = data.get('price')
+    image_url = data.get('image_url')
+    video_url = data.get('video_url')
+    
+    if not name or price is None:
+        return jsonify({"error": "Name and price are required"}), 400
+    
+    product = Product(
+        name=name,
+        description=description,
+        price=price,
+        image_url=image_url,
+        video_url=video_url,
+        user_id=int(user_id)
+    )
+    
+    db.session.add(product)
+    db.session.commit()
+    cache.bump('products')
+    
+    return jsonify(product.to_dict(user_id=int(user_id))), 201
+
+@bp.route('/products/<int:id>', methods=['PUT'])
+@jwt_required()
+def update_product(id):
+    user_id = get_jwt_identity()
+    product = Product.query.get_or_404(id)
+    
+    if product.user_id != int(user_id):
+        return jsonify({"error": "Unauthorized"}), 403
+    
+    data = request.get_json()
+    old_media = {product.image_url, product.video_url}
+    
+    product.name = data.get('name', product.name)
+    product.description = data.get('description', product.description)
+    product.price = data.get('price', product.price)
+    product.status = data.get('status', product.status)
+    product.image_url = data.get('image_url', product.image_url)
+    product.video_url = data.get('video_url', product.video_url)
+    #교체된 미디어 파일은 백그라운드에서 정리
+    schedule_media_cleanup(old_media - {product.image_url, product.video_url})
+    
+    db.session.commit()
+    cache.bump('products')
+    cache.bump(f'product:{id}')
+    
+    return jsonify(product.to_dict(user_id=int(user_id)))
+
+@bp.route('/products/<int:id>', methods=['DELETE'])
+@jwt_required()
+def delete_product(id):
+    user_id = get_jwt_identity()
+    product = Product.query.get_or_404(id)
+    
+    if product.user_id != int(user_id):
+        return jsonify({"error": "Unauthorized"}), 403
+    
+    #이 상품을 찜한 항목도 함께 삭제 (찜 목록에 삭제된 상품이 남지 않도록)
+    Wishlist.query.filter_by(product_id=id).delete(synchronize_session=False)
+    #채팅방은 상품 없이 남을 수 없으므로 보관 테이블로 옮김 (참여자는 대화 기록을 계속 조회)
+    archive_product_chat_rooms([id], datetime.utcnow())
+    db.session.delete(product)
+    #업로드 파일 정리는 응답 후 백그라운드 작업으로 (같은 트랜잭션으로 예약)
+    schedule_media_cleanup([product.image_url, product.video_url])
+    db.session.commit()
+    cache.bump('products')
+    cache.bump(f'product:{id}')
+    
+    return jsonify({"message": "Product deleted"})
+
+def validate_product(data, partial=False):
+    #일괄 처리 항목 검증 - 오류 메시지 (문제 없으면 None)
+    #partial이면 전달된 필드만 검사 (수정용)
+    if not isinstance(data, dict):
+        return "Item must be an object"
+    if not partial and (not data.get('name') or data.get('price') is None):
+        return "Name and price are required"
+    if 'name' in data and not (isinstance(data['name'], str) and data['name'].strip() and len(data['name']) <= 100):
+        return "Invalid name"
+    if 'price' in data and (isinstance(data['price'], bool) or not isinstance(data['price'], (int, float)) or data['price'] < 0):
+        return "Invalid price"
+    for field in ('description', 'status', 'image_url', 'video_url'):
+        if data.get(field) is not None and not isinstance(data[field], str):
+            return f"Invalid {field}"
+    return None
+
+@bp.route('/products/batch', methods=['POST'])
+@jwt_required()
+def batch_products():
+    #상품 일괄 생성/수정/삭제 - 한 트랜잭션으로 처리하고 항목별 결과 반환
+    #요청: {"create": [{...}], "update": [{"id": 1, ...}], "delete": [1, 2], "atomic": false}
+    #atomic이면 한 항목이라도 실패할 경우 아무것도 반영하지 않음 (422)
+    user_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+    creates = data.get('create') or []
+    updates = data.get('update') or []
+    deletes = data.get('delete') or []
+    
+    if not all(isinstance(items, list) for items in (creates, updates, deletes)) or not batch_ids(deletes):
+        return jsonify({"error": "create and update must be lists of objects, delete a list of ids"}), 400
+    if len(creates) + len(updates) + len(deletes) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"At most {MAX_BATCH_SIZE} items per batch"}), 413
+    
+    results = {'create': [], 'update': [], 'delete': []}
+    
+    #생성 - 한 번의 flush로 모아서 INSERT (insertmanyvalues 배치)
+    created = []
+    for index, item in enumerate(creates):
+        error = validate_product(item)
+        if error:
+            results['create'].append({"index": index, "status": 400, "error": error})
+            continue
+        product = Product(
+            user_id=user_id,
+            **{field: item[field] for field in PRODUCT_FIELDS if item.get(field) is not None}
+        )
+        result = {"index": index, "status": 201}
+        results['create'].append(result)
+        created.append((result, product))
+    db.session.add_all([product for _, product in created])
+    
+    #수정/삭제 대상은 한 번의 쿼리로 조회
+    target_ids = {item['id'] for item in updates if isinstance(item, dict) and batch_ids([item.get('id')])}
+    target_ids.update(deletes)
+    targets = {p.id: p for p in Product.query.filter(Product.id.in_(target_ids))} if target_ids else {}
+    
+    def check_target(product_id):
+        product = targets.get(product_id)
+        if product is None:
+            return 404, "Product not found"
+        if product.user_id != user_id:
+            return 403, "Unauthorized"
+        return None, None
+    
+    #수정으로 교체되거나 삭제된 상품의 미디어 URL (정리 작업 예약용)
+    replaced_media = set()
+    for index, item in enumerate(updates):
+        error = validate_product(item, partial=True)
+        status = 400
+        if error is None and not batch_ids([item.get('id')]):
+            error = "id is required"
+        if error is None:
+            status, error = check_target(item['id'])
+        if error:
+            results['update'].append({"index": index, "status": status, "error": error})
+            continue
+        product = targets[item['id']]
+        old_media = {product.image_url, product.video_url}
+        for field in PRODUCT_FIELDS:
+            if field in item:
+                setattr(product, field, item[field])
+        replaced_media.update(old_media - {product.image_url, product.video_url})
+        results['update'].append({"index": index, "status": 200, "id": product.id})
+    
+    deleted_ids = []
+    for index, product_id in enumerate(deletes):
+        status, error = check_target(product_id)
+        if error:
+            results['delete'].append({"index": index, "status": status, "error": error})
+            continue
+        #같은 ID가 두 번 오면 두 번째는 없는 상품으로 처리
+        del targets[product_id]
+        deleted_ids.append(product_id)
+        results['delete'].append({"index": index, "status": 200, "id": product_id})
+    
+    failed = any(r['status'] >= 400 for items in results.values() for r in items)
+    if failed and data.get('atomic'):
+        db.session.rollback()
+        return jsonify({"results": results}), 422
+    
+    if deleted_ids:
+        #찜 항목 정리, 채팅방 보관 후 상품 삭제 (단건 삭제 API와 동일)
+        Wishlist.query.filter(Wishlist.product_id.in_(deleted_ids)).delete(synchronize_session=False)
+        archive_product_chat_rooms(deleted_ids, datetime.utcnow())
+        for product in Product.query.filter(Product.id.in_(deleted_ids)):
+            replaced_media.update((product.image_url, product.video_url))
+            db.session.delete(product)
+    schedule_media_cleanup(replaced_media)
+    db.session.flush()
+    for result, product in created:
+        result['id'] = product.id
+    db.session.commit()
+    
+    #새 상품은 캐시된 상세 응답이 없으므로 목록 세대만 올림
+    cache.bump('products')
+    for product_id in [r['id'] for r in results['update'] if r['status'] == 200] + deleted_ids:
+        cache.bump(f'product:{product_id}')
+    
+    return jsonify({"results": results})
+
+@bp.route('/my/products', methods=['GET'])
+@jwt_required()
+@replica_reads
+def get_my_products():
+    #내 상품 전체 - Accept: application/x-ndjson이면 나눠 읽으며 한 줄씩 스트리밍 (상품이 많아도 메모리 일정)
+    user_id = int(get_jwt_identity())
+    ndjson = wants_ndjson()
+    
+    #목록 버전 - 상품 수 / 수정 시각 / 찜 수·조회수 합 / 내 찜 목록이 같으면 목록을 만들지 않고 304
+    version = db.session.query(
+        db.func.count(Product.id), db.func.max(Product.updated_at),
+        db.func.sum(Product.wishlist_count), db.func.sum(Product.view_count)
+    ).filter(Product.user_id == user_id).one()
+    wishlist_version = db.session.query(db.func.count(Wishlist.id), db.func.max(Wishlist.id)).filter(
+        Wishlist.user_id == user_id
+    ).one()
+    
+    def build_response():
+        query = with_owner(Product.query).filter_by(user_id=user_id).order_by(Product.created_at.desc())
+        if ndjson:
+            wishlisted_ids = Wishlist.product_ids_for(user_id)
+            return ndjson_response(p.to_dict(wishlisted_ids=wishlisted_ids) for p in query.yield_per(NDJSON_BATCH_SIZE))
+        return jsonify(serialize_products(query.all(), user_id=user_id))
+    
+    response = versioned_response((user_id, ndjson, *version, *wishlist_version), build_response)
+    response.vary.add('Accept')
+    return response
+
+#관리 명령
+@bp.cli.command('reindex-search')
+def reindex_search():
+    #검색 색인 전체 재구축 (flask reindex-search)
+    connection = db.session.connection()
+    if not search_supported(connection):
+        click.echo("Search index is only maintained on SQLite")
+        return
+    rebuild_index(connection, Product.query.yield_per(1000))
+    db.session.commit()
+    click.echo("Search index rebuilt")
@@ -0,0 +1,78 @@
+#================
+# 기본 / 운영 API
+# 상태 확인(생존/준비), 지표, 캐시 통계
+# 지표 / 캐시 통계는 내부 구조(엔드포인트별 지연, 캐시 키 수 등)를 드러내므로 METRICS_TOKEN으로만 조회
+#================
+
+import functools
+import hmac
+
+from flask import Blueprint, Response, current_app, jsonify, request
+from sqlalchemy import text
+
+from .extensions import cache, chat_broker, db, draining
+
+bp = Blueprint('system', __name__)
+
+
+@bp.route('/')
+def home():
+    return jsonify({"message": "Welcome to 유니브당근 API"})
+
+@bp.route('/api/health')
+def health():
+    return jsonify({"status": "healthy"})
+
+@bp.route('/api/ready')
+def ready():
+    #준비 상태 확인 - 종료 중이거나 DB에 연결할 수 없으면 503 (로드밸런서가 트래픽을 보내지 않음)
+    if draining.is_set():
+        return jsonify({"status": "draining"}), 503
+    try:
+        db.session.execute(text('SELECT 1'))
+    except Exception:
+        current_app.logger.exception("Readiness check failed")
+        return jsonify({"status": "unavailable"}), 503
+    return jsonify({"status": "ready"})
+
+def operator_only(view):
+    #Authorization: Bearer <METRICS_TOKEN> 요청만 허용 - 토큰이 설정되지 않았으면 없는 경로처럼 404
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        token = current_app.config['METRICS_TOKEN']
+        if not token:
+            return jsonify({"error": "Not found"}), 404
+        supplied = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(supplied.encode(), f'Bearer {token}'.encode()):
+            return jsonify({"error": "Unauthorized"}), 401
+        return view(*args, **kwargs)
+    return wrapper
+
+@bp.route('/api/metrics')
+@operator_only
+def metrics():
+    #Prometheus 수집용 지표 (워커 프로세스 단위)
+    gauges = {f"cache_{k}": v for k, v in cache.stats().items() if isinstance(v, (int, float))}
+    gauges['chat_stream_subscribers'] = chat_broker.subscriber_count()
+    job_queue = current_app.extensions.get('job_queue')
+    if job_queue is not None:
+        gauges.update({f"jobs_{k}": v for k, v in job_queue.stats().items()})
+    popularity = current_app.extensions.get('popularity')
+    if popularity is not None:
+        gauges.update({f"views_{k}": v for k, v in popularity.stats().items()})
+    router = current_app.extensions.get('replica_router')
+    if router is not None:
+        gauges.update({f"db_{k}": v for k, v in router.stats().items()})
+    compressor = current_app.extensions['compressor']
+    gauges.update({f"compress_cache_{k}": v for k, v in compressor.stats().items() if isinstance(v, (int, float))})
+    limiter = current_app.extensions['rate_limiter']
+    gauges.update({f"rate_limit_{k}": v for k, v in limiter.stats().items() if isinstance(v, (int, float))})
+    body = current_app.extensions['request_metrics'].render(gauges)
+    body += '\n'.join(limiter.render()) + '\n'
+    return Response(body, mimetype='text/plain; version=0.0.4')
+
+@bp.route('/api/cache/stats')
+@operator_only
+def cache_stats():
+    #캐시 적중/미스/축출 카운터 (캐시 크기 조정용)
+    return jsonify(cache.stats())
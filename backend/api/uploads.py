@@ -0,0 +1,135 @@
+#================
+# 업로드 / 미디어 API
+# 단일·청크 업로드, 업로드 파일 제공 (조건부/Range 요청, 프록시 전송 위임)
+#================
+
+import mimetypes  #미디어 Content-Type 추정
+import os
+
+from flask import Blueprint, current_app, jsonify, request, send_from_directory
+from flask_jwt_extended import get_jwt_identity, jwt_required
+
+from media import UploadError, file_extension, is_immutable, thumbnail_urls  #미디어 업로드/썸네일
+
+from .config import UPLOAD_CHUNK_SIZE
+from .extensions import chunked_uploads, db
+from .jobs import enqueue, schedule_upload_expiry, thumbnailer
+
+bp = Blueprint('uploads', __name__)
+
+ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'mp4', 'mov', 'webm'}
+
+# 미디어 캐시 기간 - 내용 해시 이름은 영구, 그 외 하루
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+MEDIA_MAX_AGE = 24 * 3600
+
+
+def allowed_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+
+
+@bp.route('/uploads/<path:filename>')
+def uploaded_file(filename):
+    #ETag/Last-Modified 조건부 요청과 Range(206) 요청 지원 - 동영상 탐색용
+    #진행 중인 업로드(.partial) 등 숨김 경로는 제공하지 않음
+    if any(part.startswith('.') for part in filename.split('/')):
+        return jsonify({"error": "File not found"}), 404
+    immutable = is_immutable(filename)
+    if current_app.config['MEDIA_OFFLOAD'] == 'x-accel':
+        #nginx가 파일을 직접 전송 (Range/조건부 요청도 nginx가 처리)
+        if not os.path.isfile(os.path.join(current_app.config['UPLOAD_FOLDER'], filename)):
+            return jsonify({"error": "File not found"}), 404
+        response = current_app.response_class()
+        response.headers['X-Accel-Redirect'] = current_app.config['MEDIA_ACCEL_PREFIX'] + filename
+        response.headers['Content-Type'] = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    else:
+        response = send_from_directory(
+            current_app.config['UPLOAD_FOLDER'], filename,
+            conditional=True, etag=True,
+            max_age=IMMUTABLE_MAX_AGE if immutable else MEDIA_MAX_AGE
+        )
+    #내용 해시 이름은 내용이 바뀌지 않으므로 재검증 없이 영구 캐시
+    response.headers['Cache-Control'] = (
+        f"public, max-age={IMMUTABLE_MAX_AGE}, immutable" if immutable else f"public, max-age={MEDIA_MAX_AGE}"
+    )
+    response.headers['Accept-Ranges'] = 'bytes'
+    return response
+
+def upload_error(e):
+    return jsonify({"error": e.message}), e.status
+
+def upload_complete(filename):
+    #저장 완료된 파일의 썸네일 생성을 백그라운드 작업으로 요청 (재시작해도 유실되지 않음)
+    if thumbnailer.accepts(filename):
+        enqueue('generate_thumbnails', filename=filename)
+        db.session.commit()
+    file_url = f"/uploads/{filename}"
+    return jsonify({"url": file_url, "thumbnails": thumbnail_urls(file_url)}), 201
+
+@bp.route('/api/upload', methods=['POST'])
+@jwt_required()
+def upload_file():
+    #단일 요청 업로드 (작은 파일용) - 큰 파일은 /api/uploads 청크 업로드 사용
+    if 'file' not in request.files:
+        return jsonify({"error": "No file provided"}), 400
+    
+    file = request.files['file']
+    if file.filename == '':
+        return jsonify({"error": "No file selected"}), 400
+    
+    if file and allowed_file(file.filename):
+        filename = chunked_uploads.save_stream(file.stream, file_extension(file.filename))
+        return upload_complete(filename)
+    
+    return jsonify({"error": "File type not allowed"}), 400
+
+@bp.route('/api/uploads', methods=['POST'])
+@jwt_required()
+def create_upload():
+    #청크 업로드 시작 - {filename, size} -> {upload_id, offset, size, chunk_size}
+    user_id = int(get_jwt_identity())
+    data = request.get_json()
+    
+    filename = data.get('filename')
+    try:
+        size = int(data.get('size'))
+    except (TypeError, ValueError):
+        return jsonify({"error": "filename and size are required"}), 400
+    if not filename:
+        return jsonify({"error": "filename and size are required"}), 400
+    
+    try:
+        upload = chunked_uploads.create(user_id, filename, size, ALLOWED_EXTENSIONS)
+    except UploadError as e:
+        return upload_error(e)
+    #끝나지 않고 버려진 업로드의 임시 파일은 만료 후 미디어 정리 작업이 삭제
+    schedule_upload_expiry()
+    db.session.commit()
+    
+    upload['chunk_size'] = UPLOAD_CHUNK_SIZE
+    return jsonify(upload), 201
+
+@bp.route('/api/uploads/<upload_id>', methods=['GET'])
+@jwt_required()
+def get_upload(upload_id):
+    #이어받기용 현재 오프셋 조회
+    try:
+        return jsonify(chunked_uploads.status(upload_id, int(get_jwt_identity())))
+    except UploadError as e:
+        return upload_error(e)
+
+@bp.route('/api/uploads/<upload_id>', methods=['PUT'])
+@jwt_required()
+def upload_chunk(upload_id):
+    #청크 전송 - 본문은 원시 바이트, Content-Range: bytes <start>-<end>/<total>
+    #마지막 청크면 201 + 파일 URL, 아니면 200 + 다음 오프셋
+    user_id = int(get_jwt_identity())
+    try:
+        filename = chunked_uploads.write_chunk(
+            upload_id, user_id, request.headers.get('Content-Range'), request.stream
+        )
+        if filename:
+            return upload_complete(filename)
+        return jsonify(chunked_uploads.status(upload_id, user_id))
+    except UploadError as e:
+        return upload_error(e)
@@ -0,0 +1,164 @@
+#================
+# 위시리스트 API
+#================
+
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import get_jwt_identity, jwt_required
+
+from replicas import replica_reads  #읽기 복제본 라우팅
+
+from .common import MAX_BATCH_SIZE, batch_ids, insert_many_or_ignore, insert_or_ignore, parse_limit, versioned_json
+from .extensions import cache, db
+from .models import Product, Wishlist
+
+bp = Blueprint('wishlist', __name__, url_prefix='/api/wishlist')
+
+
+@bp.route('', methods=['GET'])
+@jwt_required()
+@replica_reads
+def get_wishlist():
+    #찜 목록 - 상품/판매자를 한 번의 조인 쿼리로 조회, 최근 찜한 순 + 찜 ID 커서 페이지네이션
+    user_id = int(get_jwt_identity())
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        cursor = int(request.args['cursor']) if request.args.get('cursor') else None
+    except ValueError:
+        return jsonify({"error": "Invalid query parameters"}), 400
+    
+    #목록 버전 - 찜 수 / 마지막 찜 / 상품 수정 시각 / 상품별 찜 수·조회수 합이 같으면 목록을 만들지 않고 304
+    version = db.session.query(
+        db.func.count(Wishlist.id), db.func.max(Wishlist.id), db.func.max(Product.updated_at),
+        db.func.sum(Product.wishlist_count), db.func.sum(Product.view_count)
+    ).join(Product, Product.id == Wishlist.product_id).filter(Wishlist.user_id == user_id).one()
+    
+    def build():
+        query = db.session.query(Wishlist.id, Product).join(Product, Product.id == Wishlist.product_id).options(
+            db.joinedload(Product.owner)
+        ).filter(Wishlist.user_id == user_id)
+        if cursor is not None:
+            query = query.filter(Wishlist.id < cursor)
+        
+        #다음 페이지 존재 여부 확인을 위해 한 개 더 조회
+        rows = query.order_by(Wishlist.id.desc()).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        wishlisted_ids = {product.id for _, product in rows}
+        return {
+            "items": [product.to_dict(wishlisted_ids=wishlisted_ids) for _, product in rows],
+            "next_cursor": str(rows[-1][0]) if has_more else None
+        }
+    
+    return versioned_json((user_id, *version), build)
+
+@bp.route('/<int:product_id>', methods=['POST'])
+@jwt_required()
+def add_to_wishlist(product_id):
+    user_id = int(get_jwt_identity())
+    Product.query.get_or_404(product_id)
+    
+    #중복 검사와 삽입을 한 문장으로 처리 (고유 인덱스 기반, 동시 요청에도 안전)
+    if not insert_or_ignore(Wishlist, user_id=user_id, product_id=product_id):
+        return jsonify({"error": "Already in wishlist"}), 400
+    
+    #찜 수 반영은 상품 수정이 아니므로 updated_at(onupdate)은 그대로 둠
+    Product.query.filter_by(id=product_id).update(
+        {Product.wishlist_count: Product.wishlist_count + 1, Product.updated_at: Product.updated_at},
+        synchronize_session=False
+    )
+    db.session.commit()
+    #찜 수가 피드/상세에 표시되므로 상품 캐시도 무효화
+    cache.bump(f'wishlist:{user_id}')
+    cache.bump('products')
+    cache.bump(f'product:{product_id}')
+    
+    return jsonify({"message": "Added to wishlist"}), 201
+
+@bp.route('/<int:product_id>', methods=['DELETE'])
+@jwt_required()
+def remove_from_wishlist(product_id):
+    user_id = int(get_jwt_identity())
+    
+    deleted = Wishlist.query.filter_by(user_id=user_id, product_id=product_id).delete(synchronize_session=False)
+    if not deleted:
+        return jsonify({"error": "Not in wishlist"}), 404
+    
+    Product.query.filter_by(id=product_id).update(
+        {Product.wishlist_count: Product.wishlist_count - 1, Product.updated_at: Product.updated_at},
+        synchronize_session=False
+    )
+    db.session.commit()
+    cache.bump(f'wishlist:{user_id}')
+    cache.bump('products')
+    cache.bump(f'product:{product_id}')
+    
+    return jsonify({"message": "Removed from wishlist"})
+
+@bp.route('/batch', methods=['POST'])
+@jwt_required()
+def batch_wishlist():
+    #찜 일괄 추가/삭제 - 종류별 한 문장으로 처리하고 항목별 결과 반환
+    #요청: {"add": [상품 ID...], "remove": [상품 ID...]}
+    user_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+    add_ids = data.get('add') or []
+    remove_ids = data.get('remove') or []
+    
+    if not all(isinstance(items, list) and batch_ids(items) for items in (add_ids, remove_ids)):
+        return jsonify({"error": "add and remove must be lists of product ids"}), 400
+    if len(add_ids) + len(remove_ids) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"At most {MAX_BATCH_SIZE} items per batch"}), 413
+    
+    existing = {
+        product_id for (product_id,) in db.session.query(Product.id).filter(Product.id.in_(add_ids))
+    } if add_ids else set()
+    added = set(insert_many_or_ignore(
+        Wishlist,
+        [{'user_id': user_id, 'product_id': product_id} for product_id in dict.fromkeys(add_ids) if product_id in existing],
+        Wishlist.product_id
+    ))
+    removed = set(db.session.execute(
+        db.delete(Wishlist).where(Wishlist.user_id == user_id, Wishlist.product_id.in_(remove_ids))
+        .returning(Wishlist.product_id)
+    ).scalars()) if remove_ids else set()
+    
+    #찜 수는 상품별 증감을 한 문장씩으로 반영 (add_to_wishlist와 같이 updated_at은 그대로)
+    if added:
+        Product.query.filter(Product.id.in_(added)).update(
+            {Product.wishlist_count: Product.wishlist_count + 1, Product.updated_at: Product.updated_at},
+            synchronize_session=False
+        )
+    if removed:
+        Product.query.filter(Product.id.in_(removed)).update(
+            {Product.wishlist_count: Product.wishlist_count - 1, Product.updated_at: Product.updated_at},
+            synchronize_session=False
+        )
+    db.session.commit()
+    
+    def result(product_id, done, ok_status, error):
+        if done:
+            return {"product_id": product_id, "status": ok_status}
+        return {"product_id": product_id, "status": error[0], "error": error[1]}
+    
+    #같은 ID가 여러 번 오면 첫 항목만 성공으로 처리
+    add_results = []
+    for product_id in add_ids:
+        if product_id not in existing:
+            add_results.append(result(product_id, False, 201, (404, "Product not found")))
+        else:
+            add_results.append(result(product_id, product_id in added, 201, (400, "Already in wishlist")))
+            added.discard(product_id)
+    remove_results = []
+    for product_id in remove_ids:
+        remove_results.append(result(product_id, product_id in removed, 200, (404, "Not in wishlist")))
+        removed.discard(product_id)
+    
+    changed = {r['product_id'] for r in add_results + remove_results if r['status'] < 400}
+    if changed:
+        cache.bump(f'wishlist:{user_id}')
+        cache.bump('products')
+        for product_id in changed:
+            cache.bump(f'product:{product_id}')
+    
+    return jsonify({"results": {"add": add_results, "remove": remove_results}})
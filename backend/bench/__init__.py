@@ -0,0 +1,5 @@
+#================
+# API 벤치마크
+# 합성 데이터셋을 임시 DB에 생성하고, 프론트엔드 트래픽 비율을 흉내낸 동시 클라이언트로 부하를 줌
+# 실행: cd backend && python -m bench --help
+#================
@@ -0,0 +1,167 @@
+#================
+# 벤치마크 실행기
+# 예) python -m bench --products 10000 --clients 16 --pollers 200 --duration 30
+#     python -m bench --mode gunicorn --workers 2 --threads 8 --output bench.json
+#     python -m bench --mode gunicorn --workers 1 --worker-class gevent --streams 3000
+#================
+
+import argparse
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from .report import build_report, print_summary, write_report
+from .seed import seed
+from .workload import HttpSession, InProcessSession, StreamHolder, run_workload
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bench', description='유니브 당근 API 벤치마크')
+    parser.add_argument('--mode', choices=('inprocess', 'gunicorn'), default='inprocess')
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--products', type=int, default=10000)
+    parser.add_argument('--wishlists', type=int, default=5, help='사용자당 찜 수')
+    parser.add_argument('--rooms', type=int, default=500)
+    parser.add_argument('--messages', type=int, default=20, help='채팅방당 메시지 수')
+    parser.add_argument('--clients', type=int, default=16, help='연속 요청하는 가상 사용자 수')
+    parser.add_argument('--pollers', type=int, default=100, help='3초마다 폴링하는 열린 채팅창 수')
+    parser.add_argument('--poll-interval', type=float, default=3.0)
+    parser.add_argument('--streams', type=int, default=0, help='측정 동안 열어둘 SSE 연결 수 (gunicorn 모드)')
+    parser.add_argument('--duration', type=float, default=20.0, help='측정 시간 (초)')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn 워커 수')
+    parser.add_argument('--threads', type=int, default=8, help='gunicorn 워커당 스레드 수')
+    parser.add_argument('--worker-class', choices=('gthread', 'gevent'), default='gthread')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='bench-report.json')
+    args = parser.parse_args(argv)
+    if args.streams and args.mode != 'gunicorn':
+        parser.error('--streams requires --mode gunicorn')
+    return args
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_until_ready(base_url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f'{base_url}/api/ready', timeout=1) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('gunicorn did not become ready in time')
+
+
+def start_gunicorn(workers, threads, worker_class='gthread', env=None):
+    #prepare()의 DB로 gunicorn 서버 시작 후 준비될 때까지 대기 - (프로세스, 주소)
+    #워커 설정은 gunicorn.conf.py와 같은 환경변수로 전달 (SSE 스트림 한도도 같이 계산됨)
+    port = free_port()
+    base_url = f'http://127.0.0.1:{port}'
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), GUNICORN_THREADS=str(threads),
+               GUNICORN_WORKER_CLASS=worker_class, **(env or {}))
+    server = subprocess.Popen(['gunicorn', '--bind', f'127.0.0.1:{port}', 'app:app'], cwd=BACKEND_DIR, env=env)
+    try:
+        wait_until_ready(base_url)
+    except RuntimeError:
+        stop_gunicorn(server)
+        raise
+    return server, base_url
+
+
+def stop_gunicorn(server):
+    server.terminate()
+    server.wait(timeout=30)
+
+
+def prepare(args, workdir):
+    #임시 DB에 스키마/데이터 생성 후 (앱, 데이터셋 정보, 벤치 사용자 목록) 반환
+    #gunicorn 모드의 서버 프로세스도 같은 DB를 쓰도록 환경변수로 설정
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ['UPLOAD_FOLDER'] = os.path.join(workdir, 'uploads')
+    os.environ['METRICS_SAMPLE_RATE'] = '1'
+    os.environ['METRICS_SERVER_TIMING'] = '1'
+    #가상 사용자가 같은 IP에서 몰아서 요청하므로 빈도 제한은 끔 (제한 비용은 bench.limiter로 측정)
+    os.environ['RATE_LIMIT_ENABLED'] = '0'
+    os.environ.setdefault('JWT_SECRET_KEY', 'univ-carrot-bench-secret-key-0123456789')
+    sys.path.insert(0, BACKEND_DIR)
+    from api import create_app
+    from api.auth import issue_tokens
+    from api.extensions import db
+    from api.models import ChatRoom, Message, Product, User, Wishlist
+    from search import rebuild_index
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        dataset = seed(
+            db, (User, Product, Wishlist, ChatRoom, Message),
+            users=args.users, products=args.products, wishlists=args.wishlists,
+            rooms=args.rooms, messages=args.messages, seed=args.seed,
+        )
+        rebuild_index(db.session.connection(), Product.query.yield_per(1000))
+        db.session.commit()
+
+        #채팅방 참여자 정보 포함, 토큰은 로그인 대신 직접 발급 (해싱 비용 제외)
+        rooms_by_user = {}
+        for room in ChatRoom.query.all():
+            rooms_by_user.setdefault(room.buyer_id, []).append(room.id)
+            rooms_by_user.setdefault(room.seller_id, []).append(room.id)
+        users = []
+        for user in User.query.order_by(User.id).all():
+            tokens = issue_tokens(user.identity())
+            users.append({'id': user.id, 'token': tokens['access_token'], 'rooms': rooms_by_user.get(user.id, [])})
+        db.session.remove()
+    return app, dataset, users
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix='univ-carrot-bench-')
+    server = None
+    try:
+        print(f'seeding dataset in {workdir} ...')
+        app, dataset, users = prepare(args, workdir)
+        meta = {'mode': args.mode, 'dataset': dataset, 'clients': args.clients, 'pollers': args.pollers,
+                'poll_interval_s': args.poll_interval, 'duration_s': args.duration}
+
+        stream_holder = None
+        if args.mode == 'inprocess':
+            make_session = lambda: InProcessSession(app)
+        else:
+            server, base_url = start_gunicorn(args.workers, args.threads, args.worker_class)
+            meta.update(workers=args.workers, threads=args.threads, worker_class=args.worker_class)
+            make_session = lambda: HttpSession(base_url)
+            if args.streams:
+                stream_holder = StreamHolder(base_url, users, args.streams)
+
+        print(f'running {args.mode} workload for {args.duration}s ...')
+        recorder, elapsed = run_workload(
+            make_session, users, dataset, args.clients, args.pollers, args.duration, args.poll_interval,
+            stream_holder=stream_holder,
+        )
+        if stream_holder is not None:
+            meta['streams'] = stream_holder.summary()
+        report = build_report(recorder, elapsed, meta)
+        write_report(report, args.output)
+        print_summary(report)
+        print(f'report written to {args.output}')
+    finally:
+        if server is not None:
+            stop_gunicorn(server)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#================
+# 상품 대량 등록 벤치마크
+# 단건 API 반복 호출 vs 일괄 처리 API 처리량 비교
+# 예) python -m bench.bulk_import --count 10000 --output import.json
+#================
+
+import argparse
+import json
+import random
+import shutil
+import tempfile
+import time
+
+from .__main__ import parse_args as parse_bench_args, prepare
+from .report import git_commit, write_report
+from .seed import WORDS
+from .workload import InProcessSession
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bench.bulk_import', description='상품 대량 등록 처리량 비교')
+    parser.add_argument('--count', type=int, default=10000, help='등록할 상품 수')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='bench-import.json')
+    return parser.parse_args(argv)
+
+
+def listings(count, rng):
+    return [
+        {
+            'name': ' '.join(rng.sample(WORDS, 2)),
+            'description': ' '.join(rng.choices(WORDS, k=12)),
+            'price': rng.randint(1, 500) * 1000,
+        }
+        for _ in range(count)
+    ]
+
+
+def timed(label, run):
+    start = time.perf_counter()
+    errors = run()
+    elapsed = time.perf_counter() - start
+    print(f'{label:<10}{elapsed:>10.2f}s  errors={errors}')
+    return elapsed, errors
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix='univ-carrot-import-')
+    try:
+        bench_args = parse_bench_args(['--users', '1', '--products', '0', '--rooms', '0', '--wishlists', '0'])
+        app, _, users = prepare(bench_args, workdir)
+        session = InProcessSession(app)
+        headers = {'Authorization': f"Bearer {users[0]['token']}"}
+        items = listings(args.count, random.Random(args.seed))
+
+        def per_item():
+            return sum(session.request('POST', '/api/products', item, headers)[0] != 201 for item in items)
+
+        def batched():
+            errors = 0
+            for start in range(0, len(items), args.batch_size):
+                status, data, _ = session.request(
+                    'POST', '/api/products/batch', {'create': items[start:start + args.batch_size]}, headers
+                )
+                results = json.loads(data)['results']['create'] if status == 200 else []
+                errors += sum(r['status'] != 201 for r in results) + (status != 200)
+            return errors
+
+        print(f'importing {args.count} listings ...')
+        per_item_time, per_item_errors = timed('per-item', per_item)
+        batch_time, batch_errors = timed('batch', batched)
+        report = {
+            'meta': {'commit': git_commit(), 'count': args.count, 'batch_size': args.batch_size},
+            'per_item': {'seconds': round(per_item_time, 3), 'errors': per_item_errors,
+                         'listings_per_second': round(args.count / per_item_time, 1)},
+            'batch': {'seconds': round(batch_time, 3), 'errors': batch_errors,
+                      'listings_per_second': round(args.count / batch_time, 1)},
+            'speedup': round(per_item_time / batch_time, 1),
+        }
+        write_report(report, args.output)
+        print(f"speedup x{report['speedup']}, report written to {args.output}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
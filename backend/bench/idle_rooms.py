@@ -0,0 +1,140 @@
+#================
+# 열린 채팅방 유휴 부하 벤치마크
+# 새 메시지가 없는 채팅방 N개를 열어둔 상태의 DB 부하 - 3초 폴링(이전 방식) vs SSE(실시간 전달)
+# 다른 요청 없이 전송 방식별로 같은 gunicorn 서버에 연결, DB 쿼리 수는 응답의 Server-Timing 헤더 기준
+# SSE는 스트림을 여는 요청에서만 쿼리를 실행하므로 (본문 전송 중에는 DB 연결 반환) 연결 비용과 유지 비용을 따로 보고
+# 예) python -m bench.idle_rooms --rooms 500 --duration 30 --output idle-rooms.json
+#================
+
+import argparse
+import shutil
+import tempfile
+import threading
+import time
+
+from .__main__ import parse_args as parse_bench_args, prepare, start_gunicorn, stop_gunicorn
+from .report import git_commit, summarize, write_report
+from .workload import HttpSession, Recorder, StreamHolder, poll_chat
+
+# 스트림이 모두 열리기를 기다리는 최대 시간 (초)
+STREAM_OPEN_TIMEOUT = 60
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bench.idle_rooms', description='열린 채팅방의 유휴 DB 부하 측정')
+    parser.add_argument('--rooms', type=int, default=500, help='열어둘 채팅방 수')
+    parser.add_argument('--duration', type=float, default=30.0, help='전송 방식별 측정 시간 (초)')
+    parser.add_argument('--poll-interval', type=float, default=3.0)
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn 워커 수')
+    parser.add_argument('--output', default='bench-idle-rooms.json')
+    return parser.parse_args(argv)
+
+
+def db_load(entry, elapsed):
+    #Recorder 항목 -> 요청 수 / DB 쿼리 수 / 초당 쿼리 수 + 지연 요약
+    queries = sum(entry['queries'])
+    return {
+        **summarize(entry['latencies'], entry['queries'], entry['errors'], elapsed),
+        'db_queries': queries,
+        'db_qps': round(queries / elapsed, 2) if elapsed else None,
+    }
+
+
+def measure_polling(base_url, targets, duration, interval):
+    #채팅방마다 interval초 간격으로 ?after=<마지막 메시지 ID> 폴링 (새 메시지 없음)
+    recorder = Recorder()
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=poll_chat, args=(HttpSession(base_url), user, room_id, recorder, stop, interval),
+                         daemon=True)
+        for user, room_id in targets
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=30)
+    elapsed = time.perf_counter() - started
+    entry = recorder.samples.get('chat_poll', {'latencies': [], 'queries': [], 'errors': 0})
+    return db_load(entry, elapsed)
+
+
+def measure_sse(base_url, targets, duration):
+    #채팅방마다 SSE 스트림 하나 - 모두 열린 뒤 duration초 동안 유지하며 그 사이 실행된 쿼리 측정
+    recorder = Recorder()
+    stop = threading.Event()
+    ready = threading.Event()
+    holder = StreamHolder(base_url, [], len(targets), targets=targets)
+    thread = threading.Thread(target=holder.run, args=(recorder, stop, ready), daemon=True)
+    open_started = time.perf_counter()
+    thread.start()
+    ready.wait()
+    deadline = time.monotonic() + STREAM_OPEN_TIMEOUT
+    while holder.opened + holder.rejected < holder.count and time.monotonic() < deadline:
+        time.sleep(0.1)
+    open_elapsed = time.perf_counter() - open_started
+
+    opened = recorder.samples.get('stream_open', {'latencies': [], 'queries': [], 'errors': 0})
+    opened = {key: list(value) if isinstance(value, list) else value for key, value in opened.items()}
+    started = time.perf_counter()
+    time.sleep(duration)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    thread.join(timeout=30)
+
+    #측정 구간의 요청 = 유지 중 다시 연 스트림 (끊김이 없으면 0)
+    window = recorder.samples.get('stream_open', {'latencies': [], 'queries': [], 'errors': 0})
+    reopened = {key: value[len(opened[key]):] if isinstance(value, list) else 0 for key, value in window.items()}
+    return {
+        'streams': holder.summary(),
+        'open': db_load(opened, open_elapsed),
+        **db_load(reopened, elapsed),
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix='univ-carrot-idle-')
+    server = None
+    try:
+        print(f'seeding {args.rooms} chat rooms in {workdir} ...')
+        bench_args = parse_bench_args(['--users', '200', '--products', '2000', '--rooms', str(args.rooms)])
+        _, _, users = prepare(bench_args, workdir)
+        #채팅방마다 참여자 한 명이 창을 열어둠
+        owners = {}
+        for user in users:
+            for room_id in user['rooms']:
+                owners.setdefault(room_id, user)
+        targets = [(owners[room_id], room_id) for room_id in sorted(owners)[:args.rooms]]
+
+        #gthread에서는 SSE 스트림이 스레드를 하나씩 점유하므로 모든 스트림을 받을 수 있게 스레드 수 / 스트림 한도 지정
+        threads = len(targets) + 16
+        server, base_url = start_gunicorn(args.workers, threads, env={'CHAT_STREAM_LIMIT': str(len(targets))})
+
+        print(f'polling {len(targets)} idle rooms every {args.poll_interval}s for {args.duration}s ...')
+        polling = measure_polling(base_url, targets, args.duration, args.poll_interval)
+        print(f'holding {len(targets)} idle SSE streams for {args.duration}s ...')
+        sse = measure_sse(base_url, targets, args.duration)
+
+        report = {
+            'meta': {'commit': git_commit(), 'rooms': len(targets), 'duration_s': args.duration,
+                     'poll_interval_s': args.poll_interval, 'workers': args.workers, 'threads': threads},
+            'results': {'polling': polling, 'sse': sse},
+        }
+        write_report(report, args.output)
+        print(f"{'transport':<10}{'requests':>10}{'db queries':>12}{'db qps':>10}{'p50':>10}")
+        for name, row in (('polling', polling), ('sse open', sse['open']), ('sse idle', sse)):
+            p50 = '-' if row['p50_ms'] is None else f"{row['p50_ms']:.1f}ms"
+            print(f"{name:<10}{row['requests']:>10}{row['db_queries']:>12}{row['db_qps']:>10}{p50:>10}")
+        print(f"streams: {sse['streams']}")
+        print(f'report written to {args.output}')
+    finally:
+        if server is not None:
+            stop_gunicorn(server)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
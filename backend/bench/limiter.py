@@ -0,0 +1,140 @@
+#================
+# 요청 수락 제어 벤치마크
+# 빈도 제한 켜기/끄기에 따른 요청당 지연 차이, 버킷 저장소 단독 비용, 거절 응답 비용 측정
+# 예) python -m bench.limiter --requests 5000 --output limiter.json
+#================
+
+import argparse
+import shutil
+import tempfile
+import threading
+import time
+
+from .__main__ import parse_args as parse_bench_args, prepare
+from .report import git_commit, summarize, write_report
+from .workload import InProcessSession
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bench.limiter', description='빈도 제한 오버헤드 측정')
+    parser.add_argument('--requests', type=int, default=5000, help='시나리오별 요청 수 (켜기/끄기 각각)')
+    parser.add_argument('--hits', type=int, default=200000, help='버킷 저장소 단독 측정 횟수')
+    parser.add_argument('--threads', type=int, default=8, help='버킷 저장소 동시 측정 스레드 수')
+    parser.add_argument('--storage', choices=('memory', 'redis'), default='memory')
+    parser.add_argument('--redis-url', default='redis://localhost:6379/0')
+    parser.add_argument('--output', default='bench-limiter.json')
+    return parser.parse_args(argv)
+
+
+def store_hits(store, hits, threads):
+    #여러 클라이언트 키에 번갈아 hit - 스레드 경합 포함 hit당 평균 시간 (마이크로초)
+    per_thread = hits // threads
+
+    def run(offset):
+        for i in range(per_thread):
+            store.hit(f'bench:{(offset + i) % 1000}', 1000000, 1000000.0)
+
+    workers = [threading.Thread(target=run, args=(n * 7919,)) for n in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return round((time.perf_counter() - start) / (per_thread * threads) * 1e6, 3)
+
+
+def timed_requests(session, method, path, headers, count, body=None):
+    latencies, statuses = [], {}
+    for _ in range(count):
+        start = time.perf_counter()
+        status = session.request(method, path, body, headers)[0]
+        latencies.append(time.perf_counter() - start)
+        statuses[status] = statuses.get(status, 0) + 1
+    return latencies, statuses
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix='univ-carrot-limiter-')
+    try:
+        bench_args = parse_bench_args(['--users', '10', '--products', '200', '--rooms', '20', '--messages', '5'])
+        _, _, users = prepare(bench_args, workdir)
+        from api import create_app
+        from ratelimit import create_bucket_store
+
+        #측정 중 거절되지 않도록 한도는 크게, 저장소 접근 / 키 계산 비용만 남김
+        config = {
+            'RATE_LIMIT_STORAGE': args.storage,
+            'RATE_LIMIT_REDIS_URL': args.redis_url,
+            'RATE_LIMITS': {},
+            'RATE_LIMIT_DEFAULT': '1000000/second',
+        }
+        sessions = {
+            'off': InProcessSession(create_app({**config, 'RATE_LIMIT_ENABLED': False})),
+            'on': InProcessSession(create_app({**config, 'RATE_LIMIT_ENABLED': True})),
+        }
+        token = {'Authorization': f"Bearer {users[0]['token']}"}
+        scenarios = {
+            'me_authenticated': ('GET', '/api/auth/me', token),
+            'product_detail_anonymous': ('GET', '/api/products/1', {}),
+        }
+
+        results = {}
+        for name, (method, path, headers) in scenarios.items():
+            for session in sessions.values():
+                timed_requests(session, method, path, headers, 200)  #워밍업
+            row = {}
+            #켜기/끄기를 번갈아 여러 번 나눠 측정 (시간에 따른 편차 상쇄)
+            latencies = {mode: [] for mode in sessions}
+            rounds = 10
+            for _ in range(rounds):
+                for mode, session in sessions.items():
+                    latencies[mode].extend(timed_requests(session, method, path, headers, args.requests // rounds)[0])
+            for mode in sessions:
+                row[mode] = summarize(latencies[mode], [], 0, sum(latencies[mode]))
+            row['overhead_us'] = round((row['on']['mean_ms'] - row['off']['mean_ms']) * 1000, 1)
+            results[name] = row
+
+        #거절 경로 - 한 IP에서 로그인 반복 (허용된 요청은 비밀번호 해싱, 초과분은 본문을 읽기 전에 429)
+        limited = InProcessSession(create_app({
+            'RATE_LIMIT_STORAGE': args.storage, 'RATE_LIMIT_REDIS_URL': args.redis_url, 'RATE_LIMIT_ENABLED': True,
+        }))
+        credentials = {'username': 'user1', 'password': 'wrong-password'}
+        login_latencies, login_statuses = [], []
+        for _ in range(50):
+            start = time.perf_counter()
+            login_statuses.append(limited.request('POST', '/api/auth/login', credentials)[0])
+            login_latencies.append(time.perf_counter() - start)
+        allowed = [t for t, s in zip(login_latencies, login_statuses) if s != 429]
+        rejected = [t for t, s in zip(login_latencies, login_statuses) if s == 429]
+        results['login_flood'] = {
+            'allowed': summarize(allowed, [], 0, sum(allowed)),
+            'rejected': summarize(rejected, [], 0, sum(rejected)),
+        }
+
+        store = create_bucket_store({'RATE_LIMIT_STORAGE': args.storage, 'RATE_LIMIT_REDIS_URL': args.redis_url})
+        results['store_hit_us'] = {
+            'single_thread': store_hits(store, args.hits, 1),
+            f'{args.threads}_threads': store_hits(store, args.hits, args.threads),
+        }
+
+        report = {
+            'meta': {'commit': git_commit(), 'storage': args.storage, 'requests': args.requests},
+            'results': results,
+        }
+        write_report(report, args.output)
+        for name in scenarios:
+            row = results[name]
+            print(f"{name:<28} off {row['off']['mean_ms']:.3f}ms  on {row['on']['mean_ms']:.3f}ms  "
+                  f"overhead {row['overhead_us']:.1f}us")
+        flood = results['login_flood']
+        print(f"{'login_flood':<28} allowed {flood['allowed']['requests']} (p50 {flood['allowed']['p50_ms']}ms)  "
+              f"rejected {flood['rejected']['requests']} (p50 {flood['rejected']['p50_ms']}ms)")
+        print(f"{'store_hit':<28} {results['store_hit_us']}")
+        print(f'report written to {args.output}')
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
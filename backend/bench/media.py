@@ -0,0 +1,156 @@
+#================
+# 동영상 Range 요청 벤치마크
+# 업로드한 동영상에 동시 Range(206) GET - 앱 직접 전송(none) vs 프록시 전송 위임(x-accel / x-sendfile)
+# 위임 모드에서는 앱이 헤더만 응답하고 본문은 앞단 프록시(nginx 등)가 보냄 - 여기서는 프록시 없이 앱 워커의 처리량/지연만 측정
+# 예) python -m bench.media --size-mb 50 --clients 32 --duration 15 --output media.json
+#================
+
+import argparse
+import http.client
+import io
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+from .__main__ import parse_args as parse_bench_args, prepare, start_gunicorn, stop_gunicorn
+from .report import git_commit, summarize, write_report
+
+MODES = ('none', 'x-accel', 'x-sendfile')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bench.media', description='동영상 Range 요청 처리량 측정')
+    parser.add_argument('--size-mb', type=int, default=50, help='업로드할 동영상 크기 (MB)')
+    parser.add_argument('--range-kb', type=int, default=1024, help='요청당 Range 크기 (KB)')
+    parser.add_argument('--clients', type=int, default=32, help='동시에 탐색하는 시청자 수')
+    parser.add_argument('--duration', type=float, default=15.0, help='모드별 측정 시간 (초)')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn 워커 수')
+    parser.add_argument('--threads', type=int, default=8, help='gunicorn 워커당 스레드 수')
+    parser.add_argument('--modes', default=','.join(MODES), help=f"비교할 MEDIA_OFFLOAD 값 ({', '.join(MODES)})")
+    parser.add_argument('--output', default='bench-media.json')
+    args = parser.parse_args(argv)
+    args.modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+    unknown = set(args.modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown --modes: {', '.join(sorted(unknown))}")
+    return args
+
+
+def upload_video(app, token, size):
+    #업로드 API로 동영상 저장 (내용 해시 이름) - 파일 URL
+    data = os.urandom(size)
+    response = app.test_client().post(
+        '/api/upload', headers={'Authorization': f'Bearer {token}'},
+        data={'file': (io.BytesIO(data), 'bench.mp4')}, content_type='multipart/form-data',
+    )
+    if response.status_code != 201:
+        raise RuntimeError(f'upload failed: {response.status_code} {response.get_data(as_text=True)}')
+    return response.get_json()['url']
+
+
+def fetch(connection, url, headers):
+    #(상태, 앱이 보낸 본문 크기, 위임 여부) - 위임 응답은 헤더만 받음
+    #X-Sendfile 응답은 본문 없이 Range 길이의 Content-Length를 보내므로 (프록시가 채움) 연결을 다시 맺음
+    connection.request('GET', url, headers=headers)
+    response = connection.getresponse()
+    if response.getheader('X-Accel-Redirect') or response.getheader('X-Sendfile'):
+        if int(response.getheader('Content-Length') or 0):
+            connection.close()
+        else:
+            response.read()
+        return response.status, 0, True
+    return response.status, len(response.read()), False
+
+
+def watch(base_url, url, size, range_size, stats, stop, rng):
+    #시청자 한 명 - 임의 위치로 탐색하며 Range 요청 반복
+    parts = urlsplit(base_url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+    while not stop.is_set():
+        start = rng.randrange(0, max(1, size - range_size))
+        headers = {'Range': f'bytes={start}-{start + range_size - 1}'}
+        began = time.perf_counter()
+        try:
+            status, received, delegated = fetch(connection, url, headers)
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            status, received, delegated = 0, 0, False
+        elapsed = time.perf_counter() - began
+        with stats['lock']:
+            stats['latencies'].append(elapsed)
+            stats['bytes'] += received
+            stats['delegated'] += delegated
+            stats['statuses'][status] = stats['statuses'].get(status, 0) + 1
+            if status not in (200, 206):
+                stats['errors'] += 1
+
+
+def measure(base_url, url, size, args):
+    stats = {'lock': threading.Lock(), 'latencies': [], 'bytes': 0, 'delegated': 0, 'statuses': {}, 'errors': 0}
+    stop = threading.Event()
+    range_size = args.range_kb * 1024
+    threads = [
+        threading.Thread(target=watch, args=(base_url, url, size, range_size, stats, stop, random.Random(i)),
+                         daemon=True)
+        for i in range(args.clients)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=30)
+    elapsed = time.perf_counter() - started
+    return {
+        **summarize(stats['latencies'], [], stats['errors'], elapsed),
+        #앱이 직접 보낸 본문 - 위임 모드에서는 0에 가까움 (프록시가 보냄)
+        'app_bytes': stats['bytes'],
+        'delegated': stats['delegated'],
+        'app_mb_per_s': round(stats['bytes'] / elapsed / 1024 / 1024, 2) if elapsed else None,
+        'statuses': {str(status): count for status, count in sorted(stats['statuses'].items())},
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix='univ-carrot-media-')
+    try:
+        bench_args = parse_bench_args(['--users', '2', '--products', '10', '--rooms', '0'])
+        app, _, users = prepare(bench_args, workdir)
+        size = args.size_mb * 1024 * 1024
+        print(f'uploading a {args.size_mb}MB video to {workdir} ...')
+        url = upload_video(app, users[0]['token'], size)
+
+        results = {}
+        for mode in args.modes:
+            server, base_url = start_gunicorn(args.workers, args.threads, env={'MEDIA_OFFLOAD': mode})
+            try:
+                print(f'{args.clients} clients seeking {url} with MEDIA_OFFLOAD={mode} for {args.duration}s ...')
+                results[mode] = measure(base_url, url, size, args)
+            finally:
+                stop_gunicorn(server)
+
+        report = {
+            'meta': {'commit': git_commit(), 'video_bytes': size, 'range_bytes': args.range_kb * 1024,
+                     'clients': args.clients, 'duration_s': args.duration,
+                     'workers': args.workers, 'threads': args.threads},
+            'results': results,
+        }
+        write_report(report, args.output)
+        print(f"{'offload':<12}{'reqs':>8}{'err':>6}{'rps':>10}{'app MB/s':>10}{'p50':>9}{'p95':>9}{'p99':>9}")
+        for mode, row in results.items():
+            fmt = lambda v: '-' if v is None else f'{v:.1f}'
+            print(f"{mode:<12}{row['requests']:>8}{row['errors']:>6}{fmt(row['throughput_rps']):>10}"
+                  f"{fmt(row['app_mb_per_s']):>10}{fmt(row['p50_ms']):>9}{fmt(row['p95_ms']):>9}{fmt(row['p99_ms']):>9}")
+        print(f'report written to {args.output}')
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
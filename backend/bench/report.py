@@ -0,0 +1,77 @@
+#================
+# 벤치마크 결과 리포트
+# 커밋 간 diff가 가능하도록 키를 정렬한 JSON으로 저장
+#================
+
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+
+def percentile(sorted_values, p):
+    #nearest-rank 방식 백분위수
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, queries, errors, elapsed):
+    latencies = sorted(latencies)
+    to_ms = lambda value: None if value is None else round(value * 1000, 3)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else None,
+        'mean_ms': to_ms(sum(latencies) / len(latencies)) if latencies else None,
+        'p50_ms': to_ms(percentile(latencies, 50)),
+        'p95_ms': to_ms(percentile(latencies, 95)),
+        'p99_ms': to_ms(percentile(latencies, 99)),
+        'queries_per_request': round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(recorder, elapsed, meta):
+    scenarios = {
+        name: summarize(entry['latencies'], entry['queries'], entry['errors'], elapsed)
+        for name, entry in sorted(recorder.samples.items())
+    }
+    all_latencies = [v for entry in recorder.samples.values() for v in entry['latencies']]
+    all_queries = [v for entry in recorder.samples.values() for v in entry['queries']]
+    all_errors = sum(entry['errors'] for entry in recorder.samples.values())
+    return {
+        'meta': {
+            **meta,
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'elapsed_s': round(elapsed, 2),
+        },
+        'scenarios': scenarios,
+        'total': summarize(all_latencies, all_queries, all_errors, elapsed),
+    }
+
+
+def write_report(report, path):
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write('\n')
+
+
+def print_summary(report):
+    print(f"{'scenario':<18}{'reqs':>8}{'err':>6}{'rps':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'q/req':>8}")
+    rows = list(report['scenarios'].items()) + [('TOTAL', report['total'])]
+    for name, s in rows:
+        fmt = lambda v: '-' if v is None else f'{v:.1f}'
+        print(f"{name:<18}{s['requests']:>8}{s['errors']:>6}{fmt(s['throughput_rps']):>10}"
+              f"{fmt(s['p50_ms']):>9}{fmt(s['p95_ms']):>9}{fmt(s['p99_ms']):>9}{fmt(s['queries_per_request']):>8}")
@@ -0,0 +1,92 @@
+#================
+# 합성 데이터셋 생성
+# ORM 객체 대신 Core bulk insert를 사용해 대량 데이터를 빠르게 적재
+#================
+
+import random
+from datetime import datetime, timedelta
+
+from werkzeug.security import generate_password_hash
+
+BENCH_PASSWORD = 'bench-password'
+
+WORDS = [
+    '아이폰', '갤럭시', '노트북', '자전거', '책상', '의자', '가방', '신발', '모니터', '키보드',
+    '마우스', '전공책', '냉장고', '선풍기', '패딩', '이어폰', '태블릿', '카메라', '스탠드', '전자레인지',
+]
+
+
+def seed(db, models, users, products, wishlists, rooms, messages, seed=42, batch=5000):
+    #users명, products개 상품, 사용자당 wishlists개 찜, rooms개 채팅방(방당 messages개 메시지) 생성
+    #모든 사용자의 비밀번호는 BENCH_PASSWORD (해시는 한 번만 계산)
+    User, Product, Wishlist, ChatRoom, Message = models
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    password_hash = generate_password_hash(BENCH_PASSWORD)
+
+    def insert(model, rows):
+        for start in range(0, len(rows), batch):
+            db.session.execute(db.insert(model), rows[start:start + batch])
+
+    insert(User, [
+        {'id': i, 'username': f'user{i}', 'email': f'user{i}@bench.local', 'password_hash': password_hash}
+        for i in range(1, users + 1)
+    ])
+
+    product_rows = []
+    for i in range(1, products + 1):
+        created_at = now - timedelta(seconds=products - i)
+        product_rows.append({
+            'id': i,
+            'name': f"{' '.join(rng.sample(WORDS, 2))} {i}",
+            'description': ' '.join(rng.sample(WORDS, 6)),
+            'price': rng.randrange(1000, 1000000, 500),
+            'status': '판매중' if rng.random() < 0.8 else '판매완료',
+            'created_at': created_at,
+            'updated_at': created_at,
+            'user_id': rng.randint(1, users),
+            'wishlist_count': 0,
+        })
+
+    wishlist_rows = []
+    for user_id in range(1, users + 1):
+        for product_id in rng.sample(range(1, products + 1), min(wishlists, products)):
+            wishlist_rows.append({'user_id': user_id, 'product_id': product_id, 'created_at': now})
+            product_rows[product_id - 1]['wishlist_count'] += 1
+    insert(Product, product_rows)
+    insert(Wishlist, wishlist_rows)
+
+    room_rows, message_rows = [], []
+    message_id = 0
+    for room_id in range(1, rooms + 1):
+        product = product_rows[rng.randrange(products)]
+        seller_id = product['user_id']
+        if users < 2:
+            break
+        buyer_id = rng.randint(1, users)
+        if buyer_id == seller_id:
+            buyer_id = buyer_id % users + 1
+        room = {
+            'id': room_id, 'product_id': product['id'], 'buyer_id': buyer_id, 'seller_id': seller_id,
+            'created_at': now - timedelta(hours=1),
+            'buyer_unread_count': 0, 'seller_unread_count': 0,
+        }
+        for n in range(messages):
+            message_id += 1
+            created_at = now - timedelta(hours=1) + timedelta(seconds=n)
+            content = ' '.join(rng.sample(WORDS, 3))
+            message_rows.append({
+                'id': message_id, 'chat_room_id': room_id,
+                'sender_id': buyer_id if n % 2 == 0 else seller_id,
+                'content': content, 'created_at': created_at,
+            })
+            room.update(last_message_id=message_id, last_message_preview=content, last_message_at=created_at)
+        room_rows.append(room)
+    insert(ChatRoom, room_rows)
+    insert(Message, message_rows)
+
+    db.session.commit()
+    return {
+        'users': users, 'products': products, 'wishlists': len(wishlist_rows),
+        'chat_rooms': len(room_rows), 'messages': len(message_rows),
+    }
@@ -0,0 +1,111 @@
+#================
+# JSON 직렬화 벤치마크
+# 표준 json vs orjson, 상품 직렬화 캐시 유무에 따른 목록 직렬화 시간 / 피드 요청 지연
+# 내 상품 전체 조회의 JSON vs NDJSON 스트리밍 최대 메모리 비교
+# 예) python -m bench.serialization --products 20000 --output serialization.json
+#================
+
+import argparse
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from .__main__ import parse_args as parse_bench_args, prepare
+from .report import git_commit, summarize, write_report
+from .workload import InProcessSession
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bench.serialization', description='JSON 직렬화 비용 측정')
+    parser.add_argument('--products', type=int, default=20000, help='한 사용자가 등록한 상품 수 (NDJSON 비교용)')
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=500, help='목록 직렬화 / 피드 요청 반복 횟수')
+    parser.add_argument('--output', default='bench-serialization.json')
+    return parser.parse_args(argv)
+
+
+def serialize_page(app, page_size, repeat):
+    #DB 조회를 제외한 목록 직렬화(to_dict + JSON 인코딩)만 측정 - 첫 회는 캐시 채우기로 제외
+    from api.common import serialize_products, with_owner
+    from api.models import Product
+    from jsonprovider import dump_bytes
+
+    with app.app_context():
+        products = with_owner(Product.query).order_by(Product.id).limit(page_size).all()
+        dump_bytes(app.json, serialize_products(products))
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            dump_bytes(app.json, serialize_products(products))
+            samples.append(time.perf_counter() - start)
+    return summarize(samples, [], 0, sum(samples))
+
+
+def feed_requests(app, page_size, repeat):
+    session = InProcessSession(app)
+    session.request('GET', f'/api/products?limit={page_size}')
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        session.request('GET', f'/api/products?limit={page_size}')
+        samples.append(time.perf_counter() - start)
+    return summarize(samples, [], 0, sum(samples))
+
+
+def my_products_peak(app, token, accept):
+    #응답 본문을 끝까지 읽는 동안의 최대 할당 메모리 (tracemalloc 기준)
+    client = app.test_client()
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = client.get('/api/my/products', headers={'Authorization': f'Bearer {token}', 'Accept': accept})
+    size = sum(len(chunk) for chunk in response.response)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    response.close()
+    return {'bytes': size, 'peak_mb': round(peak / 1024 / 1024, 2), 'seconds': round(elapsed, 3)}
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix='univ-carrot-serialization-')
+    try:
+        bench_args = parse_bench_args(['--users', '1', '--products', str(args.products), '--rooms', '0'])
+        _, _, users = prepare(bench_args, workdir)
+        from api import create_app
+
+        variants = {
+            'stdlib': {'JSON_BACKEND': 'stdlib', 'PRODUCT_CACHE_SIZE': 0},
+            'stdlib_cached': {'JSON_BACKEND': 'stdlib'},
+            'orjson': {'JSON_BACKEND': 'orjson', 'PRODUCT_CACHE_SIZE': 0},
+            'orjson_cached': {'JSON_BACKEND': 'orjson'},
+        }
+        results = {'serialize_page': {}, 'feed_request': {}, 'my_products': {}}
+        for name, config in variants.items():
+            app = create_app(config)
+            results['serialize_page'][name] = serialize_page(app, args.page_size, args.repeat)
+            results['feed_request'][name] = feed_requests(app, args.page_size, args.repeat // 5)
+
+        app = create_app()
+        for name, accept in (('json', 'application/json'), ('ndjson', 'application/x-ndjson')):
+            results['my_products'][name] = my_products_peak(app, users[0]['token'], accept)
+
+        report = {
+            'meta': {'commit': git_commit(), 'products': args.products, 'page_size': args.page_size},
+            'results': results,
+        }
+        write_report(report, args.output)
+        print(f"{'variant':<16}{'serialize p50':>15}{'feed p50':>12}")
+        for name in variants:
+            print(f"{name:<16}{results['serialize_page'][name]['p50_ms']:>13.3f}ms"
+                  f"{results['feed_request'][name]['p50_ms']:>10.3f}ms")
+        for name, row in results['my_products'].items():
+            print(f"my_products {name:<8} {row['bytes'] / 1024 / 1024:.1f}MB body  peak {row['peak_mb']}MB  {row['seconds']}s")
+        print(f'report written to {args.output}')
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#================
+# 콜드 스타트 벤치마크
+# 앱 import 시간 / 첫 요청까지 시간 / gunicorn 기동 후 준비 완료까지 시간 (preload 켜기/끄기)
+# 예) python -m bench.startup --runs 5 --workers 2 --output startup.json
+#================
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from .__main__ import BACKEND_DIR, free_port, wait_until_ready
+from .report import git_commit, percentile, write_report
+
+# 새 인터프리터에서 app 모듈 import 후 첫 요청(/api/health)까지 걸린 시간 측정
+PROBE = '''
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+app.app.test_client().get('/api/health')
+print(json.dumps({'import': imported - start, 'first_request': time.perf_counter() - start}))
+'''
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bench.startup', description='앱 콜드 스타트 시간 측정')
+    parser.add_argument('--runs', type=int, default=5, help='항목별 반복 횟수')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn 워커 수')
+    parser.add_argument('--output', default='bench-startup.json')
+    return parser.parse_args(argv)
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        'runs': len(samples),
+        'min_ms': round(samples[0] * 1000, 1),
+        'p50_ms': round(percentile(samples, 50) * 1000, 1),
+        'max_ms': round(samples[-1] * 1000, 1),
+    }
+
+
+def probe(env):
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def gunicorn_ready(env, workers, preload):
+    #gunicorn 실행부터 /api/ready가 200을 돌려줄 때까지 (모든 워커가 뜬 시점은 아님)
+    port = free_port()
+    env = dict(env, WEB_CONCURRENCY=str(workers), GUNICORN_PRELOAD='1' if preload else '0')
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        ['gunicorn', '--bind', f'127.0.0.1:{port}', 'app:app'],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(f'http://127.0.0.1:{port}')
+        return time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix='univ-carrot-startup-')
+    try:
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'startup.db')}",
+            UPLOAD_FOLDER=os.path.join(workdir, 'uploads'),
+        )
+        env.setdefault('JWT_SECRET_KEY', 'univ-carrot-bench-secret-key-0123456789')
+        probe(env)  #첫 실행은 .pyc 생성 비용이 섞이므로 버림
+
+        samples = [probe(env) for _ in range(args.runs)]
+        results = {
+            'import': summarize([s['import'] for s in samples]),
+            'first_request': summarize([s['first_request'] for s in samples]),
+        }
+        for preload in (True, False):
+            key = f"gunicorn_ready_{'preload' if preload else 'no_preload'}"
+            results[key] = summarize([gunicorn_ready(env, args.workers, preload) for _ in range(args.runs)])
+
+        report = {
+            'meta': {'commit': git_commit(), 'runs': args.runs, 'workers': args.workers, 'python': sys.version.split()[0]},
+            'startup': results,
+        }
+        write_report(report, args.output)
+        print(f"{'stage':<28}{'min':>9}{'p50':>9}{'max':>9}")
+        for name, row in results.items():
+            print(f"{name:<28}{row['min_ms']:>9.1f}{row['p50_ms']:>9.1f}{row['max_ms']:>9.1f}")
+        print(f'report written to {args.output}')
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#================
+# 응답 전송량 벤치마크
+# 주요 조회 API의 인코딩별(identity / gzip / br) 응답 크기와 지연
+# 변경 없는 재요청(If-None-Match)의 304 응답 지연 - 채팅 폴링 / 목록 새로고침
+# 예) python -m bench.transfer --products 5000 --repeat 200 --output transfer.json
+#================
+
+import argparse
+import shutil
+import tempfile
+import time
+
+from .__main__ import parse_args as parse_bench_args, prepare
+from .report import git_commit, summarize, write_report
+
+ENCODINGS = ('identity', 'gzip', 'br')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bench.transfer', description='응답 압축 / 조건부 요청 효과 측정')
+    parser.add_argument('--products', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=200, help='항목별 반복 횟수')
+    parser.add_argument('--output', default='bench-transfer.json')
+    return parser.parse_args(argv)
+
+
+def measure(client, path, headers, repeat):
+    #(지연 요약, 마지막 응답)
+    response = client.get(path, headers=headers)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(path, headers=headers)
+        response.get_data()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples, [], 0, sum(samples)), response
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix='univ-carrot-transfer-')
+    try:
+        bench_args = parse_bench_args(['--users', '20', '--products', str(args.products)])
+        app, _, users = prepare(bench_args, workdir)
+        user = next(u for u in users if u['rooms'])
+        auth = {'Authorization': f"Bearer {user['token']}"}
+        paths = {
+            'feed': '/api/products?limit=100',
+            'wishlist': '/api/wishlist?limit=100',
+            'chat_rooms': '/api/chat/rooms',
+            'messages': f"/api/chat/room/{user['rooms'][0]}/messages",
+        }
+
+        client = app.test_client()
+        results = {}
+        for name, path in paths.items():
+            row = {}
+            for encoding in ENCODINGS:
+                latency, response = measure(client, path, {**auth, 'Accept-Encoding': encoding}, args.repeat)
+                row[encoding] = {'bytes': len(response.get_data()), 'p50_ms': latency['p50_ms']}
+            #변경 없는 재요청 - 본문 없이 304
+            etag = response.headers['ETag']
+            latency, response = measure(client, path, {**auth, 'If-None-Match': etag}, args.repeat)
+            row['not_modified'] = {'status': response.status_code, 'p50_ms': latency['p50_ms']}
+            results[name] = row
+
+        report = {
+            'meta': {'commit': git_commit(), 'products': args.products, 'repeat': args.repeat},
+            'results': results,
+        }
+        write_report(report, args.output)
+        print(f"{'endpoint':<12}" + ''.join(f"{e + ' bytes':>16}{'p50':>9}" for e in ENCODINGS) + f"{'304 p50':>10}")
+        for name, row in results.items():
+            print(f"{name:<12}" + ''.join(f"{row[e]['bytes']:>16}{row[e]['p50_ms']:>7.2f}ms" for e in ENCODINGS)
+                  + f"{row['not_modified']['p50_ms']:>8.2f}ms")
+        print(f'report written to {args.output}')
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
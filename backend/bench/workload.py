@@ -0,0 +1,310 @@
+#================
+# 부하 생성
+# 프론트엔드 트래픽 비율을 흉내낸 가상 사용자 + 3초 간격 채팅 폴링
+# 앱 내부(Flask test client) / 실제 HTTP(gunicorn) 두 가지 전송 방식 지원
+# 실제 HTTP에서는 열린 채팅창의 SSE 연결 수천 개를 유지한 채 측정 가능
+#================
+
+import http.client
+import json
+import random
+import re
+import selectors
+import socket
+import threading
+import time
+from urllib.parse import quote, urlsplit
+
+from .seed import WORDS
+
+_SERVER_TIMING_QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+#시나리오별 가중치 - 상품 목록/상세 위주, 채팅/찜은 그보다 적게
+TRAFFIC_MIX = {
+    'feed': 30,
+    'feed_next_page': 5,
+    'trending': 5,
+    'product_detail': 20,
+    'search': 5,
+    'wishlist': 5,
+    'wishlist_toggle': 5,
+    'chat_rooms': 10,
+    'chat_history': 8,
+    'send_message': 3,
+    'me': 4,
+}
+
+
+def _queries_from(server_timing):
+    #METRICS_SERVER_TIMING 헤더에서 요청당 쿼리 수 추출 (없으면 None)
+    match = _SERVER_TIMING_QUERIES_RE.search(server_timing or '')
+    return int(match.group(1)) if match else None
+
+
+class InProcessSession:
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None, headers=None):
+        response = self.client.open(path, method=method, json=body, headers=headers)
+        return response.status_code, response.get_data(), response.headers.get('Server-Timing')
+
+
+class HttpSession:
+    #keep-alive 연결 하나를 재사용하는 HTTP 클라이언트
+
+    def __init__(self, base_url, timeout=30):
+        parts = urlsplit(base_url)
+        self.host, self.port, self.timeout = parts.hostname, parts.port, timeout
+        self.connection = None
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers['Content-Type'] = 'application/json'
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self.connection.request(method, path, body=payload, headers=headers)
+                response = self.connection.getresponse()
+                return response.status, response.read(), response.getheader('Server-Timing')
+            except (ConnectionError, http.client.HTTPException):
+                #서버가 keep-alive 연결을 닫았으면 한 번 재연결
+                self.connection.close()
+                self.connection = None
+                if attempt:
+                    raise
+
+
+class Recorder:
+    #시나리오별 지연시간/쿼리 수/오류 집계 (스레드 안전)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+
+    def record(self, scenario, elapsed, status, queries):
+        with self._lock:
+            entry = self.samples.setdefault(scenario, {'latencies': [], 'queries': [], 'errors': 0})
+            entry['latencies'].append(elapsed)
+            if queries is not None:
+                entry['queries'].append(queries)
+            if status >= 500 or status == 0:
+                entry['errors'] += 1
+
+
+class VirtualUser:
+    #로그인한 사용자 한 명의 행동 - 가중치에 따라 시나리오를 골라 실행
+
+    def __init__(self, session, user, dataset, recorder, rng):
+        self.session = session
+        self.user = user
+        self.dataset = dataset
+        self.recorder = recorder
+        self.rng = rng
+        self.headers = {'Authorization': f"Bearer {user['token']}"}
+        self.next_cursor = None
+        self.scenarios, self.weights = zip(*TRAFFIC_MIX.items())
+
+    def call(self, scenario, method, path, body=None):
+        start = time.perf_counter()
+        try:
+            status, data, server_timing = self.session.request(method, path, body, self.headers)
+        except (OSError, http.client.HTTPException):
+            status, data, server_timing = 0, b'', None
+        self.recorder.record(scenario, time.perf_counter() - start, status, _queries_from(server_timing))
+        return status, data
+
+    def step(self):
+        scenario = self.rng.choices(self.scenarios, self.weights)[0]
+        getattr(self, scenario)()
+
+    def random_product(self):
+        return self.rng.randint(1, self.dataset['products'])
+
+    def feed(self):
+        status, data = self.call('feed', 'GET', '/api/products')
+        if status == 200:
+            self.next_cursor = json.loads(data).get('next_cursor')
+
+    def feed_next_page(self):
+        if not self.next_cursor:
+            return self.feed()
+        status, data = self.call('feed_next_page', 'GET', f'/api/products?cursor={self.next_cursor}')
+        if status == 200:
+            self.next_cursor = json.loads(data).get('next_cursor')
+
+    def trending(self):
+        self.call('trending', 'GET', '/api/products/trending')
+
+    def product_detail(self):
+        self.call('product_detail', 'GET', f'/api/products/{self.random_product()}')
+
+    def search(self):
+        self.call('search', 'GET', f'/api/products/search?q={quote(self.rng.choice(WORDS))}')
+
+    def wishlist(self):
+        self.call('wishlist', 'GET', '/api/wishlist')
+
+    def wishlist_toggle(self):
+        product_id = self.random_product()
+        status, _ = self.call('wishlist_toggle', 'POST', f'/api/wishlist/{product_id}')
+        if status == 400:
+            self.call('wishlist_toggle', 'DELETE', f'/api/wishlist/{product_id}')
+
+    def chat_rooms(self):
+        self.call('chat_rooms', 'GET', '/api/chat/rooms')
+
+    def chat_history(self):
+        if self.user['rooms']:
+            self.call('chat_history', 'GET', f"/api/chat/room/{self.rng.choice(self.user['rooms'])}/messages")
+
+    def send_message(self):
+        if self.user['rooms']:
+            room_id = self.rng.choice(self.user['rooms'])
+            self.call('send_message', 'POST', f'/api/chat/room/{room_id}/messages', {'content': 'bench message'})
+
+    def me(self):
+        self.call('me', 'GET', '/api/auth/me')
+
+
+def poll_chat(session, user, room_id, recorder, stop, interval):
+    #열린 채팅창 하나 - 프론트엔드처럼 interval초마다 새 메시지를 폴링
+    headers = {'Authorization': f"Bearer {user['token']}"}
+    last_id = 0
+    while not stop.wait(interval):
+        start = time.perf_counter()
+        try:
+            status, data, server_timing = session.request(
+                'GET', f'/api/chat/room/{room_id}/messages?after={last_id}', headers=headers
+            )
+        except (OSError, http.client.HTTPException):
+            status, data, server_timing = 0, b'', None
+        recorder.record('chat_poll', time.perf_counter() - start, status, _queries_from(server_timing))
+        if status == 200:
+            messages = json.loads(data)
+            if messages:
+                last_id = messages[-1]['id']
+
+
+class StreamHolder:
+    #SSE 연결 count개를 스레드 하나(selector)로 열어두고 받은 데이터는 버림
+    #연결 시간(응답 헤더 수신까지)은 'stream_open'으로 기록, 503은 스트림 한도 초과(클라이언트는 폴링으로 대체)
+
+    def __init__(self, base_url, users, count, targets=None):
+        parts = urlsplit(base_url)
+        self.address = (parts.hostname, parts.port)
+        #targets: 열 (사용자, 채팅방 ID) 목록 (없으면 모든 사용자의 채팅방을 돌아가며)
+        self.targets = targets or [(user, room_id) for user in users for room_id in user['rooms']]
+        self.count = count if self.targets else 0
+        self.opened = 0
+        self.rejected = 0
+        self.dropped = 0
+        self.open_at_end = 0
+
+    def _connect(self, selector, recorder, index):
+        user, room_id = self.targets[index % len(self.targets)]
+        path = f"/api/chat/room/{room_id}/stream?jwt={user['token']}"
+        try:
+            sock = socket.create_connection(self.address, timeout=10)
+            sock.sendall(f'GET {path} HTTP/1.1\r\nHost: bench\r\nAccept: text/event-stream\r\n\r\n'.encode())
+            sock.setblocking(False)
+        except OSError:
+            recorder.record('stream_open', 0.0, 0, None)
+            return
+        selector.register(sock, selectors.EVENT_READ, {'start': time.perf_counter(), 'head': b'', 'status': None})
+
+    def _read(self, selector, recorder, sock, state):
+        try:
+            data = sock.recv(65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+        if state['status'] is None:
+            state['head'] += data
+            if b'\r\n\r\n' in state['head'] or not data:
+                lines = state['head'].split(b'\r\n\r\n', 1)[0].decode('latin-1').split('\r\n')
+                status_line = lines[0].split()
+                state['status'] = int(status_line[1]) if len(status_line) > 1 and status_line[1].isdigit() else 0
+                #스트림을 여는 동안 실행된 쿼리 수 (스트림 본문은 DB를 쓰지 않음)
+                server_timing = next(
+                    (line.split(':', 1)[1] for line in lines[1:] if line.lower().startswith('server-timing:')), None
+                )
+                recorder.record('stream_open', time.perf_counter() - state['start'], state['status'],
+                                _queries_from(server_timing))
+                if state['status'] == 200:
+                    self.opened += 1
+                else:
+                    #한도 초과(503) 등 - 실제 클라이언트처럼 연결을 닫고 폴링으로 대체
+                    self.rejected += 1
+                    data = b''
+        if not data:
+            #측정 중 서버가 끊은 스트림
+            if state['status'] == 200:
+                self.dropped += 1
+            selector.unregister(sock)
+            sock.close()
+
+    def run(self, recorder, stop, ready):
+        selector = selectors.DefaultSelector()
+        for index in range(self.count):
+            self._connect(selector, recorder, index)
+        ready.set()
+        while not stop.is_set():
+            for key, _ in selector.select(timeout=0.5):
+                self._read(selector, recorder, key.fileobj, key.data)
+        self.open_at_end = len(selector.get_map())
+        for key in list(selector.get_map().values()):
+            key.fileobj.close()
+        selector.close()
+
+    def summary(self):
+        return {'requested': self.count, 'opened': self.opened, 'rejected': self.rejected,
+                'dropped': self.dropped, 'open_at_end': self.open_at_end}
+
+
+def run_workload(make_session, users, dataset, clients, pollers, duration, poll_interval=3.0, seed=7,
+                 stream_holder=None):
+    #clients개의 가상 사용자(대기 없이 연속 요청) + pollers개의 채팅 폴링을 duration초 동안 실행
+    #stream_holder가 있으면 SSE 연결을 모두 연 뒤 측정 시작
+    recorder = Recorder()
+    stop = threading.Event()
+    threads = []
+
+    if stream_holder is not None:
+        streams_ready = threading.Event()
+        stream_thread = threading.Thread(
+            target=stream_holder.run, args=(recorder, stop, streams_ready), daemon=True
+        )
+        stream_thread.start()
+        streams_ready.wait()
+
+    def client_loop(index):
+        vu = VirtualUser(make_session(), users[index % len(users)], dataset, recorder, random.Random(seed + index))
+        while not stop.is_set():
+            vu.step()
+
+    for i in range(clients):
+        threads.append(threading.Thread(target=client_loop, args=(i,), daemon=True))
+
+    room_owners = [(user, room_id) for user in users for room_id in user['rooms']]
+    for i in range(min(pollers, len(room_owners))):
+        user, room_id = room_owners[i]
+        threads.append(threading.Thread(
+            target=poll_chat, args=(make_session(), user, room_id, recorder, stop, poll_interval), daemon=True
+        ))
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=30)
+    if stream_holder is not None:
+        stream_thread.join(timeout=30)
+    return recorder, time.perf_counter() - started
@@ -0,0 +1,206 @@
+#================
+# 응답 캐시
+# 메모리(LRU/TTL) / Redis 백엔드를 같은 인터페이스로 제공
+# 무효화는 세대(generation) 번호 방식 - 키에 세대를 포함시키고 변경 시 세대를 올림
+#================
+
+import math
+import threading
+import time
+from collections import OrderedDict
+
+
+def _initial_generation():
+    #세대 키가 사라졌다가(만료/축출) 다시 생겨도 예전 세대와 겹치지 않도록 현재 시각으로 시작
+    return time.time_ns() // 1000
+
+
+class NullCache:
+    #캐시 비활성화 시 사용 - 항상 miss
+    backend = 'none'
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def add(self, key, value, ttl=None):
+        return True
+
+    def delete(self, key):
+        pass
+
+    def generation(self, name):
+        return 0
+
+    def bump(self, name):
+        pass
+
+    def stats(self):
+        return {"backend": self.backend}
+
+
+class MemoryCache:
+    #프로세스 내 LRU + TTL 캐시 (스레드 안전)
+    #세대 번호도 같은 LRU에 'gen:<이름>' 키로 저장 (상품/사용자별 세대가 늘어도 max_entries 안에서 유지)
+    #축출된 세대는 현재 시각으로 다시 시작하므로 예전 세대 키의 응답은 miss가 될 뿐
+    backend = 'memory'
+
+    def __init__(self, max_entries=1024, default_ttl=60):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def _store(self, key, value, expires_at):
+        #잠금을 잡은 상태에서 호출
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (ttl or self.default_ttl)
+        with self._lock:
+            self._store(key, value, expires_at)
+
+    def add(self, key, value, ttl=None):
+        #키가 없을 때(만료 포함)만 저장 - 저장했으면 True (동시 요청 중 하나만 선점)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                return False
+            self._store(key, value, now + (ttl or self.default_ttl))
+        return True
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _generation(self, key):
+        #잠금을 잡은 상태에서 호출 - 세대 조회는 적중/미스 통계에서 제외, 만료 없음
+        entry = self._entries.get(key)
+        if entry is None:
+            value = _initial_generation()
+            self._store(key, value, math.inf)
+            return value
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def generation(self, name):
+        with self._lock:
+            return self._generation(f'gen:{name}')
+
+    def bump(self, name):
+        key = f'gen:{name}'
+        with self._lock:
+            self._store(key, self._generation(key) + 1, math.inf)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class RedisCache:
+    #Redis 호환 서버 백엔드 - 여러 워커가 캐시를 공유
+    #만료/축출은 서버가 처리하므로 evictions는 서버 통계(evicted_keys)를 사용
+    backend = 'redis'
+
+    def __init__(self, url, default_ttl=60, prefix='univ-carrot:'):
+        #redis 백엔드를 쓸 때만 필요
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+        self.client = redis.Redis.from_url(url)
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        self._count(value is not None)
+        return value
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, value, ex=ttl or self.default_ttl)
+
+    def add(self, key, value, ttl=None):
+        return bool(self.client.set(self.prefix + key, value, ex=ttl or self.default_ttl, nx=True))
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def generation(self, name):
+        key = f'{self.prefix}gen:{name}'
+        self.client.set(key, _initial_generation(), nx=True)
+        return int(self.client.get(key))
+
+    def bump(self, name):
+        key = f'{self.prefix}gen:{name}'
+        self.client.set(key, _initial_generation(), nx=True)
+        self.client.incr(key)
+
+    def stats(self):
+        server = self.client.info('stats')
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": server.get('evicted_keys', 0),
+                "expirations": server.get('expired_keys', 0),
+            }
+
+
+def create_cache(config):
+    #설정값 CACHE_BACKEND에 따라 캐시 생성 (none | memory | redis)
+    backend = config.get('CACHE_BACKEND', 'none')
+    ttl = config.get('CACHE_DEFAULT_TTL', 60)
+    if backend == 'memory':
+        return MemoryCache(max_entries=config.get('CACHE_MAX_ENTRIES', 1024), default_ttl=ttl)
+    if backend == 'redis':
+        return RedisCache(config['CACHE_REDIS_URL'], default_ttl=ttl)
+    if backend == 'none':
+        return NullCache()
+    raise ValueError(f"Unknown CACHE_BACKEND: {backend}")
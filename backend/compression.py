@@ -0,0 +1,137 @@
+#================
+# 응답 압축
+# Accept-Encoding에 따라 brotli(설치된 경우) / gzip으로 JSON 등 텍스트 응답 압축
+# min_size보다 작은 본문은 그대로 보내고, 스트리밍 응답(NDJSON)은 보내는 동안 압축
+# SSE(text/event-stream)와 파일 전송(send_file)은 압축하지 않음 (실시간 전달 / 이미 압축된 미디어)
+#================
+
+import zlib
+
+from flask import request
+
+from cache import MemoryCache
+
+try:
+    import brotli  #선택 의존성 - pip install brotli
+except ImportError:
+    brotli = None
+
+# 압축 대상 MIME 타입
+COMPRESSIBLE_MIMETYPES = frozenset((
+    'application/json', 'application/x-ndjson', 'application/javascript', 'text/plain', 'text/html', 'text/css',
+))
+
+# gzip 스트림 형식 (zlib wbits)
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+class _GzipStream:
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+
+    def process(self, data):
+        return self._compressor.compress(data)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def process(self, data):
+        return self._compressor.process(data)
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class Compressor:
+    #after_request에서 응답 본문 압축 - 압축하면 ETag는 약한 ETag로 바꿈 (인코딩별로 바이트가 다르므로)
+    #압축 결과는 강한 ETag(본문 해시) 기준으로 캐시해 같은 응답(캐시된 피드 등)을 다시 압축하지 않음
+
+    def __init__(self, min_size=1024, gzip_level=6, brotli_quality=4, cache_size=256, enabled=True):
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.enabled = enabled
+        self._compressed = MemoryCache(max_entries=cache_size, default_ttl=300) if cache_size else None
+
+    def init_app(self, app):
+        app.extensions['compressor'] = self
+        app.after_request(self._after_request)
+
+    def encodings(self):
+        return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+    def negotiate(self):
+        #클라이언트가 받을 수 있는 인코딩 중 가장 선호하는 것 (없으면 None)
+        accepted = request.accept_encodings
+        best = max(self.encodings(), key=lambda encoding: accepted[encoding])
+        return best if accepted[best] > 0 else None
+
+    def _stream(self, encoding):
+        if encoding == 'br':
+            return _BrotliStream(self.brotli_quality)
+        return _GzipStream(self.gzip_level)
+
+    def compress(self, data, encoding):
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        return zlib.compress(data, self.gzip_level, wbits=GZIP_WBITS)
+
+    def compress_iter(self, chunks, encoding):
+        #스트리밍 압축 - 압축기가 내보낸 만큼만 전달 (줄마다 flush하면 압축률이 크게 떨어짐)
+        stream = self._stream(encoding)
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode()
+                data = stream.process(chunk)
+                if data:
+                    yield data
+            yield stream.finish()
+        finally:
+            if hasattr(chunks, 'close'):
+                chunks.close()
+
+    def _after_request(self, response):
+        if (not self.enabled or request.method == 'HEAD' or response.direct_passthrough
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES or 'Content-Encoding' in response.headers):
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = self.negotiate()
+        if encoding is None:
+            return response
+
+        etag, weak = response.get_etag()
+        if response.status_code == 304:
+            #압축된 응답의 ETag와 같은 형태로
+            if etag and not weak:
+                response.set_etag(etag, weak=True)
+            return response
+        if response.status_code < 200 or response.status_code in (204, 206):
+            return response
+
+        if response.is_streamed:
+            response.response = self.compress_iter(response.response, encoding)
+            response.headers.pop('Content-Length', None)
+        else:
+            body = response.get_data()
+            if len(body) < self.min_size:
+                return response
+            key = f'{encoding}:{etag}' if etag and not weak and self._compressed is not None else None
+            data = self._compressed.get(key) if key else None
+            if data is None:
+                data = self.compress(body, encoding)
+                if key:
+                    self._compressed.set(key, data)
+            response.set_data(data)
+        response.headers['Content-Encoding'] = encoding
+        if etag:
+            response.set_etag(etag, weak=True)
+        return response
+
+    def stats(self):
+        return self._compressed.stats() if self._compressed is not None else {}
@@ -0,0 +1,46 @@
+#================
+# 쓰기 지연(write-behind) 카운터
+# 조회수처럼 자주 오르는 값을 요청마다 DB에 쓰지 않고 워커 메모리에 모았다가 주기적으로 한 번에 반영
+# 반영 전에 프로세스가 비정상 종료되면 그 사이 증가분은 사라짐 (근사값 용도)
+#================
+
+import threading
+
+
+class WriteBehindCounter:
+    #키별 증가량 누적 (스레드 안전) - drain()으로 누적분을 꺼내고 비움
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.increments = 0
+        self.dropped = 0
+        self.flushes = 0
+
+    def incr(self, key, amount=1):
+        with self._lock:
+            self.increments += amount
+            if key not in self._pending and len(self._pending) >= self.max_keys:
+                #반영이 밀려 키가 너무 많으면 새 키는 버림 (메모리 상한)
+                self.dropped += amount
+                return
+            self._pending[key] = self._pending.get(key, 0) + amount
+
+    def drain(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if pending:
+                self.flushes += 1
+            return pending
+
+    def restore(self, pending):
+        #반영 실패 시 누적분을 되돌려 다음 주기에 다시 시도
+        for key, amount in pending.items():
+            with self._lock:
+                self._pending[key] = self._pending.get(key, 0) + amount
+
+    def stats(self):
+        with self._lock:
+            return {"pending_keys": len(self._pending), "increments": self.increments,
+                    "dropped": self.dropped, "flushes": self.flushes}
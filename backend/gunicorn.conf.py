@@ -0,0 +1,69 @@
+#================
+# gunicorn 설정 (실행 디렉터리의 이 파일을 gunicorn이 자동으로 읽음)
+# 느린 클라이언트 / 업로드 / 폴링 / SSE 연결이 워커 프로세스 전체를 점유하지 않도록
+# 그린렛(gevent, 기본) 또는 스레드(gthread) 워커로 실행
+#================
+
+import os
+import signal
+
+# 워커 설정 (환경변수)
+# WEB_CONCURRENCY: 워커 프로세스 수 (기본 CPU 수, 작은 인스턴스는 1~2 권장)
+# GUNICORN_WORKER_CLASS: gevent(기본, SSE 스트림 수천 개) | gthread (스트림은 스레드 수의 절반까지)
+# GUNICORN_THREADS: gthread 워커당 요청 처리 스레드 수
+# GUNICORN_WORKER_CONNECTIONS: 워커당 최대 동시 연결 수 (gthread는 유휴 keep-alive 연결 포함)
+# GUNICORN_GRACEFUL_TIMEOUT: 종료 신호 후 진행 중 요청을 기다리는 시간 (초)
+# GUNICORN_PRELOAD: 마스터에서 앱을 한 번 로드한 뒤 워커를 fork (워커 기동 시간/메모리 절약, 기본 켜짐)
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gevent')
+workers = int(os.getenv('WEB_CONCURRENCY', os.cpu_count() or 1))
+threads = int(os.getenv('GUNICORN_THREADS', 16))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 2000))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 20))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+preload_app = os.getenv('GUNICORN_PRELOAD', '1').lower() in ('1', 'true', 'yes')
+#PORT가 있으면 gunicorn이 0.0.0.0:$PORT로 바인드 (Render)
+
+# gevent는 앱을 불러오기 전에 표준 라이브러리를 패치해야 함 (preload 시 마스터에서 앱을 먼저 불러오므로 여기서)
+# 워커도 다시 패치하지만 이미 패치된 모듈은 그대로
+if worker_class == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+
+# gthread에서는 SSE 스트림이 스레드를 하나씩 점유하므로 절반까지만 허용 (나머지는 폴링으로 대체)
+# gevent에서는 스트림이 그린렛이라 연결 수 한도 안에서 허용
+os.environ.setdefault(
+    'CHAT_STREAM_LIMIT',
+    str(max(1, threads // 2) if worker_class == 'gthread' else worker_connections // 2),
+)
+
+
+def post_fork(server, worker):
+    #preload 시 마스터에서 열린 DB 연결을 워커가 공유하지 않도록 풀을 새로 시작 (복제본 포함)
+    if preload_app:
+        from api.extensions import db
+        with worker.app.wsgi().app_context():
+            for engine in db.engines.values():
+                engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    from api import begin_drain, start_workers
+
+    #백그라운드 작업 / 조회수 반영 스레드 시작 (스레드는 fork 후에 만들어야 워커마다 동작)
+    start_workers(worker.wsgi)
+
+    #SIGTERM 수신 시 앱에 먼저 알림 - 준비 상태를 503으로 바꾸고 SSE 스트림을 끝냄
+    #(스트림이 graceful_timeout까지 종료를 붙잡지 않도록)
+    handle_exit = signal.getsignal(signal.SIGTERM)
+
+    def handle_term(signum, frame):
+        begin_drain(worker.wsgi)
+        handle_exit(signum, frame)
+
+    signal.signal(signal.SIGTERM, handle_term)
+
+
+def worker_exit(server, worker):
+    from api import shutdown
+    shutdown(worker.wsgi)
@@ -0,0 +1,63 @@
+#================
+# JSON 직렬화
+# orjson이 설치되어 있으면 사용하고, 없으면 Flask 기본(표준 json)으로 동작
+# 응답 형식은 두 방식이 같도록 맞춤 (datetime 등은 Flask 기본 형식 사용)
+#================
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson  #선택 의존성 - pip install orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    #orjson 기반 JSON 제공자 - 응답 본문을 문자열 변환 없이 bytes로 바로 생성
+    #키 정렬은 하지 않음 (같은 객체는 항상 같은 순서로 직렬화되므로 ETag에는 영향 없음)
+    sort_keys = False
+
+    def __init__(self, app):
+        super().__init__(app)
+        #datetime/date는 Flask 기본과 같은 HTTP 날짜 형식이 되도록 default로 넘김
+        self.options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def dump_bytes(self, obj):
+        return orjson.dumps(obj, default=self.default, option=self.options)
+
+    def dumps(self, obj, **kwargs):
+        #indent 등 orjson이 지원하지 않는 옵션이 있으면 표준 json 사용
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dump_bytes(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        #디버그 모드의 들여쓰기 출력은 Flask 기본 방식 그대로
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dump_bytes(obj) + b'\n', mimetype=self.mimetype)
+
+
+def create_json_provider(app):
+    #설정값 JSON_BACKEND에 따라 JSON 제공자 생성 (auto | orjson | stdlib)
+    backend = app.config.get('JSON_BACKEND', 'auto')
+    if backend == 'orjson' and orjson is None:
+        raise RuntimeError("JSON_BACKEND=orjson requires the 'orjson' package")
+    if backend in ('auto', 'orjson') and orjson is not None:
+        return OrjsonProvider(app)
+    if backend in ('auto', 'stdlib'):
+        return DefaultJSONProvider(app)
+    raise ValueError(f"Unknown JSON_BACKEND: {backend}")
+
+
+def dump_bytes(provider, obj):
+    #제공자 종류와 관계없이 bytes로 직렬화 (NDJSON 스트림 / 캐시 저장용)
+    if isinstance(provider, OrjsonProvider):
+        return provider.dump_bytes(obj)
+    return provider.dumps(obj).encode()
@@ -0,0 +1,293 @@
+#================
+# 미디어 업로드 / 저장
+# 이어받기 가능한 청크 업로드, 내용 해시 기반 중복 제거 저장, 썸네일 생성 / 미사용 파일 정리
+#================
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+import uuid
+
+try:
+    import fcntl  #청크 업로드 잠금 (여러 워커 프로세스 간)
+except ImportError:
+    #Windows 개발 환경 - 프로세스 간 잠금 없음 (gunicorn 배포는 Unix)
+    fcntl = None
+
+IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+
+#썸네일 가로 크기 (px) - 원본보다 작은 크기만 생성
+THUMBNAIL_SIZES = (200, 400, 800)
+THUMBNAIL_DIR = 'thumbs'
+
+#진행 중인 청크 업로드 임시 저장 위치 (업로드 폴더 하위)
+PARTIAL_DIR = '.partial'
+
+_HASHED_NAME_RE = re.compile(r'^/uploads/([0-9a-f]{64})\.(\w+)$')
+_IMMUTABLE_PATH_RE = re.compile(r'^(thumbs/)?[0-9a-f]{64}(_\d+)?\.\w+$')
+_CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+_READ_BLOCK = 64 * 1024
+
+
+class UploadError(Exception):
+    #업로드 요청 오류 - status는 HTTP 상태 코드
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def file_extension(filename):
+    return filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+
+
+def sha256_of(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_READ_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def store_file(upload_folder, temp_path, ext):
+    #임시 파일을 내용 해시 이름(<sha256>.<ext>)으로 저장 - 같은 내용이 이미 있으면 재사용
+    filename = f"{sha256_of(temp_path)}.{ext}"
+    final_path = os.path.join(upload_folder, filename)
+    if os.path.exists(final_path):
+        os.remove(temp_path)
+        #다시 업로드된 파일은 정리 대상에서 잠시 제외되도록 수정 시각 갱신 (remove_media 참고)
+        os.utime(final_path)
+    else:
+        os.replace(temp_path, final_path)
+    return filename
+
+
+def is_immutable(filename):
+    #내용 해시 이름의 파일(원본/썸네일)은 내용이 바뀌지 않으므로 영구 캐시 가능
+    return bool(_IMMUTABLE_PATH_RE.match(filename))
+
+
+def thumbnail_name(filename, size):
+    return f"{filename.rsplit('.', 1)[0]}_{size}.webp"
+
+
+def stored_filename(url):
+    #업로드 API로 저장된(해시 이름) 파일의 URL이면 파일명, 아니면 None
+    match = _HASHED_NAME_RE.match(url or '')
+    return f"{match.group(1)}.{match.group(2)}" if match else None
+
+
+def thumbnail_urls(url):
+    #해시 이름으로 저장된 이미지의 썸네일 URL ({크기: URL}) - 그 외에는 None
+    #썸네일은 비동기로 만들어지므로 아직 없을 수 있음 (클라이언트는 원본으로 대체)
+    filename = stored_filename(url)
+    if not filename or file_extension(filename) not in IMAGE_EXTENSIONS:
+        return None
+    return {size: f"/uploads/{THUMBNAIL_DIR}/{thumbnail_name(filename, size)}" for size in THUMBNAIL_SIZES}
+
+
+def _load_pillow():
+    #Pillow는 썸네일 생성기를 만들 때 로드 (서버 기동 시간에서 제외), 없으면 썸네일 생성만 건너뜀
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    return Image
+
+
+class Thumbnailer:
+    #WebP 썸네일 생성 - 업로드 응답 후 백그라운드 작업으로 실행 (api/jobs.py)
+
+    def __init__(self, upload_folder):
+        self.upload_folder = upload_folder
+        self.image = _load_pillow()
+        self.enabled = self.image is not None
+
+    def accepts(self, filename):
+        return self.enabled and file_extension(filename) in IMAGE_EXTENSIONS
+
+    def generate(self, filename):
+        source = os.path.join(self.upload_folder, filename)
+        target_dir = os.path.join(self.upload_folder, THUMBNAIL_DIR)
+        os.makedirs(target_dir, exist_ok=True)
+        created = []
+        with self.image.open(source) as image:
+            image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+            for size in THUMBNAIL_SIZES:
+                target = os.path.join(target_dir, thumbnail_name(filename, size))
+                if os.path.exists(target):
+                    continue
+                resized = image.copy()
+                #원본보다 크게 늘리지 않음
+                resized.thumbnail((size, size * 4))
+                #다른 워커가 동시에 만들 수 있으므로 임시 파일에 쓴 뒤 교체
+                temp = f"{target}.{uuid.uuid4().hex}.tmp"
+                resized.save(temp, 'WEBP', quality=80)
+                os.replace(temp, target)
+                created.append(target)
+        return created
+
+
+def remove_media(upload_folder, filename, grace_seconds=0):
+    #업로드 파일과 썸네일 삭제 - 삭제한 경로 목록
+    #grace_seconds 안에 (다시) 업로드된 파일은 곧 다른 상품에 쓰일 수 있으므로 남겨 둠
+    source = os.path.join(upload_folder, filename)
+    try:
+        if time.time() - os.path.getmtime(source) < grace_seconds:
+            return []
+    except FileNotFoundError:
+        pass
+    paths = [source] + [
+        os.path.join(upload_folder, THUMBNAIL_DIR, thumbnail_name(filename, size)) for size in THUMBNAIL_SIZES
+    ]
+    removed = []
+    for path in paths:
+        try:
+            os.remove(path)
+            removed.append(path)
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def _lock_upload(f):
+    #업로드 임시 파일에 배타 잠금 - 같은 업로드의 청크를 동시에 쓰면(재시도 중복 등) 409
+    #기다리지 않음: gevent 워커에서 블로킹 잠금은 워커 전체를 멈춤, 잠금은 파일을 닫거나 프로세스가 죽으면 풀림
+    if fcntl is None:
+        return
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        raise UploadError("Another chunk is being written", 409)
+
+
+class ChunkedUploads:
+    #이어받기 가능한 청크 업로드 세션 관리
+    #세션 상태는 파일로 저장하므로 여러 워커 프로세스가 같은 업로드를 이어받을 수 있음
+    #현재 오프셋 = 임시 파일 크기, 청크는 반드시 현재 오프셋부터 순서대로 받음
+    #청크 기록은 업로드별 파일 잠금 안에서 오프셋 확인 -> 기록 -> (마지막 청크면) 크기 확인 / 저장
+
+    def __init__(self, upload_folder, max_size):
+        self.upload_folder = upload_folder
+        self.partial_dir = os.path.join(upload_folder, PARTIAL_DIR)
+        self.max_size = max_size
+        os.makedirs(self.partial_dir, exist_ok=True)
+
+    def _paths(self, upload_id):
+        if not re.fullmatch(r'[0-9a-f]{32}', upload_id):
+            raise UploadError("Upload not found", 404)
+        base = os.path.join(self.partial_dir, upload_id)
+        return base + '.json', base + '.part'
+
+    def _load(self, upload_id, user_id):
+        meta_path, part_path = self._paths(upload_id)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            raise UploadError("Upload not found", 404)
+        if meta['user_id'] != user_id:
+            raise UploadError("Upload not found", 404)
+        return meta, part_path
+
+    def create(self, user_id, filename, size, allowed_extensions):
+        ext = file_extension(filename)
+        if ext not in allowed_extensions:
+            raise UploadError("File type not allowed")
+        if size <= 0 or size > self.max_size:
+            raise UploadError("File too large", 413)
+        upload_id = uuid.uuid4().hex
+        meta_path, part_path = self._paths(upload_id)
+        open(part_path, 'wb').close()
+        with open(meta_path, 'w') as f:
+            json.dump({'user_id': user_id, 'ext': ext, 'size': size}, f)
+        return {"upload_id": upload_id, "offset": 0, "size": size}
+
+    def status(self, upload_id, user_id):
+        meta, part_path = self._load(upload_id, user_id)
+        return {"upload_id": upload_id, "offset": os.path.getsize(part_path), "size": meta['size']}
+
+    def write_chunk(self, upload_id, user_id, content_range, stream):
+        #Content-Range: bytes <start>-<end>/<total> 형식의 청크를 기록
+        #업로드가 끝나면 저장된 파일명을, 아니면 None을 반환
+        meta, part_path = self._load(upload_id, user_id)
+        match = _CONTENT_RANGE_RE.match(content_range or '')
+        if not match:
+            raise UploadError("Content-Range header is required")
+        start, end, total = (int(g) for g in match.groups())
+        if total != meta['size'] or end < start or end >= total:
+            raise UploadError("Invalid Content-Range")
+
+        try:
+            f = open(part_path, 'r+b')
+        except FileNotFoundError:
+            #다른 요청이 마지막 청크를 받아 저장을 끝냄
+            raise UploadError("Upload not found", 404)
+        with f:
+            _lock_upload(f)
+            offset = os.fstat(f.fileno()).st_size
+            if start != offset:
+                raise UploadError(f"Expected chunk starting at {offset}", 409)
+
+            #요청 본문을 블록 단위로 선언된 오프셋부터 바로 기록 (메모리에 전체 청크를 올리지 않음)
+            remaining = end - start + 1
+            f.seek(start)
+            while remaining > 0:
+                block = stream.read(min(_READ_BLOCK, remaining))
+                if not block:
+                    break
+                f.write(block)
+                remaining -= len(block)
+            f.flush()
+            if remaining > 0:
+                #중단된 청크는 잘라내 다음 재시도가 같은 오프셋에서 시작하도록 함
+                f.truncate(start)
+                raise UploadError("Incomplete chunk body")
+
+            if end + 1 < total:
+                return None
+            if os.fstat(f.fileno()).st_size != total:
+                raise UploadError("Upload size mismatch", 409)
+            #잠금을 쥔 채로 저장 - 같은 마지막 청크를 재시도한 요청은 409, 저장 후에는 404
+            filename = store_file(self.upload_folder, part_path, meta['ext'])
+        os.remove(self._paths(upload_id)[0])
+        return filename
+
+    def pending(self):
+        #진행 중인(아직 만료 정리되지 않은) 업로드가 있는지
+        with os.scandir(self.partial_dir) as entries:
+            return any(entry.name.endswith('.part') for entry in entries)
+
+    def expire(self, max_age):
+        #max_age(초) 동안 청크가 오지 않은 업로드와 중단된 단일 업로드 임시 파일 삭제 - 삭제한 경로 목록
+        #청크를 기록할 때마다 임시 파일 수정 시각이 갱신되므로 진행 중인 업로드는 남음
+        cutoff = time.time() - max_age
+        removed = []
+        with os.scandir(self.partial_dir) as entries:
+            parts = [entry for entry in entries if entry.name.endswith('.part')]
+        for entry in parts:
+            try:
+                if entry.stat().st_mtime >= cutoff:
+                    continue
+                os.remove(entry.path)
+                removed.append(entry.path)
+            except FileNotFoundError:
+                continue
+            meta_path = entry.path[:-len('.part')] + '.json'
+            try:
+                os.remove(meta_path)
+                removed.append(meta_path)
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def save_stream(self, stream, ext):
+        #일반(단일 요청) 업로드를 해시 이름으로 저장
+        temp_path = os.path.join(self.partial_dir, f"{uuid.uuid4().hex}.part")
+        with open(temp_path, 'wb') as f:
+            shutil.copyfileobj(stream, f, _READ_BLOCK)
+        return store_file(self.upload_folder, temp_path, ext)
@@ -0,0 +1,168 @@
+#================
+# 요청 성능 계측
+# 엔드포인트별 지연시간 / DB 쿼리 수·시간 / 응답 크기 히스토그램, 느린 쿼리 로그
+# Prometheus 텍스트 형식으로 노출 (워커 프로세스 단위 집계)
+#================
+
+import logging
+import random
+import threading
+import time
+
+from flask import current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger('univ_carrot.slow_query')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    #누적 버킷 히스토그램 (Prometheus histogram 형식)
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.total += 1
+        self.sum += value
+
+    def samples(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f'{name}_bucket{{{labels},le="+Inf"}} {self.total}'
+        yield f'{name}_sum{{{labels}}} {self.sum}'
+        yield f'{name}_count{{{labels}}} {self.total}'
+
+
+class RequestMetrics:
+    #요청 단위 계측 - sample_rate 비율의 요청만 상세 계측(히스토그램 / Server-Timing)해 오버헤드를 제한
+    #요청 수와 느린 쿼리 로그는 샘플링과 관계없이 모든 요청(과 백그라운드 작업)에서 집계
+
+    def __init__(self, sample_rate=1.0, slow_query_ms=200, server_timing=False):
+        self.sample_rate = sample_rate
+        self.slow_query_seconds = slow_query_ms / 1000
+        self.server_timing = server_timing
+        self._lock = threading.Lock()
+        self._requests = {}
+        self._latency = {}
+        self._queries = {}
+        self._query_time = {}
+        self._sizes = {}
+        self.slow_queries = 0
+
+    def init_app(self, app):
+        app.extensions['request_metrics'] = self
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        #쿼리 이벤트는 모든 엔진 공통이므로 한 번만 등록하고 현재 앱의 계측기로 전달
+        if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    def _before_request(self):
+        if self.sample_rate >= 1 or random.random() < self.sample_rate:
+            g._metrics = {'start': time.perf_counter(), 'queries': 0, 'query_time': 0.0}
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        #느린 쿼리는 샘플링 대상이 아닌 요청에서도 잡아야 하므로 시간은 항상 잼 (perf_counter 두 번)
+        #시작 시각은 실행 단위 컨텍스트에 저장 (실행이 실패해도 연결에 남지 않음)
+        if context is not None:
+            context._metrics_query_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, '_metrics_query_start', None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        if elapsed >= self.slow_query_seconds:
+            with self._lock:
+                self.slow_queries += 1
+            endpoint = request.endpoint if has_request_context() else 'background'
+            logger.warning('slow query (%.1f ms) on %s: %s', elapsed * 1000, endpoint, statement)
+        state = g.get('_metrics')
+        if state is not None:
+            state['queries'] += 1
+            state['query_time'] += elapsed
+
+    def _after_request(self, response):
+        endpoint = request.endpoint or 'unmatched'
+        key = (endpoint, request.method)
+        with self._lock:
+            count_key = key + (response.status_code,)
+            self._requests[count_key] = self._requests.get(count_key, 0) + 1
+
+        state = g.pop('_metrics', None)
+        if state is None:
+            return response
+
+        elapsed = time.perf_counter() - state['start']
+        #스트리밍 응답은 길이를 알 수 없으므로 크기 집계에서 제외
+        size = None if response.is_streamed else response.calculate_content_length()
+        with self._lock:
+            self._latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(elapsed)
+            self._queries.setdefault(key, Histogram(QUERY_COUNT_BUCKETS)).observe(state['queries'])
+            self._query_time.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(state['query_time'])
+            if size is not None:
+                self._sizes.setdefault(key, Histogram(SIZE_BUCKETS)).observe(size)
+
+        if self.server_timing:
+            response.headers.add(
+                'Server-Timing',
+                f'app;dur={elapsed * 1000:.1f}, db;dur={state["query_time"] * 1000:.1f};desc="{state["queries"]} queries"'
+            )
+        return response
+
+    def render(self, gauges=None):
+        #Prometheus 텍스트 형식 출력 - gauges: {이름: 값} 추가 지표
+        lines = []
+        with self._lock:
+            lines.append('# TYPE http_requests_total counter')
+            for (endpoint, method, status), count in sorted(self._requests.items()):
+                lines.append(f'http_requests_total{{endpoint="{endpoint}",method="{method}",status="{status}"}} {count}')
+            for name, histograms in (
+                ('http_request_duration_seconds', self._latency),
+                ('http_request_db_queries', self._queries),
+                ('http_request_db_duration_seconds', self._query_time),
+                ('http_response_size_bytes', self._sizes),
+            ):
+                lines.append(f'# TYPE {name} histogram')
+                for (endpoint, method), histogram in sorted(histograms.items()):
+                    lines.extend(histogram.samples(name, f'endpoint="{endpoint}",method="{method}"'))
+            lines.append('# TYPE db_slow_queries_total counter')
+            lines.append(f'db_slow_queries_total {self.slow_queries}')
+        for name, value in (gauges or {}).items():
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def _current_metrics():
+    #요청 밖(백그라운드 작업 등)이라도 앱 컨텍스트가 있으면 느린 쿼리 로그 대상
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('request_metrics')
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    metrics = _current_metrics()
+    if metrics is not None:
+        metrics._before_cursor_execute(conn, cursor, statement, parameters, context, executemany)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    metrics = _current_metrics()
+    if metrics is not None:
+        metrics._after_cursor_execute(conn, cursor, statement, parameters, context, executemany)
@@ -11,7 +11,8 @@ config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-fileConfig(config.config_file_name)
+# 앱 로거(느린 쿼리 로그 등)는 그대로 둠 - 같은 프로세스에서 마이그레이션을 실행해도 (테스트) 꺼지지 않도록
+fileConfig(config.config_file_name, disable_existing_loggers=False)
 logger = logging.getLogger('alembic.env')
 
 
@@ -0,0 +1,57 @@
+"""Add wishlist unique constraint, cascade and product wishlist counts
+
+Revision ID: 0add88a3bb6d
+Revises: a60d1af377d0
+Create Date: 2026-10-18 14:05:37.220918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# 기존 외래 키는 이름이 없으므로 Postgres 기본 이름 규칙(<table>_<column>_fkey)으로 지정
+# (SQLite 배치 모드에서 반영된 제약에도 같은 이름이 붙도록 naming_convention 사용)
+NAMING_CONVENTION = {"fk": "%(table_name)s_%(column_0_name)s_fkey"}
+
+
+# revision identifiers, used by Alembic.
+revision = '0add88a3bb6d'
+down_revision = 'a60d1af377d0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 삭제된 상품을 가리키는 찜과 중복 찜 정리
+    op.execute("DELETE FROM wishlist WHERE product_id NOT IN (SELECT id FROM product)")
+    op.execute(
+        "DELETE FROM wishlist WHERE id NOT IN "
+        "(SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM wishlist GROUP BY user_id, product_id) AS keep)"
+    )
+
+    with op.batch_alter_table('wishlist', schema=None, naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.create_unique_constraint('uq_wishlist_user_id_product_id', ['user_id', 'product_id'])
+        batch_op.create_index('ix_wishlist_product_id', ['product_id'], unique=False)
+        batch_op.drop_constraint('wishlist_product_id_fkey', type_='foreignkey')
+        batch_op.create_foreign_key(
+            'wishlist_product_id_fkey', 'product', ['product_id'], ['id'], ondelete='CASCADE'
+        )
+
+    with op.batch_alter_table('product', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('wishlist_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute(
+        "UPDATE product SET wishlist_count = "
+        "(SELECT COUNT(*) FROM wishlist WHERE wishlist.product_id = product.id)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('product', schema=None) as batch_op:
+        batch_op.drop_column('wishlist_count')
+
+    with op.batch_alter_table('wishlist', schema=None, naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint('wishlist_product_id_fkey', type_='foreignkey')
+        batch_op.create_foreign_key('wishlist_product_id_fkey', 'product', ['product_id'], ['id'])
+        batch_op.drop_index('ix_wishlist_product_id')
+        batch_op.drop_constraint('uq_wishlist_user_id_product_id', type_='unique')
@@ -0,0 +1,32 @@
+"""Add product feed indexes
+
+Revision ID: 192c5e7819ff
+Revises: de870ff466f9
+Create Date: 2026-10-18 10:12:31.402113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '192c5e7819ff'
+down_revision = 'de870ff466f9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('product', schema=None) as batch_op:
+        batch_op.create_index('ix_product_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_product_status_created_at_id', ['status', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_product_user_id_created_at_id', ['user_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_product_price', ['price'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('product', schema=None) as batch_op:
+        batch_op.drop_index('ix_product_price')
+        batch_op.drop_index('ix_product_user_id_created_at_id')
+        batch_op.drop_index('ix_product_status_created_at_id')
+        batch_op.drop_index('ix_product_created_at_id')
@@ -0,0 +1,64 @@
+"""Create user, product and wishlist tables
+
+Revision ID: 564a22a7f530
+Revises: 
+Create Date: 2026-10-18 13:02:18.904417
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '564a22a7f530'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# 이 테이블들은 초기 마이그레이션 이전에 db.create_all()로 만들어졌음.
+# 빈 데이터베이스(예: 새 Postgres)에서도 마이그레이션만으로 스키마가 완성되도록 추가한 기준 리비전.
+def upgrade():
+    existing = [] if context.is_offline_mode() else sa.inspect(op.get_bind()).get_table_names()
+
+    if 'user' not in existing:
+        op.create_table('user',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(length=80), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False),
+        sa.Column('password_hash', sa.String(length=256), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email'),
+        sa.UniqueConstraint('username')
+        )
+    if 'product' not in existing:
+        op.create_table('product',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('image_url', sa.String(length=500), nullable=True),
+        sa.Column('video_url', sa.String(length=500), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if 'wishlist' not in existing:
+        op.create_table('wishlist',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['product_id'], ['product.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+
+def downgrade():
+    op.drop_table('wishlist')
+    op.drop_table('product')
+    op.drop_table('user')
@@ -0,0 +1,26 @@
+"""Add product view count
+
+Revision ID: 7b2d4e8a1c93
+Revises: 3f1c9a7d2b6e
+Create Date: 2026-10-18 18:20:11.503216
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2d4e8a1c93'
+down_revision = '3f1c9a7d2b6e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('product', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('view_count', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('product', schema=None) as batch_op:
+        batch_op.drop_column('view_count')
@@ -0,0 +1,32 @@
+"""Add product search index
+
+Revision ID: 91e95c85f4d8
+Revises: 192c5e7819ff
+Create Date: 2026-10-18 11:03:52.715840
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '91e95c85f4d8'
+down_revision = '192c5e7819ff'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 색인은 SQLite에서만 사용 - 기존 상품은 a3c8e1f5b9d2 마이그레이션에서 백필
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS product_fts "
+        "USING fts5(name, description, tokenize='unicode61')"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TABLE IF EXISTS product_fts")
@@ -0,0 +1,26 @@
+"""Add message (chat_room_id, id) index
+
+Revision ID: 959d6cd09daa
+Revises: 91e95c85f4d8
+Create Date: 2026-10-18 11:47:09.318264
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '959d6cd09daa'
+down_revision = '91e95c85f4d8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('message', schema=None) as batch_op:
+        batch_op.create_index('ix_message_chat_room_id_id', ['chat_room_id', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('message', schema=None) as batch_op:
+        batch_op.drop_index('ix_message_chat_room_id_id')
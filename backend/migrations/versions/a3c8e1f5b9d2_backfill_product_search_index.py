@@ -0,0 +1,32 @@
+"""Backfill the product search index
+
+Revision ID: a3c8e1f5b9d2
+Revises: f2b7d9e4a6c1
+Create Date: 2026-10-19 09:26:14.551093
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from search import rebuild_index
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c8e1f5b9d2'
+down_revision = 'f2b7d9e4a6c1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 91e95c85f4d8은 빈 색인만 만들었으므로 기존 상품을 색인 (이후 변경은 앱이 flush 시점에 반영)
+    connection = op.get_bind()
+    if connection.dialect.name != 'sqlite':
+        return
+    products = connection.execute(sa.text("SELECT id, name, description FROM product")).yield_per(1000)
+    rebuild_index(connection, products)
+
+
+def downgrade():
+    # 색인 내용만 채웠으므로 되돌릴 스키마 변경 없음
+    pass
@@ -0,0 +1,50 @@
+"""Add chat room last message summary and unread counts
+
+Revision ID: a60d1af377d0
+Revises: 959d6cd09daa
+Create Date: 2026-10-18 12:20:44.581930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a60d1af377d0'
+down_revision = '959d6cd09daa'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('chat_room', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('last_message_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('last_message_preview', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('last_message_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('buyer_unread_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('seller_unread_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.create_index('ix_chat_room_buyer_id_last_message_at', ['buyer_id', 'last_message_at'], unique=False)
+        batch_op.create_index('ix_chat_room_seller_id_last_message_at', ['seller_id', 'last_message_at'], unique=False)
+
+    # 기존 채팅방의 마지막 메시지 요약 백필
+    op.execute(
+        "UPDATE chat_room SET last_message_id = "
+        "(SELECT MAX(m.id) FROM message m WHERE m.chat_room_id = chat_room.id)"
+    )
+    op.execute(
+        "UPDATE chat_room SET "
+        "last_message_preview = (SELECT SUBSTR(m.content, 1, 100) FROM message m WHERE m.id = chat_room.last_message_id), "
+        "last_message_at = (SELECT m.created_at FROM message m WHERE m.id = chat_room.last_message_id) "
+        "WHERE last_message_id IS NOT NULL"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('chat_room', schema=None) as batch_op:
+        batch_op.drop_index('ix_chat_room_seller_id_last_message_at')
+        batch_op.drop_index('ix_chat_room_buyer_id_last_message_at')
+        batch_op.drop_column('seller_unread_count')
+        batch_op.drop_column('buyer_unread_count')
+        batch_op.drop_column('last_message_at')
+        batch_op.drop_column('last_message_preview')
+        batch_op.drop_column('last_message_id')
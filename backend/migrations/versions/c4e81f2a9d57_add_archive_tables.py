@@ -0,0 +1,77 @@
+"""Add archive tables for sold products and idle chat rooms
+
+Revision ID: c4e81f2a9d57
+Revises: 7b2d4e8a1c93
+Create Date: 2026-10-18 19:42:03.118540
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e81f2a9d57'
+down_revision = '7b2d4e8a1c93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('archived_product',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('price', sa.Float(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('image_url', sa.String(length=500), nullable=True),
+    sa.Column('video_url', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('wishlist_count', sa.Integer(), nullable=False),
+    sa.Column('view_count', sa.Integer(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('archived_chat_room',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('buyer_id', sa.Integer(), nullable=False),
+    sa.Column('seller_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('last_message_id', sa.Integer(), nullable=True),
+    sa.Column('last_message_preview', sa.String(length=100), nullable=True),
+    sa.Column('last_message_at', sa.DateTime(), nullable=True),
+    sa.Column('buyer_unread_count', sa.Integer(), nullable=False),
+    sa.Column('seller_unread_count', sa.Integer(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('archived_chat_room', schema=None) as batch_op:
+        batch_op.create_index('ix_archived_chat_room_product_id_buyer_id', ['product_id', 'buyer_id'], unique=False)
+
+    op.create_table('archived_message',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('chat_room_id', sa.Integer(), nullable=False),
+    sa.Column('sender_id', sa.Integer(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['sender_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('archived_message', schema=None) as batch_op:
+        batch_op.create_index('ix_archived_message_chat_room_id_id', ['chat_room_id', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('archived_message', schema=None) as batch_op:
+        batch_op.drop_index('ix_archived_message_chat_room_id_id')
+
+    op.drop_table('archived_message')
+    with op.batch_alter_table('archived_chat_room', schema=None) as batch_op:
+        batch_op.drop_index('ix_archived_chat_room_product_id_buyer_id')
+
+    op.drop_table('archived_chat_room')
+    op.drop_table('archived_product')
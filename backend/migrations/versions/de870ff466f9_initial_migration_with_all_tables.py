@@ -1,7 +1,7 @@
 """Initial migration with all tables
 
 Revision ID: de870ff466f9
-Revises: 
+Revises: 564a22a7f530
 Create Date: 2025-12-05 14:57:40.156496
 
 """
@@ -11,7 +11,7 @@ import sqlalchemy as sa
 
 # revision identifiers, used by Alembic.
 revision = 'de870ff466f9'
-down_revision = None
+down_revision = '564a22a7f530'
 branch_labels = None
 depends_on = None
 
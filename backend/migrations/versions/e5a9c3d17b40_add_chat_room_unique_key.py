@@ -0,0 +1,54 @@
+"""Add unique (product_id, buyer_id) key to chat rooms
+
+Revision ID: e5a9c3d17b40
+Revises: c4e81f2a9d57
+Create Date: 2026-10-18 21:03:47.662104
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# 같은 상품/구매자 채팅방 중 남길 채팅방 (가장 먼저 만들어진 것)
+KEEP_ROOMS = "SELECT MIN(id) AS keep_id FROM chat_room GROUP BY product_id, buyer_id"
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a9c3d17b40'
+down_revision = 'c4e81f2a9d57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 중복 생성된 채팅방 병합 - 메시지를 남길 채팅방으로 옮기고 안 읽은 수를 합친 뒤 나머지 삭제
+    op.execute(
+        "UPDATE message SET chat_room_id = "
+        "(SELECT MIN(k.id) FROM chat_room k, chat_room r "
+        "WHERE r.id = message.chat_room_id AND k.product_id = r.product_id AND k.buyer_id = r.buyer_id)"
+    )
+    merged = f"id IN (SELECT keep_id FROM ({KEEP_ROOMS} HAVING COUNT(*) > 1) AS keep)"
+    op.execute(
+        "UPDATE chat_room SET "
+        "buyer_unread_count = (SELECT SUM(d.buyer_unread_count) FROM chat_room d "
+        "WHERE d.product_id = chat_room.product_id AND d.buyer_id = chat_room.buyer_id), "
+        "seller_unread_count = (SELECT SUM(d.seller_unread_count) FROM chat_room d "
+        "WHERE d.product_id = chat_room.product_id AND d.buyer_id = chat_room.buyer_id), "
+        "last_message_id = (SELECT MAX(m.id) FROM message m WHERE m.chat_room_id = chat_room.id) "
+        f"WHERE {merged}"
+    )
+    op.execute(
+        "UPDATE chat_room SET "
+        "last_message_preview = (SELECT SUBSTR(m.content, 1, 100) FROM message m WHERE m.id = chat_room.last_message_id), "
+        "last_message_at = (SELECT m.created_at FROM message m WHERE m.id = chat_room.last_message_id) "
+        f"WHERE last_message_id IS NOT NULL AND {merged}"
+    )
+    op.execute(f"DELETE FROM chat_room WHERE id NOT IN (SELECT keep_id FROM ({KEEP_ROOMS}) AS keep)")
+
+    with op.batch_alter_table('chat_room', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_chat_room_product_id_buyer_id', ['product_id', 'buyer_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('chat_room', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_chat_room_product_id_buyer_id', type_='unique')
@@ -0,0 +1,44 @@
+"""Never reuse product / chat room / message ids on SQLite
+
+Revision ID: f2b7d9e4a6c1
+Revises: e5a9c3d17b40
+Create Date: 2026-10-18 23:12:40.305871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# 보관 테이블로 옮겨 원본에서 지워지는 테이블 - (원본, 보관)
+# SQLite의 INTEGER PRIMARY KEY는 가장 큰 ID가 지워지면 그 ID를 다시 쓰므로 AUTOINCREMENT로 재생성
+# Postgres 등은 시퀀스가 ID를 재사용하지 않으므로 변경 없음
+TABLES = (('product', 'archived_product'), ('chat_room', 'archived_chat_room'), ('message', 'archived_message'))
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2b7d9e4a6c1'
+down_revision = 'e5a9c3d17b40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table, archive in TABLES:
+        with op.batch_alter_table(table, recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+            pass
+        # 이미 보관된(원본에서 지워진) ID도 건너뛰도록 다음 ID를 원본/보관 테이블의 최대 ID 이후로
+        op.execute(f"DELETE FROM sqlite_sequence WHERE name = '{table}'")
+        op.execute(
+            f"INSERT INTO sqlite_sequence (name, seq) SELECT '{table}', "
+            f"MAX(COALESCE((SELECT MAX(id) FROM {table}), 0), COALESCE((SELECT MAX(id) FROM {archive}), 0))"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table, _ in reversed(TABLES):
+        with op.batch_alter_table(table, recreate='always', table_kwargs={'sqlite_autoincrement': False}):
+            pass
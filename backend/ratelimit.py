@@ -0,0 +1,228 @@
+#================
+# 요청 수락 제어
+# 클라이언트(사용자 ID 또는 IP, 로그인은 IP + 아이디) + 엔드포인트별 토큰 버킷으로 요청 빈도 제한 (초과 시 429 + Retry-After)
+# 본문을 읽기 전에 크기 / 빈도를 먼저 확인해 해싱 / 업로드 / 폴링 요청이 워커를 점유하지 않도록 함
+# 버킷 저장소는 메모리(워커 단위) / Redis(워커 간 공유)를 같은 인터페이스로 제공
+#================
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from flask import jsonify, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
+
+from cache import MemoryCache
+
+logger = logging.getLogger('univ_carrot.ratelimit')
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+def parse_rate(rate):
+    #'10/minute' -> (버킷 크기 10, 초당 충전량 10/60), 'none'이면 제한 없음
+    if rate is None or rate.strip().lower() == 'none':
+        return None
+    try:
+        count, period = rate.strip().split('/')
+        count, seconds = int(count), PERIODS[period.strip().lower()]
+    except (KeyError, ValueError):
+        raise ValueError(f"Invalid rate limit: {rate!r} (expected e.g. '10/minute')")
+    if count < 1:
+        raise ValueError(f"Invalid rate limit: {rate!r}")
+    return count, count / seconds
+
+
+class MemoryBuckets:
+    #프로세스 내 토큰 버킷 (스레드 안전, 오래 안 쓴 키부터 축출)
+    #워커마다 따로 세므로 실제 한도는 워커 수만큼 커짐 - 여러 워커에서 정확히 제한하려면 Redis 사용
+    backend = 'memory'
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key, capacity, rate, cost=1):
+        #토큰을 cost만큼 사용 - (허용 여부, 다시 시도할 수 있을 때까지 남은 초)
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (cost - tokens) / rate
+
+    def stats(self):
+        with self._lock:
+            return {"backend": self.backend, "keys": len(self._buckets), "max_keys": self.max_keys}
+
+
+# 버킷 갱신을 서버에서 원자적으로 실행 (시각도 서버 기준 - 워커 간 시계 차이 무관)
+# 소수 반환값은 정수로 잘리므로 대기 시간은 문자열로 반환
+TOKEN_BUCKET_SCRIPT = '''
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(wait)}
+'''
+
+
+class RedisBuckets:
+    #Redis 호환 서버 백엔드 - 모든 워커/인스턴스가 같은 버킷을 공유
+    #서버 장애 시에는 요청을 막지 않고 허용 (제한보다 서비스 가용성 우선)
+    backend = 'redis'
+
+    def __init__(self, url, prefix='univ-carrot:rl:'):
+        #redis 저장소를 쓸 때만 필요
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_STORAGE=redis requires the 'redis' package")
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._script = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+        self._errors = redis.RedisError
+        self.failures = 0
+
+    def hit(self, key, capacity, rate, cost=1):
+        try:
+            allowed, wait = self._script(keys=[self.prefix + key], args=[capacity, rate, cost])
+        except self._errors:
+            self.failures += 1
+            logger.warning("Rate limit storage unavailable, allowing request", exc_info=True)
+            return True, 0.0
+        return bool(allowed), float(wait)
+
+    def stats(self):
+        return {"backend": self.backend, "failures": self.failures}
+
+
+def create_bucket_store(config):
+    #설정값 RATE_LIMIT_STORAGE에 따라 버킷 저장소 생성 (memory | redis)
+    storage = config.get('RATE_LIMIT_STORAGE', 'memory')
+    if storage == 'memory':
+        return MemoryBuckets(max_keys=config.get('RATE_LIMIT_MAX_KEYS', 100000))
+    if storage == 'redis':
+        return RedisBuckets(config['RATE_LIMIT_REDIS_URL'])
+    raise ValueError(f"Unknown RATE_LIMIT_STORAGE: {storage}")
+
+
+class RateLimiter:
+    #엔드포인트별 요청 빈도 / 본문 크기 제한 - 뷰가 본문을 읽기 전(before_request)에 거절
+    #limits: {엔드포인트: '10/minute' | 'none'}, 목록에 없는 엔드포인트는 default 적용
+    #body_limits: {엔드포인트: 최대 바이트}, 목록에 없는 엔드포인트는 max_body_size 적용
+    #identity_fields: {엔드포인트: JSON 필드} - 로그인 전 요청을 IP + 필드 값(아이디)으로 셈 (NAT 뒤 같은 IP의 사용자끼리 한도 공유 방지)
+
+    def __init__(self, store, limits=None, default=None, body_limits=None, max_body_size=None, enabled=True,
+                 identity_fields=None):
+        self.store = store
+        self.identity_fields = identity_fields or {}
+        self.enabled = enabled
+        self.limits = {endpoint: parse_rate(rate) for endpoint, rate in (limits or {}).items()}
+        self.default = parse_rate(default)
+        self.body_limits = body_limits or {}
+        self.max_body_size = max_body_size
+        #검증된 토큰 -> 사용자 키 (토큰 서명 검증은 요청당 수백 us라 뷰의 jwt_required와 중복되지 않도록 재사용)
+        self._token_keys = MemoryCache(max_entries=10000, default_ttl=300)
+        self._lock = threading.Lock()
+        self.rejected = {}
+
+    def init_app(self, app):
+        app.extensions['rate_limiter'] = self
+        app.before_request(self._before_request)
+
+    def _reject(self, endpoint, reason):
+        with self._lock:
+            self.rejected[(endpoint, reason)] = self.rejected.get((endpoint, reason), 0) + 1
+
+    def client_key(self):
+        #로그인한 요청은 사용자 ID, 그 외(로그인/가입, 토큰 오류 포함)는 IP 기준 (identity_fields 엔드포인트는 IP + 필드 값)
+        #토큰이 잘못됐으면 여기서는 IP로 세고, 인증 오류 응답은 뷰의 jwt_required가 처리
+        token = request.headers.get('Authorization') or request.args.get('jwt')
+        if token:
+            key = self._token_keys.get(token)
+            if key is not None:
+                return key
+            try:
+                verify_jwt_in_request(optional=True, locations=['headers', 'query_string'])
+                user_id = get_jwt_identity()
+            except (JWTExtendedException, PyJWTError):
+                user_id = None
+            if user_id is not None:
+                key = f'u{user_id}'
+                self._token_keys.set(token, key)
+                return key
+        key = f'ip{request.remote_addr}'
+        field = self.identity_fields.get(request.endpoint)
+        if field:
+            #본문 크기는 이미 확인됨, 필드가 없거나 형식이 잘못된 요청은 IP로만 셈 (오류 응답은 뷰가 처리)
+            data = request.get_json(silent=True)
+            value = data.get(field) if isinstance(data, dict) else None
+            if isinstance(value, str) and value:
+                key += f':{value[:64]}'
+        return key
+
+    def _before_request(self):
+        endpoint = request.endpoint
+        #없는 경로(404) / CORS preflight는 제한하지 않음
+        if endpoint is None or request.method == 'OPTIONS':
+            return None
+
+        #본문 크기 - Content-Length로 먼저 거절하고, 길이를 모르는 본문(chunked)은 읽는 중에 413
+        max_size = self.body_limits.get(endpoint, self.max_body_size)
+        if max_size:
+            if request.content_length is not None and request.content_length > max_size:
+                self._reject(endpoint, 'body_size')
+                return jsonify({"error": "Request body too large", "max_size": max_size}), 413
+            request.max_content_length = max_size
+
+        if not self.enabled:
+            return None
+        rule = self.limits.get(endpoint, self.default)
+        if rule is None:
+            return None
+        allowed, wait = self.store.hit(f'{endpoint}:{self.client_key()}', *rule)
+        if allowed:
+            return None
+        self._reject(endpoint, 'rate')
+        retry_after = max(1, math.ceil(wait))
+        response = jsonify({"error": "Too many requests", "retry_after": retry_after})
+        response.headers['Retry-After'] = str(retry_after)
+        return response, 429
+
+    def stats(self):
+        return self.store.stats()
+
+    def render(self):
+        #Prometheus 형식 거절 카운터
+        lines = ['# TYPE http_requests_rejected_total counter']
+        with self._lock:
+            for (endpoint, reason), count in sorted(self.rejected.items()):
+                lines.append(f'http_requests_rejected_total{{endpoint="{endpoint}",reason="{reason}"}} {count}')
+        return lines
@@ -0,0 +1,114 @@
+#================
+# 실시간 채팅 전달
+# 프로세스 내 pub/sub - 채팅방별 구독자 큐로 새 메시지를 팬아웃
+#================
+
+import json
+import queue
+import threading
+
+#구독자 큐 최대 길이 - 느린 클라이언트 때문에 메모리가 늘지 않도록 제한
+SUBSCRIBER_QUEUE_SIZE = 100
+
+#연결 유지를 위한 하트비트 간격 (초)
+HEARTBEAT_INTERVAL = 15
+
+#연결이 끊겼을 때 클라이언트 재연결 대기 시간 (밀리초)
+RECONNECT_DELAY_MS = 3000
+
+#브로커 종료 시 구독자에게 보내는 종료 신호
+CLOSED = object()
+
+
+class Broker:
+    #채널(채팅방) 단위 발행/구독 중개자 - 스레드 안전
+
+    def __init__(self, queue_size=SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._channels = {}
+        self._lock = threading.Lock()
+        self.closed = False
+
+    def subscribe(self, channel):
+        subscriber = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._channels.setdefault(channel, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, channel, subscriber):
+        with self._lock:
+            subscribers = self._channels.get(channel)
+            if subscribers is None:
+                return
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._channels[channel]
+
+    def publish(self, channel, event):
+        #가득 찬 큐(응답 없는 구독자)는 건너뜀 - 재연결 시 Last-Event-ID로 보충
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                pass
+        return len(subscribers)
+
+    def close(self):
+        #워커 종료 시 열린 스트림을 모두 끝냄 - 클라이언트는 다른 워커로 재연결
+        with self._lock:
+            self.closed = True
+            subscribers = [s for channel in self._channels.values() for s in channel]
+        for subscriber in subscribers:
+            #가득 찬 큐는 오래된 이벤트 하나를 버리고 종료 신호를 넣음
+            while True:
+                try:
+                    subscriber.put_nowait(CLOSED)
+                    break
+                except queue.Full:
+                    try:
+                        subscriber.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def subscriber_count(self, channel=None):
+        with self._lock:
+            if channel is not None:
+                return len(self._channels.get(channel, ()))
+            return sum(len(s) for s in self._channels.values())
+
+
+def format_sse(data, event_id=None):
+    #Server-Sent Events 프레임 생성
+    frame = ''
+    if event_id is not None:
+        frame += f'id: {event_id}\n'
+    frame += f'data: {json.dumps(data, ensure_ascii=False)}\n\n'
+    return frame
+
+
+def stream_events(broker, channel, subscriber, backlog=(), heartbeat=HEARTBEAT_INTERVAL):
+    #SSE 응답 본문 제너레이터 - 밀린 메시지를 먼저 보내고 이후 발행분을 전달
+    #backlog와 구독 사이에 발행된 메시지가 중복되지 않도록 마지막 ID 이후만 전송
+    last_id = 0
+    try:
+        #응답 헤더를 바로 보내도록 첫 프레임 전송 (재연결 간격 지정)
+        yield f'retry: {RECONNECT_DELAY_MS}\n\n'
+        for event in backlog:
+            last_id = event['id']
+            yield format_sse(event, event['id'])
+        while not broker.closed:
+            try:
+                event = subscriber.get(timeout=heartbeat)
+            except queue.Empty:
+                yield ': keep-alive\n\n'
+                continue
+            if event is CLOSED:
+                break
+            if event['id'] <= last_id:
+                continue
+            last_id = event['id']
+            yield format_sse(event, event['id'])
+    finally:
+        broker.unsubscribe(channel, subscriber)
@@ -0,0 +1,126 @@
+#================
+# 읽기 복제본 라우팅
+# 읽기 전용 핸들러(@replica_reads)의 SELECT는 복제본으로, 쓰기(flush / DML)와 그 외 모든 쿼리는 주 DB로 보냄
+# 쓰기 요청을 한 사용자는 sticky_seconds 동안 읽기도 주 DB에서 (복제 지연 중에도 방금 등록한 상품 등이 바로 보임)
+# 복제본은 SQLALCHEMY_BINDS의 replica0, replica1 ... 로 등록 (모델은 복제본 바인드를 쓰지 않으므로 create_all 대상 아님)
+#================
+
+import functools
+import random
+import sqlite3
+import threading
+
+import click
+from flask import current_app, request
+from flask.cli import with_appcontext
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.session import Session
+
+REPLICA_BIND_PREFIX = 'replica'
+
+# 주 DB에 쓰지 않는 요청 메서드
+SAFE_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+
+
+def replica_binds(urls, engine_options):
+    #복제본 주소 목록 -> SQLALCHEMY_BINDS 항목 (engine_options(url): 주소별 커넥션 풀 설정)
+    return {f'{REPLICA_BIND_PREFIX}{i}': {'url': url, **engine_options(url)} for i, url in enumerate(urls)}
+
+
+class RoutingSession(Session):
+    #info['replica']에 복제본 바인드 이름이 있으면 SELECT를 그 복제본으로 실행
+    #쓰기가 한 번이라도 주 DB로 가면 같은 세션의 이후 읽기도 주 DB에서 (방금 쓴 내용을 읽도록)
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        replica = self.info.get('replica')
+        if bind is None and replica is not None:
+            if not self._flushing and getattr(clause, 'is_select', False):
+                return self._db.engines[replica]
+            self.info['replica'] = None
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _identity():
+    #jwt_required(optional 포함)를 거치지 않은 요청이면 None
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        return None
+
+
+class ReplicaRouter:
+    #요청별 복제본 선택 + 최근 쓰기한 사용자 기록 (sticky_store: 워커 간 공유하려면 Redis 캐시)
+
+    def __init__(self, binds, sticky_store, sticky_seconds=5):
+        self.binds = sorted(name for name in binds if name.startswith(REPLICA_BIND_PREFIX))
+        self.sticky_store = sticky_store
+        self.sticky_seconds = sticky_seconds
+        self._lock = threading.Lock()
+        self.replica_reads = 0
+        self.sticky_reads = 0
+
+    def init_app(self, app):
+        app.extensions['replica_router'] = self
+        app.after_request(self._after_request)
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def route(self, user_id):
+        #이번 요청의 읽기를 보낼 복제본 선택 (요청 안에서는 같은 복제본 사용)
+        if user_id is not None and self.sticky_store.get(f'rw:{user_id}') is not None:
+            self._count('sticky_reads')
+            return
+        current_app.extensions['sqlalchemy'].session.info['replica'] = random.choice(self.binds)
+        self._count('replica_reads')
+
+    def cache_ttl(self):
+        #복제본에서 읽은 응답은 복제 지연만큼만 캐시 (쓰기 직후 세대가 올라간 키에 지연된 내용이 오래 남지 않도록)
+        session = current_app.extensions['sqlalchemy'].session
+        return self.sticky_seconds if session.info.get('replica') is not None else None
+
+    def _after_request(self, response):
+        #성공한 쓰기 요청의 사용자는 sticky_seconds 동안 주 DB에서 읽음
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            user_id = _identity()
+            if user_id is not None:
+                self.sticky_store.set(f'rw:{user_id}', b'1', ttl=self.sticky_seconds)
+        return response
+
+    def stats(self):
+        with self._lock:
+            return {"replicas": len(self.binds), "replica_reads": self.replica_reads, "sticky_reads": self.sticky_reads}
+
+
+def replica_reads(view):
+    #읽기 전용 핸들러의 SELECT를 복제본으로 - jwt_required 안쪽에 적용 (최근 쓰기 여부를 사용자 기준으로 판단)
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        router = current_app.extensions.get('replica_router')
+        if router is not None:
+            router.route(_identity())
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def read_primary():
+    #이번 요청의 이후 읽기를 주 DB에서 - 복제본에 없는 행(방금 만들어져 아직 복제 전)을 다시 찾을 때
+    #복제본에서 읽고 있었으면 True (다시 조회할 의미가 있음)
+    return current_app.extensions['sqlalchemy'].session.info.pop('replica', None) is not None
+
+
+@click.command('sync-replicas')
+@with_appcontext
+def sync_replicas_command():
+    #로컬 개발용 - SQLite 복제본 파일을 주 DB의 현재 내용으로 덮어씀 (그 사이의 쓰기가 복제 지연처럼 보임)
+    db = current_app.extensions['sqlalchemy']
+    primary = db.engines[None].url
+    if primary.get_backend_name() != 'sqlite':
+        raise click.ClickException("sync-replicas only copies SQLite databases; use streaming replication for Postgres")
+    for name in sorted(key for key in db.engines if key and key.startswith(REPLICA_BIND_PREFIX)):
+        replica = db.engines[name]
+        replica.dispose()
+        with sqlite3.connect(primary.database) as source, sqlite3.connect(replica.url.database) as target:
+            source.backup(target)
+        click.echo(f"{name}: copied from {primary.database}")
@@ -0,0 +1,52 @@
+#================
+# 테스트 공통 설정
+# create_app(config)로 테스트용 앱 생성 - 기본은 SQLite 메모리 DB
+# DATABASE_URL을 지정하면 그 DB에서 실행 (예: DATABASE_URL=postgresql://localhost/carrot_test python -m pytest)
+# 앱을 만들 때마다 모든 테이블을 지우고 다시 만들므로 테스트 전용 DB를 지정해야 함
+#================
+
+import os
+
+import pytest
+
+from api import create_app, shutdown
+from api.auth import issue_tokens
+from api.config import normalize_database_url
+from api.extensions import db
+
+TEST_DATABASE_URL = normalize_database_url(os.getenv('DATABASE_URL', 'sqlite://'))
+
+TEST_CONFIG = {
+    'SQLALCHEMY_DATABASE_URI': TEST_DATABASE_URL,
+    'TESTING': True,
+    'JWT_SECRET_KEY': 'univ-carrot-test-secret-key-0123456789',
+    'RATE_LIMIT_ENABLED': False,
+    'JOB_WORKERS': 0,
+    'ARCHIVE_INTERVAL': 0,
+}
+
+
+@pytest.fixture(scope='module')
+def make_app():
+    #make_app(config) -> 빈 스키마로 시작하는 앱 (모듈이 끝나면 정리)
+    apps = []
+
+    def make(config=None):
+        app = create_app({**TEST_CONFIG, **(config or {})})
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+        apps.append(app)
+        return app
+
+    yield make
+    for app in apps:
+        shutdown(app)
+
+
+@pytest.fixture(scope='session')
+def auth_headers():
+    #auth_headers(user) -> Authorization 헤더 (앱 컨텍스트 안에서 호출)
+    def headers(user):
+        return {'Authorization': f"Bearer {issue_tokens(user.identity())['access_token']}"}
+    return headers
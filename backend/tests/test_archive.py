@@ -0,0 +1,99 @@
+#================
+# 오래된 데이터 보관 테스트
+# 판매 완료 후 기간이 지난 상품과 채팅방/메시지가 보관 테이블로 옮겨지고 기존 API로 계속 조회되는지
+#================
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from api.archive import archive_cold_data
+from api.extensions import db
+from api.models import (
+    STATUS_SOLD, ArchivedChatRoom, ArchivedMessage, ArchivedProduct, ChatRoom, Message, Product, User,
+)
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def sold_product(app, auth_headers):
+    #판매자 상품 하나 + 구매자와의 대화 (아직 판매 중)
+    with app.app_context():
+        seller = User(username='seller', email='seller@test.local', password_hash='x')
+        buyer = User(username='buyer', email='buyer@test.local', password_hash='x')
+        product = Product(name='자전거', price=50000, owner=seller)
+        db.session.add_all([seller, buyer, product])
+        db.session.commit()
+        headers = {'seller': auth_headers(seller), 'buyer': auth_headers(buyer)}
+        product_id = product.id
+
+    client = app.test_client()
+    room_id = client.post(f'/api/chat/room/{product_id}', headers=headers['buyer']).get_json()['id']
+    for content in ('안녕하세요', '구매 가능할까요?'):
+        client.post(f'/api/chat/room/{room_id}/messages', headers=headers['buyer'], json={'content': content})
+    return {**headers, 'product_id': product_id, 'room_id': room_id}
+
+
+def mark_sold(app, product_id, days_ago):
+    #판매 완료 처리 - 수정 시각을 과거로
+    with app.app_context():
+        db.session.execute(db.update(Product).where(Product.id == product_id).values(
+            status=STATUS_SOLD, updated_at=datetime.utcnow() - timedelta(days=days_ago)
+        ))
+        db.session.commit()
+
+
+def test_archive_moves_old_sold_products(app, sold_product):
+    mark_sold(app, sold_product['product_id'], days_ago=31)
+    with app.app_context():
+        assert archive_cold_data() == {'products': 1, 'chat_rooms': 0}
+        assert Product.query.count() == ChatRoom.query.count() == Message.query.count() == 0
+        assert ArchivedProduct.query.count() == ArchivedChatRoom.query.count() == 1
+        assert ArchivedMessage.query.count() == 2
+
+    #보관된 상품 / 대화도 같은 ID로 조회 (읽기 전용)
+    client = app.test_client()
+    detail = client.get(f"/api/products/{sold_product['product_id']}", headers=sold_product['buyer'])
+    assert detail.status_code == 200 and detail.get_json()['name'] == '자전거'
+    messages = client.get(f"/api/chat/room/{sold_product['room_id']}/messages", headers=sold_product['buyer'])
+    assert [m['content'] for m in messages.get_json()] == ['안녕하세요', '구매 가능할까요?']
+
+
+def test_archive_keeps_recent_sales(app, sold_product):
+    mark_sold(app, sold_product['product_id'], days_ago=1)
+    with app.app_context():
+        assert archive_cold_data() == {'products': 0, 'chat_rooms': 0}
+        assert Product.query.count() == 1
+
+
+def test_archived_ids_are_not_reused(app, sold_product):
+    #보관으로 원본 행이 지워져도 새 상품/채팅방/메시지가 보관된 ID를 다시 쓰지 않음
+    mark_sold(app, sold_product['product_id'], days_ago=31)
+    with app.app_context():
+        archive_cold_data()
+
+    client = app.test_client()
+    response = client.post('/api/products', headers=sold_product['seller'], json={'name': '책상', 'price': 30000})
+    product_id = response.get_json()['id']
+    assert product_id != sold_product['product_id']
+
+    #새 상품의 채팅은 보관된 대화를 이어받지 않고 새 채팅방에서 시작
+    room = client.post(f'/api/chat/room/{product_id}', headers=sold_product['buyer']).get_json()
+    assert room['id'] != sold_product['room_id'] and room['product']['name'] == '책상'
+    sent = client.post(
+        f"/api/chat/room/{room['id']}/messages", headers=sold_product['buyer'], json={'content': '책상 있나요?'}
+    )
+    assert sent.status_code == 201
+    messages = client.get(f"/api/chat/room/{room['id']}/messages", headers=sold_product['buyer'])
+    assert [m['content'] for m in messages.get_json()] == ['책상 있나요?']
+    with app.app_context():
+        assert ArchivedChatRoom.query.count() == 1 and ArchivedMessage.query.count() == 2
+        assert ArchivedProduct.query.filter_by(id=product_id).count() == 0
+
+    #보관된 상품 상세는 그대로
+    detail = client.get(f"/api/products/{sold_product['product_id']}", headers=sold_product['buyer'])
+    assert detail.get_json()['name'] == '자전거'
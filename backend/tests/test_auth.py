@@ -0,0 +1,43 @@
+#================
+# 비밀번호 해싱 설정 테스트
+# 파라미터를 생략한 해시 방식도 저장된 해시와 같게 정규화 - 설정이 그대로면 로그인할 때마다 재해싱하지 않음
+#================
+
+import pytest
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS
+
+from api.extensions import db
+from api.models import User, password_hash_method
+
+
+@pytest.mark.parametrize('method, expected', [
+    ('scrypt', 'scrypt:32768:8:1'),
+    ('scrypt:16384:8:1', 'scrypt:16384:8:1'),
+    ('pbkdf2', f'pbkdf2:sha256:{DEFAULT_PBKDF2_ITERATIONS}'),
+    ('pbkdf2:sha512', f'pbkdf2:sha512:{DEFAULT_PBKDF2_ITERATIONS}'),
+    ('pbkdf2:sha256:1000', 'pbkdf2:sha256:1000'),
+])
+def test_password_hash_method_is_normalized(method, expected):
+    assert password_hash_method(method) == expected
+
+
+@pytest.mark.parametrize('method', ['bcrypt', 'scrypt:8', 'pbkdf2:sha256:many'])
+def test_invalid_password_hash_method(method):
+    with pytest.raises(ValueError):
+        password_hash_method(method)
+
+
+def test_login_keeps_hash_with_shorthand_method(make_app):
+    app = make_app({'PASSWORD_HASH_METHOD': 'scrypt'})
+    with app.app_context():
+        user = User(username='alice', email='alice@test.local')
+        user.set_password('secret-password')
+        db.session.add(user)
+        db.session.commit()
+        password_hash = user.password_hash
+        assert not user.needs_rehash()
+
+    response = app.test_client().post('/api/auth/login', json={'username': 'alice', 'password': 'secret-password'})
+    assert response.status_code == 200
+    with app.app_context():
+        assert db.session.get(User, user.id).password_hash == password_hash
@@ -0,0 +1,30 @@
+#================
+# 메모리 캐시 테스트
+# 세대 번호도 LRU 크기 한도 안에서 유지되는지, 축출된 세대가 예전 응답을 되살리지 않는지
+#================
+
+import time
+
+from cache import MemoryCache
+
+
+def test_generations_are_bounded():
+    cache = MemoryCache(max_entries=100)
+    for product_id in range(10000):
+        cache.bump(f'product:{product_id}')
+    assert cache.stats()['entries'] == 100
+
+
+def test_evicted_generation_misses_old_entries():
+    cache = MemoryCache(max_entries=3)
+    generation = cache.generation('product:1')
+    cache.bump('product:1')
+    key = f"product:1:{cache.generation('product:1')}"
+    cache.set(key, 'cached')
+
+    #다른 키가 채워져 세대가 축출되면 현재 시각의 새 세대로 다시 시작 - 예전 키와 겹치지 않음
+    time.sleep(0.001)
+    for i in range(3):
+        cache.set(f'other:{i}', i)
+    assert cache.generation('product:1') > generation + 1
+    assert cache.get(f"product:1:{cache.generation('product:1')}") is None
@@ -0,0 +1,159 @@
+#================
+# DB 방언별 경로 테스트 (SQLite / Postgres 공통)
+# 충돌 무시 INSERT, 검색(SQLite FTS5 / 그 외 ILIKE), 마이그레이션과 모델 일치 여부
+# Postgres 실행 예) DATABASE_URL=postgresql://localhost/carrot_test python -m pytest
+#================
+
+import os
+from datetime import datetime
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+
+from api.config import BACKEND_DIR
+from api.extensions import db
+from api.models import ChatRoom, Product, User, Wishlist
+from search import FTS_TABLE, is_supported as search_supported, search_ids
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def accounts(app, auth_headers):
+    #판매자 / 구매자 헤더와 판매자 상품 ID 두 개
+    with app.app_context():
+        seller = User(username='seller', email='seller@test.local', password_hash='x')
+        buyer = User(username='buyer', email='buyer@test.local', password_hash='x')
+        db.session.add_all([seller, buyer])
+        db.session.flush()
+        products = [
+            Product(name='중고 자전거', description='거의 새것', price=50000, user_id=seller.id),
+            Product(name='전공책', description='컴퓨터공학 개론', price=10000, user_id=seller.id),
+        ]
+        db.session.add_all(products)
+        db.session.commit()
+        return {
+            'seller': auth_headers(seller),
+            'buyer': auth_headers(buyer),
+            'product_ids': [p.id for p in products],
+        }
+
+
+def test_wishlist_add_ignores_duplicates(app, accounts):
+    client = app.test_client()
+    product_id, other_id = accounts['product_ids']
+    assert client.post(f'/api/wishlist/{product_id}', headers=accounts['buyer']).status_code == 201
+    assert client.post(f'/api/wishlist/{product_id}', headers=accounts['buyer']).status_code == 400
+
+    #일괄 추가 - 이미 찜한 상품은 건너뛰고 새 상품만 추가
+    response = client.post('/api/wishlist/batch', headers=accounts['buyer'], json={'add': [product_id, other_id]})
+    assert response.status_code == 200
+    with app.app_context():
+        assert Wishlist.query.count() == 2
+        assert [db.session.get(Product, i).wishlist_count for i in (product_id, other_id)] == [1, 1]
+
+
+def test_wishlist_keeps_updated_at(app, accounts):
+    #찜 추가/삭제는 상품 수정이 아니므로 수정 시각이 바뀌지 않음
+    client = app.test_client()
+    product_ids = accounts['product_ids']
+    updated_at = datetime(2020, 1, 1)
+    with app.app_context():
+        db.session.execute(db.update(Product).values(updated_at=updated_at))
+        db.session.commit()
+
+    client.post(f'/api/wishlist/{product_ids[0]}', headers=accounts['buyer'])
+    client.delete(f'/api/wishlist/{product_ids[0]}', headers=accounts['buyer'])
+    client.post('/api/wishlist/batch', headers=accounts['buyer'], json={'add': product_ids})
+    client.post('/api/wishlist/batch', headers=accounts['buyer'], json={'remove': product_ids[:1]})
+    with app.app_context():
+        products = [db.session.get(Product, i) for i in product_ids]
+        assert [p.wishlist_count for p in products] == [0, 1]
+        assert [p.updated_at for p in products] == [updated_at, updated_at]
+
+
+def test_chat_room_creation_is_idempotent(app, accounts):
+    client = app.test_client()
+    product_id = accounts['product_ids'][0]
+    first = client.post(f'/api/chat/room/{product_id}', headers=accounts['buyer'])
+    second = client.post(f'/api/chat/room/{product_id}', headers=accounts['buyer'])
+    assert first.status_code in (200, 201) and second.status_code in (200, 201)
+    assert first.get_json()['id'] == second.get_json()['id']
+    with app.app_context():
+        assert ChatRoom.query.count() == 1
+
+
+def test_search_finds_products(app, accounts):
+    #SQLite는 FTS5 색인, 그 외 DB는 ILIKE 검색
+    response = app.test_client().get('/api/products/search?q=자전거', headers=accounts['buyer'])
+    assert response.status_code == 200
+    assert [item['name'] for item in response.get_json()['items']] == ['중고 자전거']
+
+
+def test_search_ranks_name_matches_first(app, accounts):
+    #FTS5 순위 - 상품명 일치(최신순) 다음 설명만 일치, 페이지가 두 순위에 걸쳐도 빠짐/중복 없음
+    with app.app_context():
+        if not search_supported(db.session.connection()):
+            pytest.skip('ranking applies to the SQLite FTS5 index')
+        seller_id = db.session.get(Product, accounts['product_ids'][0]).user_id
+        products = [
+            Product(name='책상', price=1000, user_id=seller_id),
+            Product(name='의자', description='책상과 세트', price=1000, user_id=seller_id),
+            Product(name='원목 책상', price=1000, user_id=seller_id),
+        ]
+        db.session.add_all(products)
+        db.session.commit()
+        desk, chair, new_desk = (p.id for p in products)
+
+        connection = db.session.connection()
+        assert search_ids(connection, '책상', 20) == [new_desk, desk, chair]
+        pages = [search_ids(connection, '책상', 1, offset) for offset in range(4)]
+        assert pages == [[new_desk], [desk], [chair], []]
+        assert search_ids(connection, '책상', 2, 1) == [desk, chair]
+
+
+def test_migrations_match_models(make_app):
+    #빈 DB에 마이그레이션을 끝까지 적용하면 모델과 같은 스키마가 되고, 처음까지 되돌릴 수 있어야 함
+    from flask_migrate import downgrade, upgrade
+
+    directory = os.path.join(BACKEND_DIR, 'migrations')
+    app = make_app({'MIGRATIONS_ENABLED': True})
+    with app.app_context():
+        db.drop_all()
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql('DROP TABLE IF EXISTS alembic_version')
+        upgrade(directory=directory)
+        with db.engine.connect() as connection:
+            diff = compare_metadata(MigrationContext.configure(connection), db.metadata)
+        #SQLite 검색 색인(FTS5 가상 테이블)은 모델에 없음
+        diff = [d for d in diff if not (d[0] == 'remove_table' and d[1].name.startswith(FTS_TABLE))]
+        assert diff == []
+        downgrade(directory=directory, revision='base')
+
+
+def test_migration_backfills_search_index(make_app):
+    #검색 색인 도입 전부터 있던 상품도 마이그레이션 후 바로 검색됨
+    from flask_migrate import upgrade
+
+    directory = os.path.join(BACKEND_DIR, 'migrations')
+    app = make_app({'MIGRATIONS_ENABLED': True})
+    with app.app_context():
+        if not search_supported(db.session.connection()):
+            pytest.skip('the search index is SQLite FTS5')
+        db.drop_all()
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql('DROP TABLE IF EXISTS alembic_version')
+            connection.exec_driver_sql(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+        upgrade(directory=directory, revision='192c5e7819ff')
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql(
+                "INSERT INTO user (id, username, email, password_hash) VALUES (1, 'seller', 's@test.local', 'x')"
+            )
+            connection.exec_driver_sql("INSERT INTO product (id, name, price, user_id) VALUES (1, '중고 자전거', 50000, 1)")
+        upgrade(directory=directory)
+        with db.engine.connect() as connection:
+            assert search_ids(connection, '자전거', 20) == [1]
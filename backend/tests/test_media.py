@@ -0,0 +1,78 @@
+#================
+# 청크 업로드 테스트
+# 같은 업로드에 동시에 온 청크 거절, 크기 확인, 버려진 업로드 만료 정리
+#================
+
+import io
+import os
+import time
+
+import pytest
+
+from api.extensions import db
+from api.jobs import cleanup_media
+from api.models import Job, User
+from media import ChunkedUploads, UploadError, fcntl
+
+
+@pytest.fixture
+def uploads(tmp_path):
+    return ChunkedUploads(str(tmp_path), max_size=1024)
+
+
+def test_chunk_is_written_at_declared_offset(uploads, tmp_path):
+    upload_id = uploads.create(1, 'clip.mp4', 8, {'mp4'})['upload_id']
+    assert uploads.write_chunk(upload_id, 1, 'bytes 0-3/8', io.BytesIO(b'abcd')) is None
+    with pytest.raises(UploadError) as error:
+        uploads.write_chunk(upload_id, 1, 'bytes 0-3/8', io.BytesIO(b'abcd'))
+    assert error.value.status == 409
+    filename = uploads.write_chunk(upload_id, 1, 'bytes 4-7/8', io.BytesIO(b'efgh'))
+    assert (tmp_path / filename).read_bytes() == b'abcdefgh'
+    #저장이 끝난 업로드에 늦게 온 재시도
+    with pytest.raises(UploadError) as error:
+        uploads.write_chunk(upload_id, 1, 'bytes 4-7/8', io.BytesIO(b'efgh'))
+    assert error.value.status == 404
+
+
+@pytest.mark.skipif(fcntl is None, reason='upload locks need fcntl')
+def test_concurrent_chunk_is_rejected(uploads):
+    #다른 요청(워커)이 같은 업로드에 쓰는 중이면 기다리지 않고 409 - 파일은 그대로
+    upload_id = uploads.create(1, 'clip.mp4', 8, {'mp4'})['upload_id']
+    part_path = os.path.join(uploads.partial_dir, f'{upload_id}.part')
+    with open(part_path, 'r+b') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        with pytest.raises(UploadError) as error:
+            uploads.write_chunk(upload_id, 1, 'bytes 0-3/8', io.BytesIO(b'abcd'))
+    assert error.value.status == 409
+    assert uploads.status(upload_id, 1)['offset'] == 0
+
+
+def test_expire_removes_abandoned_uploads(uploads):
+    stale = uploads.create(1, 'old.mp4', 8, {'mp4'})['upload_id']
+    fresh = uploads.create(1, 'new.mp4', 8, {'mp4'})['upload_id']
+    past = time.time() - 7200
+    os.utime(os.path.join(uploads.partial_dir, f'{stale}.part'), (past, past))
+
+    assert len(uploads.expire(3600)) == 2
+    with pytest.raises(UploadError):
+        uploads.status(stale, 1)
+    assert uploads.status(fresh, 1)['offset'] == 0
+    assert uploads.pending()
+
+
+def test_cleanup_job_expires_uploads(make_app, auth_headers, tmp_path):
+    #청크 업로드를 시작하면 만료 정리가 예약되고, 남은 업로드가 있으면 정리 작업이 다시 예약
+    app = make_app({'UPLOAD_FOLDER': str(tmp_path), 'UPLOAD_EXPIRE_SECONDS': 0})
+    with app.app_context():
+        user = User(username='seller', email='seller@test.local', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        headers = auth_headers(user)
+    client = app.test_client()
+    response = client.post('/api/uploads', headers=headers, json={'filename': 'clip.mp4', 'size': 8})
+    assert response.status_code == 201
+    with app.app_context():
+        assert [job.name for job in Job.query] == ['cleanup_media']
+        cleanup_media()
+        assert os.listdir(tmp_path / '.partial') == []
+    assert client.get(f"/api/uploads/{response.get_json()['upload_id']}", headers=headers).status_code == 404
@@ -0,0 +1,32 @@
+#================
+# 성능 계측 테스트
+# 샘플링되지 않은 요청의 느린 쿼리 로그, 운영 지표 경로 접근 제한
+#================
+
+import logging
+
+import pytest
+
+METRICS_PATHS = ('/api/metrics', '/api/cache/stats')
+
+
+def test_slow_queries_are_logged_without_sampling(make_app, caplog):
+    #상세 계측 샘플링이 0이어도 느린 쿼리는 로그와 카운터에 남음
+    app = make_app({'METRICS_SAMPLE_RATE': 0.0, 'SLOW_QUERY_MS': 0})
+    with caplog.at_level(logging.WARNING, logger='univ_carrot.slow_query'):
+        assert app.test_client().get('/api/ready').status_code == 200
+    assert app.extensions['request_metrics'].slow_queries >= 1
+    assert any('on system.ready' in record.getMessage() for record in caplog.records)
+
+
+@pytest.mark.parametrize('path', METRICS_PATHS)
+def test_metrics_hidden_without_token(make_app, path):
+    assert make_app().test_client().get(path).status_code == 404
+
+
+@pytest.mark.parametrize('path', METRICS_PATHS)
+def test_metrics_require_token(make_app, path):
+    client = make_app({'METRICS_TOKEN': 'scrape-token'}).test_client()
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    assert client.get(path, headers={'Authorization': 'Bearer scrape-token'}).status_code == 200
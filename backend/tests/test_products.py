@@ -0,0 +1,90 @@
+#================
+# 상품 API 테스트
+# 채팅이 있는 상품 삭제(단건 / 일괄), 일괄 처리 항목 검증
+#================
+
+import pytest
+from sqlalchemy import event
+
+from api.extensions import db
+from api.models import ArchivedChatRoom, ArchivedMessage, ChatRoom, Product, User
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def accounts(app, auth_headers):
+    #판매자 / 구매자 헤더와 구매자가 채팅 중인 판매자 상품 ID 두 개
+    with app.app_context():
+        seller = User(username='seller', email='seller@test.local', password_hash='x')
+        buyer = User(username='buyer', email='buyer@test.local', password_hash='x')
+        products = [Product(name='자전거', price=50000, owner=seller), Product(name='전공책', price=10000, owner=seller)]
+        db.session.add_all([seller, buyer, *products])
+        db.session.commit()
+        headers = {'seller': auth_headers(seller), 'buyer': auth_headers(buyer)}
+        product_ids = [p.id for p in products]
+
+    client = app.test_client()
+    room_ids = []
+    for product_id in product_ids:
+        room_id = client.post(f'/api/chat/room/{product_id}', headers=headers['buyer']).get_json()['id']
+        client.post(f'/api/chat/room/{room_id}/messages', headers=headers['buyer'], json={'content': '팔렸나요?'})
+        room_ids.append(room_id)
+    return {**headers, 'product_ids': product_ids, 'room_ids': room_ids}
+
+
+def test_delete_product_archives_chat_rooms(app, accounts):
+    #채팅방이 있는 상품도 삭제되고, 대화는 보관 테이블에서 계속 조회
+    client = app.test_client()
+    product_id, other_id = accounts['product_ids']
+    assert client.delete(f'/api/products/{product_id}', headers=accounts['seller']).status_code == 200
+
+    #일괄 삭제 - 채팅방이 있는 상품과 없는 상품이 섞여도 항목별 결과
+    response = client.post('/api/products/batch', headers=accounts['seller'], json={'delete': [other_id, 999]})
+    assert response.status_code == 200
+    assert [r['status'] for r in response.get_json()['results']['delete']] == [200, 404]
+
+    with app.app_context():
+        assert Product.query.count() == ChatRoom.query.count() == 0
+        assert ArchivedChatRoom.query.count() == ArchivedMessage.query.count() == 2
+    for room_id in accounts['room_ids']:
+        messages = client.get(f'/api/chat/room/{room_id}/messages', headers=accounts['buyer'])
+        assert [m['content'] for m in messages.get_json()] == ['팔렸나요?']
+
+
+def test_batch_update_rejects_bool_ids(app, accounts):
+    #JSON true는 파이썬에서 int이지만 상품 ID가 아님 (상품 1 수정 방지)
+    response = app.test_client().post('/api/products/batch', headers=accounts['seller'], json={
+        'update': [{'id': True, 'name': '변경'}],
+    })
+    assert response.get_json()['results']['update'] == [{'index': 0, 'status': 400, 'error': 'id is required'}]
+    with app.app_context():
+        assert sorted(p.name for p in Product.query) == ['자전거', '전공책']
+
+
+
+def test_feed_cursor_seeks_index(app, accounts):
+    #다음 페이지 조회는 (created_at, id) 인덱스 탐색 - 훑어보기(SCAN)면 페이지가 깊을수록 느려짐
+    with app.app_context():
+        if db.engine.dialect.name != 'sqlite':
+            pytest.skip('query plan check is SQLite-specific')
+    client = app.test_client()
+    cursor = client.get('/api/products?limit=1').get_json()['next_cursor']
+
+    statements = []
+    def record(conn, cursor, statement, params, context, executemany):
+        statements.append((statement, params))
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            assert client.get(f'/api/products?limit=1&cursor={cursor}').status_code == 200
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        statement, params = next((s, p) for s, p in statements if 'FROM product' in s)
+        with db.engine.connect() as connection:
+            plan = [row[-1] for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', params)]
+    assert any('SEARCH product USING' in step and 'ix_product_created_at_id' in step for step in plan), plan
+    assert not any(step.startswith('SCAN product') for step in plan), plan
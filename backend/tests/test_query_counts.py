@@ -0,0 +1,62 @@
+#================
+# 상품 목록 쿼리 수 회귀 테스트
+# 상품 수가 늘어도 목록 요청당 쿼리 수가 일정해야 함 (상품별 찜 여부 / 판매자 조회가 N+1로 돌아오지 않도록)
+#================
+
+import pytest
+from sqlalchemy import event
+
+from api.extensions import db
+from api.models import ChatRoom, Message, Product, User, Wishlist
+from bench.seed import seed
+
+DATASET_SIZES = (1000, 10000)
+USERS = 20
+
+
+def count_queries(app, client, path, headers):
+    #요청 하나가 실행한 SQL 문 수
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.get(path, headers=headers)
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    assert response.status_code == 200
+    return len(statements), response.get_json()
+
+
+@pytest.fixture(scope='module')
+def query_counts(make_app, auth_headers):
+    #상품 수별 {경로: (쿼리 수, 응답 항목 수)}
+    counts = {}
+    for size in DATASET_SIZES:
+        app = make_app()
+        with app.app_context():
+            seed(db, (User, Product, Wishlist, ChatRoom, Message),
+                 users=USERS, products=size, wishlists=50, rooms=0, messages=0)
+            #판매자는 상품 수에 비례해 상품을 가짐 (내 상품은 페이지 없이 전체 반환)
+            seller = db.session.get(User, 1)
+            headers = auth_headers(seller)
+        client = app.test_client()
+        counts[size] = {}
+        for path in ('/api/products?limit=100', '/api/my/products'):
+            queries, body = count_queries(app, client, path, headers)
+            items = body['items'] if isinstance(body, dict) else body
+            counts[size][path] = (queries, len(items))
+    return counts
+
+
+@pytest.mark.parametrize('path', ['/api/products?limit=100', '/api/my/products'])
+def test_listing_query_count_is_constant(query_counts, path):
+    small, large = (query_counts[size][path] for size in DATASET_SIZES)
+    #큰 데이터셋에서 목록 항목도 늘었는지 (내 상품) / 최대 페이지를 채웠는지 (피드) 확인해야 의미 있음
+    assert large[1] >= small[1] > 0
+    assert large[0] == small[0]
+    assert large[0] <= 5
@@ -0,0 +1,25 @@
+#================
+# 요청 빈도 제한 테스트
+# 로그인은 IP + 아이디별 한도 - 같은 IP(NAT)의 다른 사용자는 한도를 나눠 쓰지 않음
+#================
+
+from api.config import DEFAULT_RATE_LIMITS
+
+
+def test_login_limit_is_per_username(make_app):
+    app = make_app({'RATE_LIMIT_ENABLED': True, 'RATE_LIMITS': {**DEFAULT_RATE_LIMITS, 'auth.login': '2/minute'}})
+    client = app.test_client()
+
+    def login(username):
+        return client.post('/api/auth/login', json={'username': username, 'password': 'wrong'}).status_code
+
+    assert [login('alice') for _ in range(3)] == [401, 401, 429]
+    assert login('bob') == 401
+    #아이디가 없는 요청은 IP로만 셈 - 다른 아이디의 한도와 별개
+    assert client.post('/api/auth/login', json={}).status_code == 400
+
+
+def test_uploaded_files_are_not_limited(make_app):
+    app = make_app({'RATE_LIMIT_ENABLED': True, 'RATE_LIMIT_DEFAULT': '1/minute'})
+    client = app.test_client()
+    assert [client.get('/uploads/missing.png').status_code for _ in range(3)] == [404, 404, 404]
@@ -33,12 +33,14 @@ function App() {
         setUser(userData);
       } catch {
         localStorage.removeItem("token");
+        localStorage.removeItem("refreshToken");
       }
     }
   };
 
   const handleLogout = () => {
     localStorage.removeItem("token");
+    localStorage.removeItem("refreshToken");
     setUser(null);
     setCurrentPage("home");
   };
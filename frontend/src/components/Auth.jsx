@@ -18,6 +18,7 @@ function Auth({ onLogin }) {
       if (isLogin) {
         const data = await login(username, password);
         localStorage.setItem("token", data.access_token);
+        localStorage.setItem("refreshToken", data.refresh_token);
         onLogin(data.user);
       } else {
         await register(username, email, password);
@@ -1,15 +1,18 @@
 import { useState, useEffect, useRef } from "react";
-import { getMyChatRooms, getMessages, sendMessage, createChatRoom } from "../services/api";
+import { getMyChatRooms, getMessages, sendMessage, createChatRoom, openMessageStream } from "../services/api";
 
 const API_BASE_URL = "http://localhost:5000";
+const MESSAGE_PAGE_SIZE = 50;
 
 function Chat({ user, onBack, initialProductId }) {
   const [chatRooms, setChatRooms] = useState([]);
   const [selectedRoom, setSelectedRoom] = useState(null);
   const [messages, setMessages] = useState([]);
+  const [hasOlder, setHasOlder] = useState(false);
   const [newMessage, setNewMessage] = useState("");
   const [loading, setLoading] = useState(false);
   const messagesEndRef = useRef(null);
+  const lastMessageIdRef = useRef(0);
 
   useEffect(() => {
     if (initialProductId) {
@@ -23,14 +26,34 @@ function Chat({ user, onBack, initialProductId }) {
     messagesEndRef.current?.scrollIntoView({ behavior: "smooth" });
   }, [messages]);
 
+  // 새 메시지는 SSE로 수신하고, 스트림을 쓸 수 없으면 3초 증분 폴링으로 대체
   useEffect(() => {
+    if (!selectedRoom) return;
     let interval;
-    if (selectedRoom) {
+    let stream;
+
+    const startPolling = () => {
+      if (interval) return;
       interval = setInterval(() => {
-        fetchMessages(selectedRoom.id);
+        fetchNewMessages(selectedRoom.id);
       }, 3000);
+    };
+
+    if (typeof EventSource !== "undefined") {
+      stream = openMessageStream(selectedRoom.id, lastMessageIdRef.current);
+      stream.onmessage = (event) => appendMessages([JSON.parse(event.data)]);
+      stream.onerror = () => {
+        stream.close();
+        startPolling();
+      };
+    } else {
+      startPolling();
     }
-    return () => clearInterval(interval);
+
+    return () => {
+      clearInterval(interval);
+      stream?.close();
+    };
   }, [selectedRoom]);
 
   const fetchChatRooms = async () => {
@@ -60,26 +83,58 @@ function Chat({ user, onBack, initialProductId }) {
   const fetchMessages = async (roomId) => {
     try {
       const data = await getMessages(roomId);
+      lastMessageIdRef.current = data.length ? data[data.length - 1].id : 0;
       setMessages(data);
+      setHasOlder(data.length === MESSAGE_PAGE_SIZE);
+    } catch (err) {
+      console.error(err);
+    }
+  };
+
+  const fetchNewMessages = async (roomId) => {
+    try {
+      const data = await getMessages(roomId, { after: lastMessageIdRef.current });
+      appendMessages(data);
     } catch (err) {
       console.error(err);
     }
   };
 
+  const fetchOlderMessages = async () => {
+    if (!selectedRoom || messages.length === 0) return;
+    try {
+      const data = await getMessages(selectedRoom.id, { before: messages[0].id });
+      setMessages((prev) => [...data, ...prev]);
+      setHasOlder(data.length === MESSAGE_PAGE_SIZE);
+    } catch (err) {
+      console.error(err);
+    }
+  };
+
+  // 이미 받은 메시지는 건너뛰고 추가 (스트림/폴링/전송 응답이 겹칠 수 있음)
+  const appendMessages = (incoming) => {
+    const fresh = incoming.filter((m) => m.id > lastMessageIdRef.current);
+    if (fresh.length === 0) return;
+    lastMessageIdRef.current = fresh[fresh.length - 1].id;
+    setMessages((prev) => [...prev, ...fresh]);
+  };
+
   const handleSend = async (e) => {
     e.preventDefault();
     if (!newMessage.trim() || !selectedRoom) return;
 
     try {
-      await sendMessage(selectedRoom.id, newMessage);
+      const message = await sendMessage(selectedRoom.id, newMessage);
       setNewMessage("");
-      fetchMessages(selectedRoom.id);
+      appendMessages([message]);
     } catch (err) {
       console.error(err);
     }
   };
 
   const selectRoom = (room) => {
+    lastMessageIdRef.current = 0;
+    setMessages([]);
     setSelectedRoom(room);
     fetchMessages(room.id);
   };
@@ -105,7 +160,10 @@ function Chat({ user, onBack, initialProductId }) {
                 )}
                 <div className="chat-room-info">
                   <h4>{room.product.name}</h4>
-                  <p className="chat-user">{room.other_user}</p>
+                  <p className="chat-user">
+                    {room.other_user}
+                    {room.unread_count > 0 && <span className="unread-badge">{room.unread_count}</span>}
+                  </p>
                   {room.last_message && (
                     <p className="last-message">{room.last_message}</p>
                   )}
@@ -117,6 +175,11 @@ function Chat({ user, onBack, initialProductId }) {
       ) : (
         <div className="chat-conversation">
           <div className="messages-container">
+            {hasOlder && (
+              <button className="secondary" onClick={fetchOlderMessages}>
+                이전 메시지 보기
+              </button>
+            )}
             {messages.map((msg) => (
               <div 
                 key={msg.id} 
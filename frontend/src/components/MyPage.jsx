@@ -7,6 +7,7 @@ function MyPage({ user, onBack }) {
   const [activeTab, setActiveTab] = useState("products");
   const [myProducts, setMyProducts] = useState([]);
   const [wishlist, setWishlist] = useState([]);
+  const [wishlistCursor, setWishlistCursor] = useState(null);
   const [loading, setLoading] = useState(false);
 
   useEffect(() => {
@@ -21,7 +22,8 @@ function MyPage({ user, onBack }) {
         setMyProducts(data);
       } else {
         const data = await getWishlist();
-        setWishlist(data);
+        setWishlist(data.items);
+        setWishlistCursor(data.next_cursor);
       }
     } catch (err) {
       console.error(err);
@@ -30,6 +32,17 @@ function MyPage({ user, onBack }) {
     }
   };
 
+  const fetchMoreWishlist = async () => {
+    if (!wishlistCursor) return;
+    try {
+      const data = await getWishlist({ cursor: wishlistCursor });
+      setWishlist([...wishlist, ...data.items]);
+      setWishlistCursor(data.next_cursor);
+    } catch (err) {
+      console.error(err);
+    }
+  };
+
   const formatPrice = (price) => {
     return price.toLocaleString('ko-KR') + '원';
   };
@@ -92,6 +105,11 @@ function MyPage({ user, onBack }) {
               </div>
             ))
           )}
+          {activeTab === "wishlist" && wishlistCursor && (
+            <button className="secondary" onClick={fetchMoreWishlist}>
+              더 보기
+            </button>
+          )}
         </div>
       )}
     </div>
@@ -5,6 +5,7 @@ const API_BASE_URL = "http://localhost:5000";
 
 function Products({ user, onStartChat }) {
   const [products, setProducts] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
   const [showForm, setShowForm] = useState(false);
@@ -27,7 +28,8 @@ function Products({ user, onStartChat }) {
     try {
       setLoading(true);
       const data = await getProducts();
-      setProducts(data);
+      setProducts(data.items);
+      setNextCursor(data.next_cursor);
     } catch (err) {
       setError("상품을 불러오는데 실패했습니다");
     } finally {
@@ -35,6 +37,17 @@ function Products({ user, onStartChat }) {
     }
   };
 
+  const fetchMoreProducts = async () => {
+    if (!nextCursor) return;
+    try {
+      const data = await getProducts({ cursor: nextCursor });
+      setProducts([...products, ...data.items]);
+      setNextCursor(data.next_cursor);
+    } catch (err) {
+      setError("상품을 불러오는데 실패했습니다");
+    }
+  };
+
   const formatNumberWithComma = (value) => {
     const number = value.replace(/[^0-9]/g, '');
     return number.replace(/\B(?=(\d{3})+(?!\d))/g, ',');
@@ -236,9 +249,15 @@ function Products({ user, onStartChat }) {
               <div key={product.id} className="product-card">
                 {product.image_url && (
                   <img 
-                    src={`${API_BASE_URL}${product.image_url}`} 
+                    src={`${API_BASE_URL}${product.thumbnails?.[400] || product.image_url}`} 
                     alt={product.name} 
                     className="product-image"
+                    loading="lazy"
+                    onError={(e) => {
+                      // 썸네일이 아직 생성되지 않았으면 원본으로 대체
+                      const original = `${API_BASE_URL}${product.image_url}`;
+                      if (e.currentTarget.src !== original) e.currentTarget.src = original;
+                    }}
                   />
                 )}
                 {product.video_url && (
@@ -285,6 +304,11 @@ function Products({ user, onStartChat }) {
               </div>
             ))
           )}
+          {nextCursor && (
+            <button className="secondary" onClick={fetchMoreProducts}>
+              더 보기
+            </button>
+          )}
         </div>
       )}
     </div>
@@ -18,6 +18,39 @@ api.interceptors.request.use((config) => {
   return config;
 });
 
+// 재시도해도 한 번만 처리되는 요청 (상품 등록, 메시지 전송) - 서버가 같은 키의 첫 응답을 돌려줌
+const idempotent = () => ({ headers: { "Idempotency-Key": crypto.randomUUID() } });
+
+// 액세스 토큰 만료(401) 시 리프레시 토큰으로 한 번 갱신 후 재시도
+// Idempotency-Key가 있는 요청은 응답을 못 받은 경우(네트워크 오류/타임아웃)에도 한 번 재시도
+let refreshing = null;
+
+api.interceptors.response.use(
+  (response) => response,
+  async (error) => {
+    const original = error.config;
+    if (!error.response && original?.headers?.["Idempotency-Key"] && !original._resent) {
+      original._resent = true;
+      return api(original);
+    }
+    const refreshToken = localStorage.getItem("refreshToken");
+    if (error.response?.status !== 401 || !refreshToken || original._retried) {
+      throw error;
+    }
+    original._retried = true;
+    refreshing ??= axios
+      .post(`${API_BASE_URL}/api/auth/refresh`, null, {
+        headers: { Authorization: `Bearer ${refreshToken}` },
+      })
+      .then((response) => localStorage.setItem("token", response.data.access_token))
+      .finally(() => {
+        refreshing = null;
+      });
+    await refreshing;
+    return api(original);
+  }
+);
+
 // 인증 API
 export const register = async (username, email, password) => {
   const response = await api.post("/api/auth/register", { username, email, password });
@@ -35,8 +68,9 @@ export const getMe = async () => {
 };
 
 // 상품 API
-export const getProducts = async () => {
-  const response = await api.get("/api/products");
+// 응답: { items, next_cursor } - next_cursor를 params.cursor로 넘기면 다음 페이지
+export const getProducts = async (params = {}) => {
+  const response = await api.get("/api/products", { params });
   return response.data;
 };
 
@@ -46,7 +80,7 @@ export const getProduct = async (id) => {
 };
 
 export const createProduct = async (data) => {
-  const response = await api.post("/api/products", data);
+  const response = await api.post("/api/products", data, idempotent());
   return response.data;
 };
 
@@ -60,21 +94,38 @@ export const deleteProduct = async (id) => {
   return response.data;
 };
 
-// 파일 업로드
+// 파일 업로드 - 청크 단위로 전송하고, 실패한 청크는 서버 오프셋부터 이어서 재전송
+const UPLOAD_RETRIES = 3;
+
 export const uploadFile = async (file) => {
-  const formData = new FormData();
-  formData.append("file", file);
-  const response = await api.post("/api/upload", formData, {
-    headers: {
-      "Content-Type": "multipart/form-data",
-    },
-  });
-  return response.data;
+  const { data: upload } = await api.post("/api/uploads", { filename: file.name, size: file.size });
+  let offset = upload.offset;
+  let retries = 0;
+
+  while (true) {
+    const end = Math.min(offset + upload.chunk_size, file.size);
+    try {
+      const response = await api.put(`/api/uploads/${upload.upload_id}`, file.slice(offset, end), {
+        headers: {
+          "Content-Type": "application/octet-stream",
+          "Content-Range": `bytes ${offset}-${end - 1}/${file.size}`,
+        },
+      });
+      if (response.status === 201) return response.data;
+      offset = response.data.offset;
+      retries = 0;
+    } catch (err) {
+      if (++retries > UPLOAD_RETRIES) throw err;
+      const { data: status } = await api.get(`/api/uploads/${upload.upload_id}`);
+      offset = status.offset;
+    }
+  }
 };
 
 // 찜하기 API
-export const getWishlist = async () => {
-  const response = await api.get("/api/wishlist");
+// 응답: { items, next_cursor } - next_cursor를 params.cursor로 넘기면 다음 페이지
+export const getWishlist = async (params = {}) => {
+  const response = await api.get("/api/wishlist", { params });
   return response.data;
 };
 
@@ -107,12 +158,24 @@ export const getMyChatRooms = async () => {
   return response.data;
 };
 
-export const getMessages = async (roomId) => {
-  const response = await api.get(`/api/chat/room/${roomId}/messages`);
+// 기본은 최신 메시지 한 페이지. after/before를 넘기면 해당 메시지 ID 이후/이전 페이지
+export const getMessages = async (roomId, { after, before } = {}) => {
+  const params = {};
+  if (after) params.after = after;
+  if (before) params.before = before;
+  const response = await api.get(`/api/chat/room/${roomId}/messages`, { params });
   return response.data;
 };
 
+// 새 메시지 실시간 수신 (SSE) - EventSource는 헤더를 못 보내므로 토큰을 쿼리로 전달
+export const openMessageStream = (roomId, after) => {
+  const token = localStorage.getItem("token");
+  const params = new URLSearchParams({ jwt: token });
+  if (after) params.set("after", after);
+  return new EventSource(`${API_BASE_URL}/api/chat/room/${roomId}/stream?${params}`);
+};
+
 export const sendMessage = async (roomId, content) => {
-  const response = await api.post(`/api/chat/room/${roomId}/messages`, { content });
+  const response = await api.post(`/api/chat/room/${roomId}/messages`, { content }, idempotent());
   return response.data;
 };